@@ -0,0 +1,34 @@
+"""
+bench/__init__.py
+=================
+Micro-benchmarks dos caminhos quentes do robô.
+
+Roda em qualquer Linux com o GPIO simulado, frames sintéticos e o
+mundo do simulador: uma iteração de Robot.main_loop por estado,
+UltrasonicSensor.get_distance, sequências de comandos do
+L298NController, preprocess_frame e inferência TFLite (1 frame e em
+lote) num modelo de teste pequeno.
+
+Os resultados são gravados como baselines JSON (um por máquina) e
+comparados pela mediana: casos mais lentos que o limite são marcados
+como regressão.
+
+Uso:
+    python -m bench --save bench/baselines/pi4.json
+    python -m bench --compare bench/baselines/pi4.json
+
+    from bench import run, compare
+    rows = compare(load('base.json'), run(['ultrasonic']))
+"""
+
+from .core import run, compare, load, save, Skip, CASES
+from . import cases  # noqa: F401  (registra os casos)
+
+__all__ = [
+    'run',
+    'compare',
+    'load',
+    'save',
+    'Skip',
+    'CASES'
+]
@@ -0,0 +1,81 @@
+"""
+bench/__main__.py
+=================
+Roda os benchmarks, grava baselines e compara
+
+Uso:
+    python -m bench                                  # roda tudo e imprime
+    python -m bench -k robot.tick -k ultrasonic      # só alguns casos
+    python -m bench --save bench/baselines/pi4.json
+    python -m bench --compare bench/baselines/pi4.json --threshold 0.10
+    python -m bench --compare base.json --against novo.json   # sem rodar
+
+Com --compare a saída é 1 se algum caso ficou mais lento que o limite.
+"""
+
+import argparse
+import os
+import sys
+
+from . import core
+from . import cases  # noqa: F401  (registra os casos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks dos caminhos quentes do robô")
+    parser.add_argument('-k', dest='patterns', action='append', metavar='PADRÃO',
+                        help="só casos cujo nome contém / casa com o padrão")
+    parser.add_argument('--quick', action='store_true',
+                        help="rodadas curtas (conferir que roda, não medir)")
+    parser.add_argument('--save', metavar='ARQUIVO', help="grava o resultado como baseline JSON")
+    parser.add_argument('--compare', metavar='BASELINE', help="compara com um baseline JSON")
+    parser.add_argument('--against', metavar='ARQUIVO',
+                        help="com --compare: usa este resultado em vez de rodar")
+    parser.add_argument('--threshold', type=float, default=core.DEFAULT_THRESHOLD,
+                        help="variação tolerada da mediana (0.15 = 15%%)")
+    parser.add_argument('--list', action='store_true', help="lista os casos")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, description, _ in core.CASES:
+            print(f"{name:20s} {description}")
+        return 0
+
+    baseline = core.load(args.compare) if args.compare else None
+
+    if args.against:
+        report = core.load(args.against)
+    else:
+        report = core.run(args.patterns, quick=args.quick,
+                          progress=lambda text: print(f"... {text}", file=sys.stderr))
+        print(core.format_results(report))
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        core.save(report, args.save)
+        print(f"Baseline gravado em {args.save}")
+
+    if baseline is None:
+        return 0
+
+    meta = baseline['meta']
+    if (meta.get('host'), meta.get('machine')) != (report['meta'].get('host'),
+                                                   report['meta'].get('machine')):
+        print(f"AVISO: baseline de {meta.get('host')} ({meta.get('machine')}) - "
+              f"tempos de máquinas diferentes não são comparáveis", file=sys.stderr)
+
+    if args.patterns and not args.against:
+        # Só os casos rodados; os outros não estão "ausentes"
+        baseline = dict(baseline, results={name: value for name, value
+                                           in baseline['results'].items()
+                                           if name in report['results']})
+
+    rows = core.compare(baseline, report, args.threshold)
+    print()
+    print(f"Comparação com {args.compare} ({meta.get('created')}):")
+    print(core.format_comparison(rows, args.threshold))
+    return 1 if any(row[4] == 'REGRESSÃO' for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""
+bench/cases.py
+==============
+Casos de benchmark dos caminhos quentes, sobre hardware simulado
+
+Nada aqui toca GPIO, câmera ou PWM reais: motores e sensor usam o GPIO
+simulado num relógio virtual, os frames são sintéticos e a missão é a
+do simulador. Os tempos medidos são do código do robô (mais o custo
+fixo dos drivers simulados).
+"""
+
+import os
+import time
+from contextlib import contextmanager, redirect_stdout
+
+import numpy as np
+
+import logger
+from config import (ULTRASONIC_PINS, MOTOR_ACCELERATION, MOTOR_DECELERATION,
+                    CAMERA_CONFIG, MAIN_LOOP_DELAY)
+from hardware.clock import VirtualClock
+from hardware.gpio import SimulatedGPIO
+from hardware.sensors import UltrasonicSensor
+from logic import RobotState
+from sim.drivers import SimMotors
+from sim.mission import build_mission
+from .core import case, timed, Skip
+
+
+# Modelo TFLite pequeno para os casos de inferência (python -m bench.make_model)
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          'models', 'classificador_teste.tflite')
+BATCH_SIZE = 8
+
+
+@contextmanager
+def quiet():
+    """Sem prints nem logs dos componentes durante a medição"""
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull), logger.silenced():
+        yield
+
+
+def _count(base, scale, minimum=1):
+    return max(minimum, int(base * scale))
+
+
+# ==================== ROBOT ====================
+
+@case('robot.tick', "uma iteração de Robot.main_loop por estado (missão simulada)")
+def robot_tick(scale):
+    """
+    Cada chamada de main_loop() de uma missão simulada, agrupada pelo
+    estado em que a iteração começou. Ao fim do plano, mais iterações
+    em STOPPED; a busca inicial vem de um robô posto fora da placa.
+    Inclui o mundo simulado, que anda nas esperas do robô (vassouras,
+    latência da visão) - medianas, não médias.
+    """
+    samples = {state: [] for state in RobotState}
+    extra = _count(500, scale, 20)
+
+    def tick(robot, clock):
+        state = robot.state
+        start = time.perf_counter()
+        robot.main_loop()
+        samples[state].append(time.perf_counter() - start)
+        clock.sleep(MAIN_LOOP_DELAY)
+
+    with quiet():
+        robot, world, clock = build_mission(seed=0)
+        robot.running = True
+        while (clock.now() < 1800 and robot.state != RobotState.STOPPED
+               and not world.fell_off()):
+            tick(robot, clock)
+        if robot.state == RobotState.STOPPED:
+            for _ in range(extra):
+                tick(robot, clock)
+        robot.motion.cancel()
+
+        # Fora da placa: gira no lugar procurando o vidro
+        robot, world, clock = build_mission(seed=0, world_params={'start_pose': (-40.0, 50.0, 0.0)})
+        robot.running = True
+        for _ in range(extra):
+            if robot.state != RobotState.INITIAL_SEARCH:
+                break
+            tick(robot, clock)
+        robot.motion.cancel()
+
+    return {f'robot.tick[{state.value}]': values
+            for state, values in samples.items() if values}
+
+
+# ==================== ULTRASSÔNICO ====================
+
+class EchoGPIO(SimulatedGPIO):
+    """
+    GPIO simulado com o ECHO de um HC-SR04 a uma distância fixa.
+
+    A descida do TRIG agenda o pulso de eco: sobe após `delay` e dura o
+    tempo de ida e volta do som. Com VirtualClock(read_cost) cada
+    leitura do relógio custa tempo, então os laços de espera do sensor
+    fazem um número fixo de voltas por medição.
+    """
+
+    def __init__(self, clock, trigger, echo, distance=3.0, delay=0.0005):
+        super().__init__()
+        self.clock = clock
+        self.trigger = trigger
+        self.echo = echo
+        self.delay = delay
+        self.width = distance / 17150.0
+        self._rise = None
+
+    def output(self, pins, levels):
+        super().output(pins, levels)
+        if pins == self.trigger and levels == self.LOW:
+            self._rise = self.clock.now() + self.delay
+
+    def input(self, pin):
+        if pin != self.echo or self._rise is None:
+            return super().input(pin)
+        elapsed = self.clock.now() - self._rise
+        return self.HIGH if 0 <= elapsed < self.width else self.LOW
+
+
+@case('ultrasonic', "UltrasonicSensor.get_distance com eco simulado (3cm)")
+def ultrasonic(scale):
+    trigger, echo = ULTRASONIC_PINS['trigger'], ULTRASONIC_PINS['echo']
+
+    def make():
+        clock = VirtualClock(read_cost=1e-6)
+        gpio = EchoGPIO(clock, trigger, echo)
+        sensor = UltrasonicSensor(trigger, echo, clock=clock, gpio=gpio)
+        return sensor.get_distance
+
+    return {'ultrasonic.get_distance': timed(make, _count(2000, scale), _count(15, scale, 3))}
+
+
+# ==================== MOTORES ====================
+
+def _command_sequence(motors):
+    motors.move_forward()
+    motors.turn_left()
+    motors.arc(30, 'left')
+    motors.pivot('right')
+    motors.move_backward()
+    motors.stop()
+
+
+@case('motors', "L298NController: sequências de comandos (sem e com rampa)")
+def motors(scale):
+    number, repeat = _count(2000, scale), _count(15, scale, 3)
+
+    def make_direct():
+        m = SimMotors(clock=VirtualClock())
+        return lambda: _command_sequence(m)
+
+    def make_repeated():
+        # Mesmo comando de novo: o caso comum no loop (cache de escrita)
+        m = SimMotors(clock=VirtualClock())
+        return m.move_forward
+
+    def make_ramp():
+        # Comando + 10 atualizações de rampa a 50Hz (como o executivo)
+        clock = VirtualClock()
+        m = SimMotors(acceleration=MOTOR_ACCELERATION,
+                      deceleration=MOTOR_DECELERATION, clock=clock)
+        commands = (m.move_forward, m.turn_left, m.stop)
+
+        def sequence():
+            for command in commands:
+                command()
+                for _ in range(10):
+                    clock.sleep(0.02)
+                    m.update()
+        return sequence
+
+    return {
+        'motors.sequence[6 comandos]': timed(make_direct, number, repeat),
+        'motors.repeat[move_forward]': timed(make_repeated, number * 5, repeat),
+        'motors.ramp[3 comandos x 10 updates]': timed(make_ramp, number // 5, repeat),
+    }
+
+
+# ==================== CÂMERA ====================
+
+def _frame(rng=None):
+    """Frame BGR sintético na resolução da câmera"""
+    width, height = CAMERA_CONFIG['resolution']
+    rng = rng or np.random.default_rng(0)
+    return rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def _camera(model_path):
+    from hardware.camera import CameraVision
+    with quiet():
+        return CameraVision(model_path=model_path, clock=VirtualClock())
+
+
+@case('camera.preprocess', "CameraVision.preprocess_frame de um frame 640x480")
+def preprocess(scale):
+    # Caminho sem modelo: modo STUB, só o pré-processamento
+    camera = _camera(os.path.join(os.path.dirname(MODEL_PATH), 'sem_modelo'))
+    frame = _frame()
+    return {'camera.preprocess_frame': timed(lambda: lambda: camera.preprocess_frame(frame),
+                                             _count(500, scale), _count(15, scale, 3))}
+
+
+@case('tflite', f"inferência TFLite do modelo de teste (1 frame e lote de {BATCH_SIZE})")
+def tflite_inference(scale):
+    from hardware.camera import TFLITE_AVAILABLE
+    if not TFLITE_AVAILABLE:
+        raise Skip("TFLite não disponível (tflite_runtime ou tensorflow)")
+    if not os.path.exists(MODEL_PATH):
+        raise Skip(f"modelo de teste ausente ({MODEL_PATH}; gerar com python -m bench.make_model)")
+
+    from hardware.camera import tflite
+    camera = _camera(MODEL_PATH)
+    if camera.model_type != 'tflite':
+        raise Skip(f"{MODEL_PATH} não carregou")
+    single = camera.preprocess_frame(_frame())
+    number, repeat = _count(200, scale, 5), _count(15, scale, 3)
+
+    # Lote: outro interpretador com a entrada redimensionada
+    interpreter = tflite.Interpreter(model_path=MODEL_PATH)
+    input_index = interpreter.get_input_details()[0]['index']
+    output_index = interpreter.get_output_details()[0]['index']
+    interpreter.resize_tensor_input(input_index, [BATCH_SIZE] + list(single.shape[1:]))
+    interpreter.allocate_tensors()
+    batch = np.repeat(single, BATCH_SIZE, axis=0)
+
+    def run_batch():
+        interpreter.set_tensor(input_index, batch)
+        interpreter.invoke()
+        return interpreter.get_tensor(output_index)
+
+    per_batch = timed(lambda: run_batch, max(1, number // BATCH_SIZE), repeat)
+    return {
+        'tflite.invoke[1]': timed(lambda: lambda: camera._predict_tflite(single), number, repeat),
+        f'tflite.invoke[lote {BATCH_SIZE}, por frame]': [t / BATCH_SIZE for t in per_batch],
+    }
@@ -0,0 +1,235 @@
+"""
+bench/core.py
+=============
+Registro de casos, medição, baselines JSON e comparação
+"""
+
+import fnmatch
+import gc
+import json
+import platform
+import time
+
+import numpy as np
+
+
+SCHEMA = 1
+
+# Variação da mediana acima da qual um caso é marcado (0.15 = 15%)
+DEFAULT_THRESHOLD = 0.15
+
+
+class Skip(Exception):
+    """Caso que não roda nesta máquina (ex: sem TFLite); a mensagem diz por quê"""
+
+
+# (nome, descrição, função) na ordem de registro
+CASES = []
+
+
+def case(name, description):
+    """
+    Registra um caso de benchmark.
+
+    A função recebe `scale` (1.0 normal, menor com --quick) e retorna
+    {nome do resultado: [tempos de uma chamada em s]} - um caso pode
+    gerar vários resultados (ex: uma iteração do loop por estado).
+    Levanta Skip se não puder rodar.
+    """
+    def register(fn):
+        CASES.append((name, description, fn))
+        return fn
+    return register
+
+
+def timed(make, number, repeat):
+    """
+    Tempo médio por chamada em `repeat` rodadas de `number` chamadas.
+
+    Como timeit: coleta de lixo desligada durante a rodada e o mínimo
+    de trabalho entre as chamadas.
+
+    Args:
+        make: função sem argumentos -> função medida (estado novo a
+              cada rodada: relógio virtual, históricos do PWM simulado)
+        number: chamadas por rodada
+        repeat: rodadas
+
+    Returns:
+        list: tempo por chamada (s) de cada rodada
+    """
+    samples = []
+    for _ in range(repeat):
+        fn = make()
+        fn()    # Aquecimento (caches, primeira alocação)
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            elapsed = time.perf_counter() - start
+        finally:
+            if enabled:
+                gc.enable()
+        samples.append(elapsed / number)
+    return samples
+
+
+def statistics(samples):
+    """
+    Resumo de uma lista de tempos (s) em microssegundos.
+
+    A comparação usa a mediana: robusta a uma rodada perturbada pelo
+    sistema, ao contrário da média.
+    """
+    values = np.asarray(samples, dtype=float) * 1e6
+    return {
+        'n': int(values.size),
+        'median_us': float(np.median(values)),
+        'min_us': float(values.min()),
+        'p95_us': float(np.percentile(values, 95)),
+    }
+
+
+def run(patterns=None, quick=False, progress=None):
+    """
+    Roda os casos registrados.
+
+    Args:
+        patterns: padrões fnmatch dos nomes dos casos (None = todos);
+                  sem curinga vale como substring
+        quick: rodadas menores (conferir que tudo roda, não medir)
+        progress: função(str) chamada antes de cada caso
+
+    Returns:
+        dict: {'schema', 'meta', 'results' {nome: estatísticas},
+               'skipped' {nome do caso: motivo}}
+    """
+    scale = 0.1 if quick else 1.0
+    results = {}
+    skipped = {}
+
+    for name, description, fn in CASES:
+        if patterns and not any(_matches(name, p) for p in patterns):
+            continue
+        if progress is not None:
+            progress(f"{name}: {description}")
+        try:
+            for result, samples in fn(scale).items():
+                results[result] = statistics(samples)
+        except Skip as e:
+            skipped[name] = str(e)
+
+    return {
+        'schema': SCHEMA,
+        'meta': machine_info(quick),
+        'results': results,
+        'skipped': skipped,
+    }
+
+
+def _matches(name, pattern):
+    if any(c in pattern for c in '*?['):
+        return fnmatch.fnmatch(name, pattern)
+    return pattern in name
+
+
+def machine_info(quick=False):
+    """Onde e com o que a medição foi feita (baselines só valem na mesma máquina)"""
+    import cv2
+    return {
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'host': platform.node(),
+        'machine': platform.machine(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'opencv': cv2.__version__,
+        'quick': quick,
+    }
+
+
+def save(report, path):
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load(path):
+    """
+    Raises:
+        ValueError: arquivo não é um baseline deste formato
+    """
+    with open(path) as f:
+        report = json.load(f)
+    if report.get('schema') != SCHEMA or 'results' not in report:
+        raise ValueError(f"{path}: não é um baseline (schema {SCHEMA})")
+    return report
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Compara as medianas de dois relatórios.
+
+    Args:
+        baseline, current: relatórios de run() / load()
+        threshold: variação relativa tolerada (0.15 = 15%)
+
+    Returns:
+        list: (nome, mediana base µs, mediana atual µs, variação, situação)
+              com situação 'REGRESSÃO', 'melhora', 'ok', 'novo' ou 'ausente'
+              (variação None quando um dos lados não existe)
+    """
+    base = baseline['results']
+    now = current['results']
+    rows = []
+    for name in list(base) + [n for n in now if n not in base]:
+        if name not in now:
+            rows.append((name, base[name]['median_us'], None, None, 'ausente'))
+            continue
+        if name not in base:
+            rows.append((name, None, now[name]['median_us'], None, 'novo'))
+            continue
+        old, new = base[name]['median_us'], now[name]['median_us']
+        change = new / old - 1.0 if old > 0 else 0.0
+        if change > threshold:
+            status = 'REGRESSÃO'
+        elif change < -threshold:
+            status = 'melhora'
+        else:
+            status = 'ok'
+        rows.append((name, old, new, change, status))
+    return rows
+
+
+def format_results(report):
+    """Tabela dos resultados de um relatório"""
+    lines = [f"{'caso':44s} {'mediana':>11s} {'mín':>11s} {'p95':>11s} {'n':>7s}"]
+    for name, s in report['results'].items():
+        lines.append(f"{name:44s} {_us(s['median_us']):>11s} {_us(s['min_us']):>11s} "
+                     f"{_us(s['p95_us']):>11s} {s['n']:7d}")
+    for name, reason in report['skipped'].items():
+        lines.append(f"{name:44s} pulado: {reason}")
+    return "\n".join(lines)
+
+
+def format_comparison(rows, threshold):
+    """Tabela de compare(); regressões no fim, para não se perderem"""
+    lines = [f"{'caso':44s} {'base':>11s} {'atual':>11s} {'variação':>9s}  "
+             f"(limite ±{threshold*100:.0f}%)"]
+    order = {'ok': 0, 'novo': 1, 'ausente': 2, 'melhora': 3, 'REGRESSÃO': 4}
+    for name, old, new, change, status in sorted(rows, key=lambda r: order[r[4]]):
+        lines.append(f"{name:44s} {_us(old):>11s} {_us(new):>11s} "
+                     f"{'' if change is None else f'{change*100:+.1f}%':>9s}  {status}")
+    regressions = sum(row[4] == 'REGRESSÃO' for row in rows)
+    lines.append(f"{regressions} regressão(ões) em {len(rows)} casos")
+    return "\n".join(lines)
+
+
+def _us(value):
+    if value is None:
+        return '-'
+    if value >= 1000:
+        return f"{value / 1000:.2f}ms"
+    return f"{value:.2f}µs"
+
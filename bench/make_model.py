@@ -0,0 +1,64 @@
+"""
+bench/make_model.py
+===================
+Gera o modelo TFLite pequeno usado nos casos de inferência do bench
+
+Mesma entrada e saída do classificador do robô (64x64x3 -> 2 classes),
+com poucas camadas e pesos aleatórios de semente fixa: o tempo medido
+é o do caminho do interpretador (set_tensor/invoke/get_tensor), não o
+do modelo de produção. Lote dinâmico, para o caso em lote.
+
+Requer TensorFlow (uma vez, em qualquer máquina); o .tflite gerado
+roda no tflite_runtime do Raspberry Pi.
+
+Uso:
+    python -m bench.make_model
+"""
+
+import os
+import sys
+
+from .cases import MODEL_PATH
+
+
+def build(path=MODEL_PATH, image_size=(64, 64)):
+    """
+    Cria e converte o modelo.
+
+    Returns:
+        int: tamanho do arquivo (bytes)
+    """
+    import tensorflow as tf
+
+    tf.keras.utils.set_random_seed(0)
+    model = tf.keras.Sequential([
+        tf.keras.Input(shape=(*image_size, 3)),
+        tf.keras.layers.Conv2D(8, 3, strides=2, activation='relu'),
+        tf.keras.layers.Conv2D(16, 3, strides=2, activation='relu'),
+        tf.keras.layers.GlobalAveragePooling2D(),
+        tf.keras.layers.Dense(2, activation='softmax'),
+    ])
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    data = converter.convert()
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+def main():
+    try:
+        import tensorflow  # noqa: F401
+    except ImportError:
+        print("ERRO: TensorFlow necessário para gerar o modelo")
+        print("Instale: pip3 install tensorflow")
+        return 1
+    size = build()
+    print(f"Modelo de teste gravado em {MODEL_PATH} ({size / 1024:.1f} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
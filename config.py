@@ -1,5 +1,7 @@
 # config.py - Configurações centralizadas do robô
 
+import os
+
 # ==================== CONFIGURAÇÃO DOS PINOS GPIO ====================
 
 # for GPIO numbering, choose BCM  
@@ -63,22 +65,102 @@ SCAN_SPEED = 40                 # Velocidade ao escanear placa procurando sujeir
 BRUSH_SPEED = 80                # Velocidade das vassouras quando limpando
 
 # Tempos (em segundos)
-MAIN_LOOP_DELAY = 0.1       # Delay entre iterações do loop principal
+MAIN_LOOP_DELAY = 0.1       # Período da máquina de estados (10Hz)
+
+# Executivo cíclico: taxa de cada tarefa do loop (Hz). A máquina de
+# estados roda a cada MAIN_LOOP_DELAY; ao atrasar além do próprio
+# período, a tarefa segue a política de overrun:
+#   'skip' = pula liberações perdidas, 'catch_up' = executa todas,
+#   'restart' = recomeça a grade no fim da execução
+SCHEDULER_CONFIG = {
+    'sensor_hz': 50,            # Ultrassônico + movimentos + odometria
+    'vision_hz': 1,             # Tenta a câmera (respeita o intervalo de visão)
+    'status_hz': 2,             # Linha de status no terminal
+    'sensor_median': 3,         # Mediana das últimas N leituras (anti-timeout)
+    'overrun_policy': 'skip'
+}
 
 # Tempos para manobra quando perde a placa
 TURN_90_TIME = 2.5          # Tempo para virar 90 graus
 SIDEWAYS_TIME = 0.7         # Tempo andando para o lado (largura do robô)
 
+# Rampas de velocidade dos motores (evitam pico de corrente e patinar no vidro)
+MOTOR_ACCELERATION = 200    # %/s de duty (0 -> 50% em 0.25s), None = sem rampa
+MOTOR_DECELERATION = 250    # %/s de duty ao reduzir/parar
+MOTOR_RAMP_THREAD = False   # True = thread própria (50Hz), False = no loop principal
+
+# Geometria e troca de faixa em arco
+WHEEL_BASE = 20             # Distância entre as rodas (cm) - medir no robô
+USE_ARC_UTURN = True        # True = troca de faixa num U-turn em arco contínuo
+                            # False = gira 90°, para, anda lateral, gira 90°
+
+# Odometria (sem encoders: integra os comandos dos motores)
+ODOMETRY_SLIP_NOISE = 0.05  # Erro relativo por roda (0.05 = 5% da distância)
+
 # PWM
 PWM_FREQUENCY = 1000        # Frequência do PWM para os motores
+PWM_BACKEND = 'auto'        # 'auto', 'hardware', 'pigpio', 'software' ou 'simulated'
+                            # auto: hardware (GPIO12/13) > pigpio (DMA) > software
 
 # ==================== CONFIGURAÇÕES DAS VASSOURAS ====================
 
-# Controle das vassouras
+# Controle das vassouras. A potência segue a probabilidade de sujeira
+# da visão: cada ponto da curva é (probabilidade, fração de 'speed',
+# fração de SCAN_SPEED), interpolado. Poeira leve = meia potência quase
+# na velocidade de escaneamento; sujeira pesada = potência máxima devagar.
 BRUSH_CONFIG = {
     'auto_activate': True,      # Ativar automaticamente ao detectar alvo
-    'speed': 50,                # Velocidade das vassouras (0-100)
-    'activation_delay': 0.2     # Delay antes de ativar (segundos)
+    'speed': BRUSH_SPEED,       # Duty máximo das vassouras (0-100)
+    'activation_delay': 0.2,    # Delay antes de ativar (segundos)
+    'curve': ((0.55, 0.5, 0.75), (0.8, 0.75, 0.5), (1.0, 1.0, 0.33)),
+    'on_threshold': 0.55,       # Nível de sujeira que liga as vassouras
+    'off_threshold': 0.45,      # Nível abaixo do qual desligam (histerese)
+    'smoothing': 1.0,           # Peso da última verificação no nível (1 = sem média)
+    # Liga/desliga sem ficar abaixando e levantando o servo (manobras
+    # mantêm o estado). Rastro: a área da última leitura suja fica até
+    # 38cm à frente das vassouras (câmera +20cm, 20cm de campo,
+    # vassouras -8cm; ver COVERAGE_CONFIG)
+    'min_on_time': 4.0,         # Ligadas ao menos isso antes de desligar (s)
+    'min_off_time': 2.0,        # Desligadas ao menos isso antes de religar (s)
+    'trail_distance': 38.0      # Segue limpando após a última leitura suja (cm)
+}
+
+# Servo das vassouras: cada movimento espera distância / speed + margin
+# (0° -> 90° a 360°/s = 0.3s; antes eram 0.5s fixos). Movimento para a
+# posição atual não espera. Calibrar speed medindo 0° -> 90° montado.
+SERVO_CONFIG = {
+    'speed': 360,               # Velocidade de giro com as vassouras (°/s)
+    'margin': 0.05,             # Folga após o tempo calculado (s)
+    'hold': False               # True = mantém o pulso parado na posição
+}
+
+# ==================== MAPA DE COBERTURA ====================
+
+# Grade no referencial da odometria (origem = onde o robô começa)
+COVERAGE_CONFIG = {
+    'size': (200, 100),         # Área mapeada (comprimento, largura) em cm
+    'origin': (-10, -50),       # Canto da grade em relação ao início (cm)
+    'resolution': 2.0,          # Lado de cada célula (cm)
+    'robot_size': (25, 20),     # Footprint do robô (comprimento, largura) cm
+    'brush_size': (6, 20),      # Faixa limpa pelas vassouras (cm)
+    'brush_offset': -8,         # Vassouras em relação ao centro (cm, - = atrás)
+    'camera_size': (20, 20),    # Área vista pela câmera (cm)
+    'camera_offset': 20,        # Centro da área da câmera à frente (cm)
+    'brush_efficiency': 0.8,    # Fração da sujeira removida por passada
+    'grow': True                # Cresce a grade se o robô sair dela (placa maior
+                                # que size ou robô posto longe do canto)
+}
+
+# ==================== PLANEJADOR DE FAIXAS ====================
+
+# Após ver duas bordas opostas, troca a manobra reativa por faixas
+# paralelas (vai-e-volta) espaçadas pela largura das vassouras
+PLANNER_CONFIG = {
+    'enabled': True,
+    'lane_spacing': COVERAGE_CONFIG['brush_size'][1],  # cm
+    'panel_width': None,        # cm, None = até encontrar a borda lateral
+    'coverage_target': None     # Ex: 0.95 encerra a placa com 95% visitada
+                                # (exige panel_width: fração da placa inteira)
 }
 
 # ==================== CONFIGURAÇÕES DA CÂMERA ====================
@@ -92,9 +174,35 @@ CAMERA_CONFIG = {
 
 # ==================== CONFIGURAÇÕES DE DEBUG ====================
 
-DEBUG_MODE = True           # Ativa/desativa mensagens de debug
+DEBUG_MODE = True           # Ativa/desativa mensagens de debug (status a cada tick)
 VERBOSE_SENSORS = True      # Mostra leituras detalhadas dos sensores
 LOG_TO_FILE = False         # Salva logs em arquivo
+LOG_FILE = 'robot.log'      # Arquivo de log (com LOG_TO_FILE = True)
+
+# Gravador de voo: um registro binário por iteração da máquina de estados
+# num anel mmap (sobrevive a travamentos). Ler: python3 telemetry.py <path>
+TELEMETRY_CONFIG = {
+    'enabled': True,
+    'path': 'telemetry.tlm',    # O voo anterior fica em telemetry.tlm.prev
+    'capacity': 36000           # Registros (1h a 10Hz, ~1.7MB)
+}
+
+# Métricas ao vivo (texto Prometheus em http://host:port/metrics).
+# Desligadas, os componentes não medem nada além do que já medem.
+METRICS_CONFIG = {
+    'enabled': False,
+    'host': '127.0.0.1',        # Só local; '0.0.0.0' expõe na rede
+    'port': 9108
+}
+
+# Perfil sob demanda: kill -USR1 <pid> (cProfile), -USR2 (amostragem),
+# -QUIT (pilhas + tempos do loop). Sem custo até o sinal chegar.
+PROFILING_CONFIG = {
+    'enabled': True,
+    'directory': 'profiles',
+    'duration': 30.0,           # Duração de cada perfil (s)
+    'sample_hz': 200            # Frequência da amostragem
+}
 
 # ==================== MAPEAMENTO DE ESTADOS ====================
 
@@ -105,6 +213,44 @@ STATE_MESSAGES = {
     'STOPPED': 'Robô parado.'
 }
 
+# ==================== PERFIL OTIMIZADO ====================
+
+# Calibração medida no robô, antes de qualquer perfil
+# (o simulador usa como física real)
+MEASURED_TURN_90_TIME = TURN_90_TIME
+MEASURED_TURN_SPEED = SEARCH_SPEED
+
+# Constantes que um perfil pode sobrescrever (gerado por sim.optimize)
+PROFILE_KEYS = ('TURN_90_TIME', 'SIDEWAYS_TIME', 'SEARCH_SPEED', 'SCAN_SPEED')
+
+
+def load_profile(path):
+    """
+    Lê um perfil JSON de parâmetros.
+
+    Args:
+        path: arquivo gerado por `python -m sim.optimize`
+
+    Returns:
+        dict: {constante: valor} só com chaves de PROFILE_KEYS
+    """
+    import json
+    with open(path) as f:
+        profile = json.load(f)
+
+    values = {key: value for key, value in profile.items() if not key.startswith('_')}
+    unknown = set(values) - set(PROFILE_KEYS)
+    if unknown:
+        raise ValueError(f"Perfil {path}: chaves desconhecidas {sorted(unknown)}")
+    return values
+
+
+# ROBOT_PROFILE=profiles/otimizado.json python3 main.py
+ROBOT_PROFILE = os.environ.get('ROBOT_PROFILE')
+if ROBOT_PROFILE:
+    globals().update(load_profile(ROBOT_PROFILE))
+    print(f"[CONFIG] Perfil carregado: {ROBOT_PROFILE}")
+
 # ==================== VALIDAÇÃO ====================
 
 def validate_config():
@@ -137,6 +283,54 @@ def validate_config():
     if PANEL_LOST_THRESHOLD < 1:
         errors.append("ERRO: PANEL_LOST_THRESHOLD deve ser >= 1")
     
+    # Verificar geometria
+    if WHEEL_BASE <= 0:
+        errors.append("ERRO: WHEEL_BASE deve ser maior que 0")
+    
+    # Verificar backend PWM (mesma lista aceita por create_pwm)
+    from hardware.pwm import BACKENDS
+    if PWM_BACKEND not in BACKENDS:
+        errors.append(f"ERRO: PWM_BACKEND inválido (opções: {', '.join(BACKENDS)})")
+    
+    # Verificar executivo cíclico
+    if MAIN_LOOP_DELAY <= 0:
+        errors.append("ERRO: MAIN_LOOP_DELAY deve ser maior que 0")
+    if SCHEDULER_CONFIG['overrun_policy'] not in ('skip', 'catch_up', 'restart'):
+        errors.append("ERRO: SCHEDULER_CONFIG['overrun_policy'] inválida")
+    if SCHEDULER_CONFIG['sensor_median'] < 1:
+        errors.append("ERRO: SCHEDULER_CONFIG['sensor_median'] deve ser >= 1")
+    
+    # Verificar planejador
+    if PLANNER_CONFIG['coverage_target'] is not None:
+        if not (0 < PLANNER_CONFIG['coverage_target'] <= 1):
+            errors.append("ERRO: PLANNER_CONFIG['coverage_target'] deve estar em (0, 1]")
+        if PLANNER_CONFIG['panel_width'] is None:
+            errors.append("ERRO: PLANNER_CONFIG['coverage_target'] exige 'panel_width'")
+    
+    # Verificar vassouras
+    if not (0 <= BRUSH_CONFIG['speed'] <= 100):
+        errors.append("ERRO: BRUSH_CONFIG['speed'] deve estar entre 0 e 100")
+    if not (0 <= BRUSH_CONFIG['off_threshold'] <= BRUSH_CONFIG['on_threshold'] <= 1):
+        errors.append("ERRO: BRUSH_CONFIG exige 0 <= off_threshold <= on_threshold <= 1")
+    if not (0 < BRUSH_CONFIG['smoothing'] <= 1):
+        errors.append("ERRO: BRUSH_CONFIG['smoothing'] deve estar em (0, 1]")
+    if min(BRUSH_CONFIG['min_on_time'], BRUSH_CONFIG['min_off_time'],
+           BRUSH_CONFIG['trail_distance']) < 0:
+        errors.append("ERRO: BRUSH_CONFIG min_on_time, min_off_time e trail_distance devem ser >= 0")
+    curve_p = [point[0] for point in BRUSH_CONFIG['curve']]
+    if not curve_p or any(a >= b for a, b in zip(curve_p, curve_p[1:])):
+        errors.append("ERRO: BRUSH_CONFIG['curve'] deve estar em ordem crescente de probabilidade")
+    
+    # Verificar servo
+    if SERVO_CONFIG['speed'] <= 0 or SERVO_CONFIG['margin'] < 0:
+        errors.append("ERRO: SERVO_CONFIG['speed'] deve ser > 0 e ['margin'] >= 0")
+    
+    # Verificar métricas
+    if not (0 < METRICS_CONFIG['port'] < 65536):
+        errors.append("ERRO: METRICS_CONFIG['port'] inválida")
+    if PROFILING_CONFIG['duration'] <= 0 or PROFILING_CONFIG['sample_hz'] <= 0:
+        errors.append("ERRO: PROFILING_CONFIG['duration'] e ['sample_hz'] devem ser > 0")
+    
     return errors
 
 # Executar validação ao importar
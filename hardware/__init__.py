@@ -13,15 +13,22 @@ Uso:
 """
 
 from .motors import L298NController
-from .brushes import BrushController
+from .brushes import BrushController, BrushState
 from .sensors import UltrasonicSensor
 from .camera import CameraVision
 from .servo import ServoController
+from .pwm import create_pwm, set_default_backend
+from .clock import MonotonicClock, VirtualClock
 
 __all__ = [
     'L298NController',
     'BrushController', 
+    'BrushState',
     'UltrasonicSensor',
     'CameraVision',
-    'ServoController'
+    'ServoController',
+    'create_pwm',
+    'set_default_backend',
+    'MonotonicClock',
+    'VirtualClock'
 ]
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""
+hardware/actuators.py
+=====================
+Sequências não-bloqueantes de atuadores (servo, vassouras)
+
+Uma sequência é uma lista de passos (estado, ação): a ação roda quando
+o passo começa e retorna quanto tempo esperar antes do próximo. Como no
+MotionExecutor, nada dorme: update() é chamado a cada iteração do loop
+e passa de passo quando o deadline vence. O loop continua lendo o
+sensor e dirigindo enquanto as vassouras descem.
+
+O fim da sequência completa um concurrent.futures.Future com o estado
+final. No loop de controle use future.done() (result() sem timeout
+esperaria por um update() que só o próprio loop chama).
+"""
+
+from collections import deque
+from concurrent.futures import Future
+
+
+def completed(result=None):
+    """Future já concluído (pedido que não precisa de sequência)"""
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+class ActuatorTask:
+    """Sequência de passos avançada por update() no relógio injetado"""
+
+    def __init__(self, steps, clock):
+        """
+        Args:
+            steps: lista de (estado, ação); ação() -> espera em s
+                   (None = 0, passa direto para o próximo passo)
+            clock: relógio (hardware.clock)
+        """
+        self.steps = deque(steps)
+        self.clock = clock
+        self.future = Future()
+        self.state = None
+        self.deadline = None
+
+    def update(self):
+        """
+        Executa os passos cujo tempo chegou.
+
+        Returns:
+            bool: True se a sequência terminou (ou foi cancelada)
+        """
+        if self.future.done():
+            return True
+        while self.deadline is None or self.deadline.expired():
+            if not self.steps:
+                self.future.set_result(self.state)
+                return True
+            self.state, action = self.steps.popleft()
+            self.deadline = self.clock.deadline(action() or 0.0)
+        return False
+
+    def remaining(self):
+        """Tempo (s) até o próximo passo (0 se terminou)"""
+        if self.future.done() or self.deadline is None:
+            return 0.0
+        return self.deadline.remaining()
+
+    def cancel(self):
+        """Descarta os passos que faltam (o Future fica cancelado)"""
+        self.steps.clear()
+        self.future.cancel()
+
+    def wait(self):
+        """
+        Conclui a sequência dormindo até cada passo (modo bloqueante:
+        cleanup, scripts de teste).
+
+        Returns:
+            estado final
+        """
+        while not self.update():
+            self.clock.sleep_until(self.deadline)
+        return self.state
@@ -4,9 +4,26 @@ hardware/brushes.py
 Controlador dos motores das vassouras com servo para levantar/abaixar
 """
 
-import RPi.GPIO as GPIO
-import time
+from enum import Enum
+
+from .gpio import GPIO
+from .pwm import create_pwm
+from .clock import REAL_CLOCK
 from .servo import ServoController
+from .actuators import ActuatorTask, completed
+from logger import get_logger
+import metrics
+
+
+log = get_logger('brushes')
+
+
+class BrushState(Enum):
+    """Estado do conjunto servo + motores das vassouras"""
+    RAISED = "raised"           # Levantadas e paradas
+    LOWERING = "lowering"       # Esperando, abaixando ou estabilizando
+    RUNNING = "running"         # Abaixadas e girando
+    STOPPING = "stopping"       # Motores parando / servo levantando
 
 
 class BrushController:
@@ -20,13 +37,18 @@ class BrushController:
     4. Desligar motores das vassouras
     5. Levantar vassouras (servo 90° -> 0°)
     
+    request_start()/request_stop() não bloqueiam: a sequência avança em
+    update(), chamado pelo loop, e o estado (BrushState) mostra em que
+    ponto está. start()/stop() esperam a sequência terminar.
+    
     Responsável por:
     - Ligar/desligar vassouras
     - Controle de velocidade via PWM
     - Levantar/abaixar via servo motor
     """
     
-    def __init__(self, brush_pins, servo_pin, brush_speed=50):
+    def __init__(self, brush_pins, servo_pin, brush_speed=50, clock=None,
+                 servo_config=None, gpio=None):
         """
         Inicializa controlador das vassouras.
         
@@ -38,95 +60,179 @@ class BrushController:
                 }
             servo_pin: pino GPIO do servo (levanta/abaixa)
             brush_speed: velocidade padrão das vassouras (0-100)
+            clock: relógio das esperas (None = relógio real)
+            servo_config: argumentos do ServoController (speed, margin,
+                          hold); None = padrões
+            gpio: módulo/objeto GPIO, repassado ao servo (None =
+                  hardware.gpio.GPIO)
         """
         self.pins = brush_pins
+        self.clock = clock or REAL_CLOCK
         self.brush_speed = brush_speed
+        self.gpio = gpio or GPIO
         
         # Configurar GPIO
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setwarnings(False)
+        self.gpio.setmode(self.gpio.BCM)
+        self.gpio.setwarnings(False)
         
-        # Configurar pinos como saída
+        # Configurar pinos de direção como saída
+        # (pino ENABLE é configurado pelo backend PWM)
         for brush in self.pins.values():
-            for pin in brush.values():
-                GPIO.setup(pin, GPIO.OUT)
+            for name, pin in brush.items():
+                if name != 'enable':
+                    self.gpio.setup(pin, self.gpio.OUT)
         
         # Criar objetos PWM (1000 Hz)
-        self.brush1_pwm = GPIO.PWM(self.pins['brush_1']['enable'], 1000)
-        self.brush2_pwm = GPIO.PWM(self.pins['brush_2']['enable'], 1000)
+        self.brush1_pwm = create_pwm(self.pins['brush_1']['enable'], 1000, gpio=self.gpio)
+        self.brush2_pwm = create_pwm(self.pins['brush_2']['enable'], 1000, gpio=self.gpio)
         
         # Iniciar PWM com duty cycle 0
         self.brush1_pwm.start(0)
         self.brush2_pwm.start(0)
         
         # Inicializar servo
-        self.servo = ServoController(servo_pin)
+        self.servo = ServoController(servo_pin, clock=self.clock, gpio=self.gpio,
+                                     **(servo_config or {}))
         
-        self._running = False
+        self._running = False   # Motores girando
+        self._task = None       # Sequência em curso (ou a última)
+        
+        self.m_activations = metrics.counter('brushes_activations_total', "Vezes que as vassouras ligaram")
+        self.m_writes = metrics.counter('brushes_gpio_writes_total', "Escritas GPIO/PWM das vassouras")
+        metrics.gauge('brushes_running', "Vassouras ligadas (1) ou paradas (0)",
+                      fn=lambda: int(self._running))
         
         print(f"[BRUSHES] Inicializadas (velocidade: {brush_speed}%)")
         print(f"[BRUSHES] Servo no pino {servo_pin}")
     
-    def start(self):
+    @property
+    def state(self):
+        """BrushState atual (o da sequência em curso ou da última)"""
+        return self._task.state if self._task is not None else BrushState.RAISED
+    
+    def is_active(self):
+        """True se abaixando ou limpando (limpeza pedida)"""
+        return self.state in (BrushState.LOWERING, BrushState.RUNNING)
+    
+    def request_start(self, delay=0.0):
         """
-        Inicia limpeza: abaixa vassouras e liga motores.
+        Inicia limpeza sem bloquear: abaixa vassouras e liga motores.
         
-        Sequência:
-        1. Abaixar servo (0° -> 90°)
-        2. Aguardar servo estabilizar
+        Sequência (avançada por update()):
+        1. Esperar `delay` (ex: robô estabilizar)
+        2. Abaixar servo (0° -> 90°) e aguardar estabilizar
         3. Ligar motores das vassouras
-        """
-        if not self._running:
-            print("[BRUSHES] Iniciando limpeza...")
-            
-            # 1. Abaixar vassouras
-            self.servo.lower_down()
-            time.sleep(0.3)  # Aguardar servo estabilizar
-            
-            # 2. Ligar motores
-            # Vassoura 1: girar
-            GPIO.output(self.pins['brush_1']['in1'], GPIO.LOW)
-            GPIO.output(self.pins['brush_1']['in2'], GPIO.HIGH)
-            
-            # Vassoura 2: girar
-            GPIO.output(self.pins['brush_2']['in1'], GPIO.HIGH)
-            GPIO.output(self.pins['brush_2']['in2'], GPIO.LOW)
-            
-            # Aplicar velocidade
-            self.brush1_pwm.ChangeDutyCycle(self.brush_speed)
-            self.brush2_pwm.ChangeDutyCycle(self.brush_speed)
+        
+        Pedido durante STOPPING interrompe a subida e volta a abaixar.
+        
+        Args:
+            delay: espera antes de abaixar (s)
             
-            self._running = True
-            print("[BRUSHES] Limpando (vassouras abaixadas e girando)")
+        Returns:
+            Future: concluído com BrushState.RUNNING
+        """
+        if self.state == BrushState.RUNNING:
+            return completed(BrushState.RUNNING)
+        if self.state == BrushState.LOWERING:
+            return self._task.future
+        
+        log.debug("[BRUSHES] Iniciando limpeza...")
+        steps = [(BrushState.LOWERING, lambda: delay)] if delay > 0 else []
+        steps += [(BrushState.LOWERING, action) for _, action in self.servo.move_steps(90)]
+        steps += [
+            (BrushState.LOWERING, lambda: 0.3),     # Aguardar servo estabilizar
+            (BrushState.RUNNING, self._motors_on),
+        ]
+        return self._run(steps)
     
-    def stop(self):
+    def request_stop(self):
         """
-        Para limpeza: desliga motores e levanta vassouras.
+        Para limpeza sem bloquear: desliga motores e levanta vassouras.
+        
+        Sequência (avançada por update()):
+        1. Desligar motores das vassouras e aguardar pararem
+        2. Levantar servo (90° -> 0°)
+        
+        Pedido durante LOWERING interrompe a descida.
         
-        Sequência:
-        1. Desligar motores das vassouras
-        2. Aguardar motores pararem
-        3. Levantar servo (90° -> 0°)
+        Returns:
+            Future: concluído com BrushState.RAISED
         """
-        if self._running:
-            print("[BRUSHES] Parando limpeza...")
-            
-            # 1. Desligar motores
-            self.brush1_pwm.ChangeDutyCycle(0)
-            self.brush2_pwm.ChangeDutyCycle(0)
-            
-            GPIO.output(self.pins['brush_1']['in1'], GPIO.LOW)
-            GPIO.output(self.pins['brush_1']['in2'], GPIO.LOW)
-            GPIO.output(self.pins['brush_2']['in1'], GPIO.LOW)
-            GPIO.output(self.pins['brush_2']['in2'], GPIO.LOW)
-            
-            time.sleep(0.2)  # Aguardar motores pararem
-            
-            # 2. Levantar vassouras
-            self.servo.lift_up()
-            
-            self._running = False
-            print("[BRUSHES] Paradas (vassouras levantadas)")
+        if self.state == BrushState.RAISED:
+            return completed(BrushState.RAISED)
+        if self.state == BrushState.STOPPING:
+            return self._task.future
+        
+        log.debug("[BRUSHES] Parando limpeza...")
+        steps = [(BrushState.STOPPING, self._motors_off)]
+        steps += [(BrushState.STOPPING, action) for _, action in self.servo.move_steps(0)]
+        steps += [(BrushState.RAISED, self._raised)]
+        return self._run(steps)
+    
+    def _run(self, steps):
+        if self._task is not None:
+            self._task.cancel()
+        self._task = ActuatorTask(steps, self.clock)
+        self._task.update()
+        return self._task.future
+    
+    def update(self):
+        """Avança a sequência em curso (chamar a cada iteração do loop)"""
+        if self._task is not None:
+            self._task.update()
+    
+    def wait(self):
+        """Bloqueia até a sequência em curso terminar"""
+        if self._task is not None:
+            self._task.wait()
+    
+    def start(self):
+        """Inicia limpeza e espera as vassouras girarem (bloqueante)"""
+        self.request_start()
+        self.wait()
+    
+    def stop(self):
+        """Para limpeza e espera as vassouras subirem (bloqueante)"""
+        self.request_stop()
+        self.wait()
+    
+    def _motors_on(self):
+        # Vassoura 1: girar
+        self.gpio.output(self.pins['brush_1']['in1'], self.gpio.LOW)
+        self.gpio.output(self.pins['brush_1']['in2'], self.gpio.HIGH)
+        
+        # Vassoura 2: girar
+        self.gpio.output(self.pins['brush_2']['in1'], self.gpio.HIGH)
+        self.gpio.output(self.pins['brush_2']['in2'], self.gpio.LOW)
+        
+        # Aplicar velocidade
+        self.brush1_pwm.ChangeDutyCycle(self.brush_speed)
+        self.brush2_pwm.ChangeDutyCycle(self.brush_speed)
+        
+        self._running = True
+        self.m_activations.inc()
+        self.m_writes.inc(6)
+        log.info("[BRUSHES] Limpando (vassouras abaixadas e girando)")
+    
+    def _motors_off(self):
+        """Desliga os motores; retorna a espera até pararem (s)"""
+        if not self._running:
+            return 0.0      # Descida interrompida: motores nem ligaram
+        
+        self.brush1_pwm.ChangeDutyCycle(0)
+        self.brush2_pwm.ChangeDutyCycle(0)
+        
+        self.gpio.output(self.pins['brush_1']['in1'], self.gpio.LOW)
+        self.gpio.output(self.pins['brush_1']['in2'], self.gpio.LOW)
+        self.gpio.output(self.pins['brush_2']['in1'], self.gpio.LOW)
+        self.gpio.output(self.pins['brush_2']['in2'], self.gpio.LOW)
+        
+        self._running = False
+        self.m_writes.inc(6)
+        return 0.2  # Aguardar motores pararem
+    
+    def _raised(self):
+        log.info("[BRUSHES] Paradas (vassouras levantadas)")
     
     def set_speed(self, speed):
         """
@@ -140,6 +246,7 @@ class BrushController:
         if self._running:
             self.brush1_pwm.ChangeDutyCycle(self.brush_speed)
             self.brush2_pwm.ChangeDutyCycle(self.brush_speed)
+            self.m_writes.inc(2)
     
     def is_running(self):
         """
@@ -152,9 +259,8 @@ class BrushController:
     
     def cleanup(self):
         """Limpa recursos GPIO"""
-        # Garantir que para corretamente
-        if self._running:
-            self.stop()
+        # Garantir que para corretamente (conclui sequência em curso)
+        self.stop()
         
         # Limpar recursos
         self.brush1_pwm.stop()
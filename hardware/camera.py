@@ -9,6 +9,21 @@ import cv2
 import numpy as np
 import time
 import os
+import sys
+import traceback
+from collections import deque
+
+try:
+    from .clock import REAL_CLOCK
+except ImportError:
+    # Executado como script (python camera.py convert)
+    from clock import REAL_CLOCK
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logger
+import metrics
+
+log = logger.get_logger('camera')
 
 # Tentar importar TensorFlow Lite
 TFLITE_AVAILABLE = False
@@ -36,6 +51,97 @@ except ImportError:
     print("[CAMERA] TensorFlow não disponível para carregar .keras")
 
 
+class StageProfiler:
+    """
+    Tempo de cada etapa de uma verificação (perf_counter_ns).
+
+    start() abre uma medição; cada mark(etapa) atribui à etapa o tempo
+    desde a marca anterior; finish() fecha. Fora de uma medição mark()
+    não faz nada (capture_frame()/preprocess_frame() chamados avulsos).
+    As últimas `window` medições de cada etapa ficam numa janela
+    deslizante para o resumo p50/p95/máx.
+    """
+
+    def __init__(self, window=200):
+        """
+        Args:
+            window: medições guardadas por etapa
+        """
+        self.window = window
+        self.samples = {}       # etapa -> deque de ns (ordem de primeira marca)
+        self.last = {}          # etapa -> ns da última medição
+        self._mark = None
+
+    def start(self):
+        self.last = {}
+        self._mark = time.perf_counter_ns()
+
+    def mark(self, stage):
+        if self._mark is None:
+            return
+        now = time.perf_counter_ns()
+        elapsed = now - self._mark
+        self._mark = now
+        self.last[stage] = elapsed
+        if stage not in self.samples:
+            self.samples[stage] = deque(maxlen=self.window)
+        self.samples[stage].append(elapsed)
+
+    def finish(self):
+        """
+        Fecha a medição.
+
+        Returns:
+            dict: {etapa: ms} da medição
+        """
+        self._mark = None
+        return {stage: ns / 1e6 for stage, ns in self.last.items()}
+
+    def total(self, *stages):
+        """Soma (s) das etapas dadas na última medição"""
+        return sum(self.last.get(stage, 0) for stage in stages) / 1e9
+
+    def summary(self):
+        """
+        Returns:
+            dict: {etapa: {'n', 'p50', 'p95', 'max'}} em ms
+        """
+        result = {}
+        for stage, values in self.samples.items():
+            ordered = sorted(values)
+            n = len(ordered)
+            result[stage] = {
+                'n': n,
+                'p50': ordered[(n - 1) // 2] / 1e6,
+                'p95': ordered[min(n - 1, int(round(0.95 * (n - 1))))] / 1e6,
+                'max': ordered[-1] / 1e6,
+            }
+        return result
+
+    def report(self):
+        """
+        Tabela p50/p95/máx por etapa.
+
+        Returns:
+            str: texto multi-linha
+        """
+        lines = [f"{'Etapa':14s} {'n':>5s} {'p50':>9s} {'p95':>9s} {'máx':>9s}  (ms)"]
+        for stage, s in self.summary().items():
+            lines.append(f"{stage:14s} {s['n']:5d} {s['p50']:9.2f} {s['p95']:9.2f} {s['max']:9.2f}")
+        return "\n".join(lines)
+
+
+def format_stages(timings):
+    """{etapa: ms} -> 'etapa 1.2ms | ...'"""
+    return " | ".join(f"{stage} {ms:.1f}ms" for stage, ms in timings.items())
+
+
+# Etapas de captura e de computação (profiler e métricas)
+CAPTURE_STAGES = ('abrir', 'estabilizar', 'ler')
+COMPUTE_STAGES = ('redimensionar', 'cor', 'normalizar',
+                  'set_tensor', 'invoke', 'get_tensor', 'predict')
+
+
 class CameraVision:
     """
     Sistema de visão computacional.
@@ -47,7 +153,7 @@ class CameraVision:
     """
     
     def __init__(self, model_path='classificador_placa_solar', 
-                 image_size=(64, 64), confidence_threshold=0.7):
+                 image_size=(64, 64), confidence_threshold=0.7, clock=None):
         """
         Inicializa sistema de visão.
         
@@ -55,9 +161,11 @@ class CameraVision:
             model_path: Caminho do modelo (sem extensão ou com .keras/.h5/.tflite)
             image_size: Tamanho entrada (64, 64)
             confidence_threshold: Confiança mínima (0.7 = 70%)
+            clock: relógio das esperas (None = relógio real)
         """
         print("[CAMERA] Inicializando visão computacional...")
         
+        self.clock = clock or REAL_CLOCK
         self.image_size = image_size
         self.confidence_threshold = confidence_threshold
         self.camera_ready = False
@@ -70,6 +178,23 @@ class CameraVision:
         # Contador para modo STUB (quando modelo não carregado)
         self.stub_call_count = 0
         
+        # P(suja) da última inferência (None = sem inferência: STUB, erro)
+        self.last_probability = None
+        
+        # Tempo por etapa de cada verificação
+        self.profiler = StageProfiler()
+        self.last_timings = {}
+        
+        # Métricas (objetos nulos com metrics desligado)
+        self.m_checks = {result: metrics.counter('camera_checks_total',
+                                                 "Verificações de visão por resultado",
+                                                 result=result)
+                         for result in ('dirty', 'clean', 'low_confidence', 'no_frame', 'error')}
+        self.m_capture_time = metrics.histogram('camera_capture_seconds', "Captura de um frame",
+                                                buckets=(0.05, 0.1, 0.2, 0.5, 1.0, 1.5, 2.0, 5.0))
+        self.m_inference_time = metrics.histogram('camera_inference_seconds',
+                                                  "Pré-processamento + inferência do modelo")
+        
         # Tentar carregar modelo
         self._load_model(model_path)
     
@@ -155,23 +280,26 @@ class CameraVision:
         """Captura frame da câmera"""
         try:
             cap = cv2.VideoCapture(0)
+            self.profiler.mark('abrir')
             
             if not cap.isOpened():
-                print("[CAMERA] Câmera não disponível")
+                log.warning("[CAMERA] Câmera não disponível", every=60)
                 return None
             
-            time.sleep(1)  # Estabilizar
+            self.clock.sleep(1)  # Estabilizar
+            self.profiler.mark('estabilizar')
             ret, frame = cap.read()
             cap.release()
+            self.profiler.mark('ler')
             
             if not ret:
-                print("[CAMERA] Falha ao capturar")
+                log.warning("[CAMERA] Falha ao capturar", every=60)
                 return None
             
             return frame
         
         except Exception as e:
-            print(f"[CAMERA] Erro: {e}")
+            log.error("[CAMERA] Erro: %s", e, every=60)
             return None
     
     def preprocess_frame(self, frame):
@@ -186,9 +314,11 @@ class CameraVision:
         """
         # Redimensionar
         img = cv2.resize(frame, self.image_size)
+        self.profiler.mark('redimensionar')
         
         # BGR → RGB
         img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        self.profiler.mark('cor')
         
         # Normalizar [0, 255] → [0, 1]
         img = img.astype(np.float32) / 255.0
@@ -199,9 +329,10 @@ class CameraVision:
         img = (img - mean) / std
         
         # Batch dimension (1, 64, 64, 3)
-        img = np.expand_dims(img, axis=0)
+        img = np.expand_dims(img, axis=0).astype(np.float32)
+        self.profiler.mark('normalizar')
         
-        return img.astype(np.float32)
+        return img
     
     def _stub_detection(self):
         """
@@ -216,26 +347,26 @@ class CameraVision:
         """
         self.stub_call_count += 1
         
-        print(f"[CAMERA] STUB - Verificação #{self.stub_call_count}")
+        log.debug("[CAMERA] STUB - Verificação #%d", self.stub_call_count)
         
         # Primeiras 2 chamadas: LIMPA
         if self.stub_call_count <= 2:
-            print(f"[CAMERA] STUB: Placa limpa (primeiras verificações)")
-            print(f"[CAMERA] Confiança: 0.85 (85%) [SIMULADO]")
-            print(f"[CAMERA] Probs: Clean=0.85, Dusty=0.15 [SIMULADO]")
+            log.info("[CAMERA] STUB: Placa limpa (primeiras verificações)")
+            log.debug("[CAMERA] Confiança: 0.85 (85%) [SIMULADO]")
+            log.debug("[CAMERA] Probs: Clean=0.85, Dusty=0.15 [SIMULADO]")
             return False
         
         # A partir da 3ª chamada: alterna
         is_dusty = (self.stub_call_count % 2) == 1  # Ímpar = Suja, Par = Limpa
         
         if is_dusty:
-            print(f"[CAMERA] STUB: >>> SUJEIRA! <<< [SIMULADO]")
-            print(f"[CAMERA] Confiança: 0.80 (80%) [SIMULADO]")
-            print(f"[CAMERA] Probs: Clean=0.20, Dusty=0.80 [SIMULADO]")
+            log.info("[CAMERA] STUB: >>> SUJEIRA! <<< [SIMULADO]")
+            log.debug("[CAMERA] Confiança: 0.80 (80%) [SIMULADO]")
+            log.debug("[CAMERA] Probs: Clean=0.20, Dusty=0.80 [SIMULADO]")
         else:
-            print(f"[CAMERA] STUB: Placa limpa [SIMULADO]")
-            print(f"[CAMERA] Confiança: 0.85 (85%) [SIMULADO]")
-            print(f"[CAMERA] Probs: Clean=0.85, Dusty=0.15 [SIMULADO]")
+            log.info("[CAMERA] STUB: Placa limpa [SIMULADO]")
+            log.debug("[CAMERA] Confiança: 0.85 (85%) [SIMULADO]")
+            log.debug("[CAMERA] Probs: Clean=0.85, Dusty=0.15 [SIMULADO]")
         
         return is_dusty
     
@@ -245,18 +376,28 @@ class CameraVision:
         
         CHAMADO PELO ROBÔ A CADA 15 SEGUNDOS!
         
+        A probabilidade de sujeira do classificador fica em
+        last_probability (também com confiança baixa: poeira leve).
+        
         Returns:
             bool: True = SUJEIRA, False = LIMPA
         """
+        self.last_probability = None
+        
         # Se modelo não está carregado, usa STUB
         if not self.camera_ready:
-            return self._stub_detection()
+            is_dusty = self._stub_detection()
+            self.m_checks['dirty' if is_dusty else 'clean'].inc()
+            return is_dusty
         
+        self.profiler.start()
         try:
             # 1. Capturar
             frame = self.capture_frame()
             if frame is None:
+                self.m_checks['no_frame'].inc()
                 return False
+            self.m_capture_time.observe(self.profiler.total(*CAPTURE_STAGES))
             
             # 2. Preprocessar
             input_data = self.preprocess_frame(frame)
@@ -268,10 +409,12 @@ class CameraVision:
                 prediction = self._predict_keras(input_data)
             else:
                 return False
+            self.m_inference_time.observe(self.profiler.total(*COMPUTE_STAGES))
             
             # 4. Interpretar
             prob_clean = prediction[0][0]
             prob_dusty = prediction[0][1]
+            self.last_probability = float(prob_dusty)
             
             predicted_class = np.argmax(prediction[0])
             confidence = np.max(prediction[0])
@@ -281,37 +424,45 @@ class CameraVision:
             
             # 5. Threshold
             if confidence < self.confidence_threshold:
-                print(f"[CAMERA] Confiança baixa ({confidence:.2f})")
+                self.m_checks['low_confidence'].inc()
+                log.info("[CAMERA] Confiança baixa (%.2f)", confidence)
                 return False
+            self.m_checks['dirty' if is_dusty else 'clean'].inc()
             
             # 6. Log
-            if is_dusty:
-                print(f"[CAMERA] >>> SUJEIRA! <<<")
-                print(f"[CAMERA] Confiança: {confidence:.2f} ({confidence*100:.0f}%)")
-            else:
-                print(f"[CAMERA] Placa limpa")
-                print(f"[CAMERA] Confiança: {confidence:.2f} ({confidence*100:.0f}%)")
-            
-            print(f"[CAMERA] Probs: Clean={prob_clean:.2f}, Dusty={prob_dusty:.2f}")
+            log.info("[CAMERA] >>> SUJEIRA! <<<" if is_dusty else "[CAMERA] Placa limpa")
+            log.debug("[CAMERA] Confiança: %.2f (%.0f%%)", confidence, confidence * 100)
+            log.debug("[CAMERA] Probs: Clean=%.2f, Dusty=%.2f", prob_clean, prob_dusty)
             
             return is_dusty
         
         except Exception as e:
-            print(f"[CAMERA] Erro: {e}")
-            import traceback
-            traceback.print_exc()
+            self.m_checks['error'].inc()
+            log.error("[CAMERA] Erro: %s", e)
+            if log.is_enabled(logger.DEBUG):
+                log.debug("%s", traceback.format_exc())
             return False
+        
+        finally:
+            # Tempos desta verificação junto com o resultado
+            self.last_timings = self.profiler.finish()
+            if self.last_timings:
+                log.debug("[CAMERA] Etapas: %s", format_stages(self.last_timings))
     
     def _predict_tflite(self, input_data):
         """Inferência TFLite"""
         self.interpreter.set_tensor(self.input_details[0]['index'], input_data)
+        self.profiler.mark('set_tensor')
         self.interpreter.invoke()
+        self.profiler.mark('invoke')
         output = self.interpreter.get_tensor(self.output_details[0]['index'])
+        self.profiler.mark('get_tensor')
         return output
     
     def _predict_keras(self, input_data):
         """Inferência Keras"""
         output = self.model.predict(input_data, verbose=0)
+        self.profiler.mark('predict')
         return output
     
     def cleanup(self):
@@ -406,7 +557,9 @@ if __name__ == "__main__":
         
         sys.exit(0)
     
-    # Teste normal
+    # Teste normal: mostrar confiança e probabilidades
+    logger.configure(debug=True)
+    
     print("\n" + "="*60)
     print("    TESTE DO SISTEMA DE VISÃO")
     print("="*60)
@@ -449,6 +602,7 @@ if __name__ == "__main__":
         if escolha == '1':
             print("\n>>> Teste único...\n")
             result = camera.detect_target()
+            logger.flush()
             print("\n" + "="*60)
             print("RESULTADO:", "SUJEIRA" if result else "LIMPA")
             print("="*60)
@@ -459,6 +613,7 @@ if __name__ == "__main__":
             for i in range(5):
                 print(f"\n--- {i+1}/5 ---")
                 resultados.append(camera.detect_target())
+                logger.flush()
                 if i < 4:
                     time.sleep(2)
             
@@ -474,11 +629,15 @@ if __name__ == "__main__":
                 n += 1
                 print(f"\n--- Teste #{n} ---")
                 camera.detect_target()
+                logger.flush()
                 time.sleep(3)
     
     except KeyboardInterrupt:
         print("\n\nInterrompido!")
     
     finally:
+        if camera.profiler.samples:
+            print("\nTempo por etapa:")
+            print(camera.profiler.report())
         camera.cleanup()
         print("\n=== FIM ===\n")
\ No newline at end of file
@@ -0,0 +1,173 @@
+"""
+hardware/clock.py
+=================
+Relógio injetável: tempo monotônico, espera e deadlines
+
+Todo componente que mede tempo ou espera recebe um relógio em vez de
+chamar `time` diretamente. No robô usa-se MonotonicClock; em simulação
+e replay usa-se VirtualClock, em que esperar não custa tempo real.
+
+Uso:
+    from hardware.clock import MonotonicClock, VirtualClock
+
+    clock = VirtualClock()
+    timer = clock.deadline(2.5)
+    clock.advance_to_next_deadline()   # instantâneo
+    timer.expired()                    # True
+"""
+
+import heapq
+import time
+
+
+class Deadline:
+    """Instante futuro num relógio (timer sem callback)"""
+
+    def __init__(self, clock, at):
+        self.clock = clock
+        self.at = at
+
+    def expired(self):
+        """True se o instante já passou"""
+        return self.clock.now() >= self.at
+
+    def remaining(self):
+        """Tempo (s) até o deadline, 0 se já venceu"""
+        return max(0.0, self.at - self.clock.now())
+
+    def __repr__(self):
+        return f"Deadline({self.at:.3f})"
+
+
+class Clock:
+    """
+    Interface do relógio.
+
+    Subclasses implementam now() e sleep(); deadline() e sleep_until()
+    são comuns.
+    """
+
+    def now(self):
+        """Tempo monotônico em segundos"""
+        raise NotImplementedError
+
+    def sleep(self, seconds):
+        """Espera (bloqueia) pelo tempo dado"""
+        raise NotImplementedError
+
+    def deadline(self, seconds):
+        """
+        Cria um deadline a `seconds` de agora.
+
+        Returns:
+            Deadline
+        """
+        return Deadline(self, self.now() + seconds)
+
+    def sleep_until(self, deadline):
+        """Espera até o deadline (retorna na hora se já venceu)"""
+        remaining = deadline.remaining()
+        if remaining > 0:
+            self.sleep(remaining)
+
+
+class MonotonicClock(Clock):
+    """Relógio real (time.monotonic / time.sleep)"""
+
+    def now(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    """
+    Tempo simulado: só anda quando alguém espera.
+
+    sleep() avança o relógio na hora. Deadlines criados aqui ficam
+    registrados, e advance_to_next_deadline() salta direto para o
+    próximo - sem iterações vazias entre eventos.
+
+    Ouvintes f(dt) são chamados antes de cada avanço (ex: o mundo do
+    simulador integra o movimento do robô nesse intervalo).
+
+    Laços de espera ativa (ex: eco do HC-SR04 sem sinal) nunca terminam
+    num relógio parado; read_cost > 0 faz cada leitura de now() custar
+    esse tempo, para que saiam pelo timeout.
+    """
+
+    def __init__(self, start=0.0, read_cost=0.0):
+        """
+        Args:
+            start: instante inicial (s)
+            read_cost: tempo gasto por leitura de now() (s)
+        """
+        self._now = start
+        self.read_cost = read_cost
+        self.listeners = []
+        self._deadlines = []    # heap de instantes pendentes
+
+    def now(self):
+        if self.read_cost:
+            self.advance(self.read_cost)
+        return self._now
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def deadline(self, seconds):
+        deadline = Deadline(self, self._now + seconds)
+        heapq.heappush(self._deadlines, deadline.at)
+        return deadline
+
+    def advance(self, seconds):
+        """Avança o relógio (ouvintes veem o estado antes do avanço)"""
+        if seconds <= 0:
+            return
+        for listener in self.listeners:
+            listener(seconds)
+        self._now += seconds
+        self._drop_expired()
+
+    def advance_to(self, at):
+        """
+        Avança até o instante absoluto `at` (nada se já passou).
+
+        Chega exatamente em `at`, sem o erro de arredondamento de
+        advance(at - now) - o replay reproduz instantes gravados.
+        """
+        if at <= self._now:
+            return
+        for listener in self.listeners:
+            listener(at - self._now)
+        self._now = at
+        self._drop_expired()
+
+    def _drop_expired(self):
+        """Tira do heap os deadlines vencidos (simulações só com sleep)"""
+        while self._deadlines and self._deadlines[0] <= self._now:
+            heapq.heappop(self._deadlines)
+
+    def next_deadline(self):
+        """Instante do próximo deadline pendente (None se não há)"""
+        self._drop_expired()
+        return self._deadlines[0] if self._deadlines else None
+
+    def advance_to_next_deadline(self):
+        """
+        Salta para o próximo deadline pendente.
+
+        Returns:
+            bool: False se não havia deadline pendente
+        """
+        at = self.next_deadline()
+        if at is None:
+            return False
+        self.advance(at - self._now)
+        return True
+
+
+# Relógio padrão dos componentes quando nenhum é injetado
+REAL_CLOCK = MonotonicClock()
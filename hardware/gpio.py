@@ -0,0 +1,76 @@
+"""
+hardware/gpio.py
+================
+Acesso ao GPIO com fallback simulado
+
+No Raspberry Pi usa RPi.GPIO. Em qualquer outra máquina (notebook,
+CI, simulador) usa SimulatedGPIO, que imita a mesma API e guarda o
+nível de cada pino em memória.
+
+Uso:
+    from .gpio import GPIO, GPIO_AVAILABLE
+"""
+
+
+class SimulatedGPIO:
+    """
+    Imitação mínima do módulo RPi.GPIO.
+
+    Guarda níveis de saída em `levels` e permite injetar níveis de
+    entrada em `inputs` (ex: pino ECHO do sensor ultrassônico).
+    """
+
+    BCM = 11
+    BOARD = 10
+    OUT = 0
+    IN = 1
+    LOW = 0
+    HIGH = 1
+
+    def __init__(self):
+        self.mode = None
+        self.levels = {}        # pino -> nível de saída
+        self.inputs = {}        # pino -> nível de entrada simulado
+        self.output_calls = 0   # Chamadas output() realizadas
+
+    def setmode(self, mode):
+        self.mode = mode
+
+    def setwarnings(self, flag):
+        pass
+
+    def setup(self, pin, direction):
+        if direction == self.OUT:
+            self.levels.setdefault(pin, self.LOW)
+
+    def output(self, pins, levels):
+        """Aceita pino único ou listas de pinos/níveis (como RPi.GPIO)"""
+        self.output_calls += 1
+        if isinstance(pins, (list, tuple)):
+            if not isinstance(levels, (list, tuple)):
+                levels = [levels] * len(pins)
+            for pin, level in zip(pins, levels):
+                self.levels[pin] = level
+        else:
+            self.levels[pins] = levels
+
+    def input(self, pin):
+        return self.inputs.get(pin, self.levels.get(pin, self.LOW))
+
+    def cleanup(self):
+        self.levels = {}
+
+    def PWM(self, pin, frequency):
+        # Import local para evitar ciclo gpio <-> pwm
+        from .pwm import SimulatedPWM
+        return SimulatedPWM(pin, frequency)
+
+
+GPIO_AVAILABLE = False
+try:
+    import RPi.GPIO as GPIO
+    GPIO_AVAILABLE = True
+except (ImportError, RuntimeError):
+    # RuntimeError: RPi.GPIO instalado fora de um Raspberry Pi
+    GPIO = SimulatedGPIO()
+    print("[GPIO] RPi.GPIO não disponível - usando GPIO simulado")
@@ -4,8 +4,11 @@ hardware/motors.py
 Controlador dos motores de locomoção usando driver L298N
 """
 
-import RPi.GPIO as GPIO
-import time
+from .gpio import GPIO
+from .pwm import create_pwm
+from .clock import REAL_CLOCK
+import metrics
+import threading
 
 
 class L298NController:
@@ -15,10 +18,20 @@ class L298NController:
     Responsável por:
     - Movimento para frente/trás
     - Rotação esquerda/direita
+    - Velocidade independente por roda (arcos, pivô, trim)
+    - Rampas de aceleração/desaceleração (opcional)
     - Controle de velocidade via PWM
+    
+    Rampas:
+        Com acceleration/deceleration definidos, os comandos apenas
+        mudam o alvo de cada roda; o duty aplicado caminha até o alvo
+        em update(), chamado pelo loop principal ou por uma thread
+        própria (ramp_thread=True). Nada bloqueia.
     """
     
-    def __init__(self, motor_pins):
+    def __init__(self, motor_pins, wheel_base=20, acceleration=None,
+                 deceleration=None, ramp_thread=False, ramp_period=0.02,
+                 gpio=None, pwm_backend=None, clock=None):
         """
         Inicializa controlador dos motores.
         
@@ -28,21 +41,39 @@ class L298NController:
                     'left_motor': {'in1': pin, 'in2': pin, 'ena': pin},
                     'right_motor': {'in3': pin, 'in4': pin, 'enb': pin}
                 }
+            wheel_base: distância entre as rodas (cm), usada nos arcos
+            acceleration: aceleração máxima (% de duty por segundo),
+                          None = sem rampa (troca instantânea)
+            deceleration: desaceleração máxima (%/s), None = igual à aceleração
+            ramp_thread: True = rampa gerada por thread própria,
+                         False = chamar update() a cada iteração do loop
+            ramp_period: período da thread de rampa (s)
+            gpio: módulo/objeto GPIO (None = hardware.gpio.GPIO);
+                  ex: SimulatedGPIO() no simulador
+            pwm_backend: backend PWM (None = padrão de create_pwm)
+            clock: relógio das rampas (None = relógio real)
         """
         self.pins = motor_pins
+        self.wheel_base = wheel_base
+        self.acceleration = acceleration
+        self.deceleration = deceleration or acceleration
+        self.gpio = gpio or GPIO
+        self.clock = clock or REAL_CLOCK
         
         # Configurar GPIO
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setwarnings(False)
+        self.gpio.setmode(self.gpio.BCM)
+        self.gpio.setwarnings(False)
         
-        # Configurar pinos como saída
+        # Configurar pinos de direção como saída
+        # (pinos ENA/ENB são configurados pelo backend PWM)
         for motor in self.pins.values():
-            for pin in motor.values():
-                GPIO.setup(pin, GPIO.OUT)
+            for name, pin in motor.items():
+                if name not in ('ena', 'enb'):
+                    self.gpio.setup(pin, self.gpio.OUT)
         
         # Criar objetos PWM (1000 Hz)
-        self.left_pwm = GPIO.PWM(self.pins['left_motor']['ena'], 1000)
-        self.right_pwm = GPIO.PWM(self.pins['right_motor']['enb'], 1000)
+        self.left_pwm = create_pwm(self.pins['left_motor']['ena'], 1000, pwm_backend, self.gpio)
+        self.right_pwm = create_pwm(self.pins['right_motor']['enb'], 1000, pwm_backend, self.gpio)
         
         # Iniciar PWM com duty cycle 0
         self.left_pwm.start(0)
@@ -50,75 +81,400 @@ class L298NController:
         
         self.current_speed = 100
         self.is_running = False
+        
+        # Velocidade aplicada em cada roda (-100 a 100, negativo = ré)
+        self.left_speed = 0
+        self.right_speed = 0
+        
+        # Trim diferencial (%): positivo acelera a roda esquerda e
+        # freia a direita (corrige robô que puxa para a esquerda). Só no
+        # PWM: velocidades/rampas/odometria usam o duty comandado
+        self.trim = 0
+        
+        # Alvo das rampas (-100 a 100) e instante da última atualização
+        self.left_target = 0
+        self.right_target = 0
+        self._last_ramp_update = self.clock.now()
+        self._lock = threading.Lock()
+        
+        # Cache do último estado aplicado (evita escritas redundantes)
+        # None = estado desconhecido, força a primeira escrita
+        self._pin_cache = {}
+        self._duty_cache = {'left': None, 'right': None}
+        
+        # Contadores de escritas emitidas vs suprimidas
+        self.write_stats = {
+            'gpio_issued': 0,       # Pinos de direção realmente escritos
+            'gpio_suppressed': 0,   # Pinos de direção já no nível desejado
+            'pwm_issued': 0,        # Chamadas ChangeDutyCycle realizadas
+            'pwm_suppressed': 0     # Chamadas ChangeDutyCycle evitadas
+        }
+        
+        # Métricas lidas dos contadores acima (nada a mais no loop)
+        for kind in ('gpio', 'pwm'):
+            for result in ('issued', 'suppressed'):
+                metrics.counter(f'motor_{kind}_writes_total',
+                                f"Escritas {kind.upper()} dos motores (emitidas x evitadas pelo cache)",
+                                fn=lambda key=f'{kind}_{result}': self.write_stats[key],
+                                result=result)
+        for index, side in enumerate(('left', 'right')):
+            metrics.gauge('motor_duty_percent', "Duty aplicado em cada roda (-100 a 100)",
+                          fn=lambda i=index: self.get_applied_duties()[i], side=side)
+        
+        # Thread opcional de rampa: por último, com todo o estado criado
+        self._ramp_thread = None
+        self._ramp_period = ramp_period
+        self._ramp_stop = threading.Event()
+        if ramp_thread and self.acceleration:
+            self._ramp_thread = threading.Thread(target=self._ramp_loop, daemon=True)
+            self._ramp_thread.start()
     
     def set_speed(self, speed):
         """Define velocidade (0-100%)"""
         self.current_speed = max(0, min(100, speed))
     
-    def move_forward(self):
-        """Move para frente"""
-        # Motor esquerdo: frente
-        GPIO.output(self.pins['left_motor']['in1'], GPIO.HIGH)
-        GPIO.output(self.pins['left_motor']['in2'], GPIO.LOW)
+    def set_trim(self, trim):
+        """
+        Define trim diferencial entre as rodas.
+        
+        Args:
+            trim: correção em % (-20 a 20). Positivo = roda esquerda
+                  mais rápida, negativa = roda direita mais rápida
+        """
+        with self._lock:
+            self.trim = max(-20, min(20, trim))
+            # Reaplica no PWM (parado não escreve nada: duty 0 no cache)
+            self._apply_wheels(self.left_speed, self.right_speed)
+    
+    def set_wheel_speeds(self, left, right):
+        """
+        Define velocidade independente em cada roda.
         
-        # Motor direito: frente
-        GPIO.output(self.pins['right_motor']['in3'], GPIO.HIGH)
-        GPIO.output(self.pins['right_motor']['in4'], GPIO.LOW)
+        Sem rampa aplica imediatamente; com rampa apenas define o alvo
+        (o duty aplicado converge em update()). O trim entra só na
+        escrita do PWM (get_applied_duties).
         
-        self._apply_speed()
-        self.is_running = True
+        Args:
+            left: velocidade roda esquerda (-100 a 100, negativo = ré)
+            right: velocidade roda direita (-100 a 100, negativo = ré)
+        """
+        left = max(-100, min(100, left))
+        right = max(-100, min(100, right))
+        
+        with self._lock:
+            if self.acceleration:
+                # Avança a rampa em curso até agora antes de trocar o alvo
+                self._update_ramp(self.clock.now())
+            
+            self.left_target = left
+            self.right_target = right
+            self.is_running = True
+            
+            if not self.acceleration:
+                self._apply_wheels(left, right)
+    
+    def update(self):
+        """
+        Avança as rampas até o instante atual (não bloqueia).
+        
+        Chamar a cada iteração do loop principal quando ramp_thread=False.
+        Sem rampa configurada não faz nada.
+        """
+        if not self.acceleration or self._ramp_thread is not None:
+            return
+        with self._lock:
+            self._update_ramp(self.clock.now())
+    
+    def _ramp_loop(self):
+        """Thread de rampa: atualiza a cada ramp_period"""
+        while not self._ramp_stop.wait(self._ramp_period):
+            with self._lock:
+                self._update_ramp(self.clock.now())
+    
+    def _update_ramp(self, now):
+        """Move o duty aplicado em direção ao alvo respeitando as taxas"""
+        dt = now - self._last_ramp_update
+        self._last_ramp_update = now
+        
+        # Já no alvo: nada a escrever (o instante fica registrado)
+        if self.left_speed == self.left_target and self.right_speed == self.right_target:
+            return
+        
+        left = self._ramp_step(self.left_speed, self.left_target, dt)
+        right = self._ramp_step(self.right_speed, self.right_target, dt)
+        self._apply_wheels(left, right)
+    
+    def _ramp_step(self, current, target, dt):
+        """
+        Um passo de rampa numa roda.
+        
+        Aumentar |velocidade| usa acceleration; diminuir (inclusive
+        passando por zero numa inversão de sentido) usa deceleration.
+        """
+        if current == target:
+            return current
+        
+        # Inversão de sentido: primeiro desacelera até zero
+        if current != 0 and (target == 0 or (current > 0) != (target > 0)):
+            step = self.deceleration * dt
+            if abs(current) <= step:
+                return 0
+            return current - step if current > 0 else current + step
+        
+        rate = self.acceleration if abs(target) > abs(current) else self.deceleration
+        step = rate * dt
+        if abs(target - current) <= step:
+            return target
+        return current + step if target > current else current - step
+    
+    def _apply_wheels(self, left, right):
+        """Escreve direção e duty das duas rodas"""
+        # Direção de cada ponte H (0 = ambos LOW, roda livre)
+        in1, in2 = self._wheel_levels(left)
+        in3, in4 = self._wheel_levels(right)
+        self._set_direction(in1, in2, in3, in4)
+        
+        # Arredondar evita reescrever o PWM por variações mínimas da rampa
+        left_duty, right_duty = self._trimmed(left, right)
+        self._set_duty('left', round(abs(left_duty), 1))
+        self._set_duty('right', round(abs(right_duty), 1))
+        
+        self.left_speed = left
+        self.right_speed = right
+    
+    def _wheel_ramp_time(self, current, target):
+        """Tempo (s) para uma roda ir de current até target"""
+        if current == target:
+            return 0.0
+        if current != 0 and (target == 0 or (current > 0) != (target > 0)):
+            # Desacelera até zero e acelera no outro sentido
+            return abs(current) / self.deceleration + abs(target) / self.acceleration
+        if abs(target) > abs(current):
+            return (abs(target) - abs(current)) / self.acceleration
+        return (abs(current) - abs(target)) / self.deceleration
+    
+    def time_to_target(self):
+        """
+        Tempo esperado até as duas rodas atingirem o alvo.
+        
+        Returns:
+            float: segundos (0 se sem rampa ou já no alvo)
+        """
+        if not self.acceleration:
+            return 0.0
+        with self._lock:
+            return max(self._wheel_ramp_time(self.left_speed, self.left_target),
+                       self._wheel_ramp_time(self.right_speed, self.right_target))
+    
+    def stop_time(self):
+        """
+        Tempo para parar a partir do alvo atual (desaceleração até zero).
+        
+        Returns:
+            float: segundos (0 se sem rampa)
+        """
+        if not self.acceleration:
+            return 0.0
+        with self._lock:
+            return max(abs(self.left_target), abs(self.right_target)) / self.deceleration
+    
+    def move_forward(self):
+        """Move para frente"""
+        self.set_wheel_speeds(self.current_speed, self.current_speed)
     
     def move_backward(self):
         """Move para trás"""
-        GPIO.output(self.pins['left_motor']['in1'], GPIO.LOW)
-        GPIO.output(self.pins['left_motor']['in2'], GPIO.HIGH)
-        GPIO.output(self.pins['right_motor']['in3'], GPIO.LOW)
-        GPIO.output(self.pins['right_motor']['in4'], GPIO.HIGH)
-        
-        self._apply_speed()
-        self.is_running = True
+        self.set_wheel_speeds(-self.current_speed, -self.current_speed)
     
     def turn_left(self):
         """Gira à esquerda"""
-        GPIO.output(self.pins['left_motor']['in1'], GPIO.LOW)
-        GPIO.output(self.pins['left_motor']['in2'], GPIO.HIGH)
-        GPIO.output(self.pins['right_motor']['in3'], GPIO.HIGH)
-        GPIO.output(self.pins['right_motor']['in4'], GPIO.LOW)
-        
-        self._apply_speed()
-        self.is_running = True
+        self.set_wheel_speeds(-self.current_speed, self.current_speed)
         #time.sleep(2.6) #Delay Manual
     
     def turn_right(self):
         """Gira à direita"""
-        GPIO.output(self.pins['left_motor']['in1'], GPIO.HIGH)
-        GPIO.output(self.pins['left_motor']['in2'], GPIO.LOW)
-        GPIO.output(self.pins['right_motor']['in3'], GPIO.LOW)
-        GPIO.output(self.pins['right_motor']['in4'], GPIO.HIGH)
-        
-        self._apply_speed()
-        self.is_running = True
+        self.set_wheel_speeds(self.current_speed, -self.current_speed)
         #time.sleep(2.6) #Delay Manual
+    
+    def arc(self, radius, direction):
+        """
+        Anda em arco com raio dado (medido no centro do robô).
+        
+        A roda externa usa current_speed e a interna é reduzida na
+        proporção (R - L/2) / (R + L/2), onde L = wheel_base.
+        Raio menor que L/2 faz a roda interna girar para trás;
+        raio 0 equivale a girar no próprio eixo.
+        
+        Args:
+            radius: raio do arco (cm)
+            direction: 'left' ou 'right'
+        """
+        half = self.wheel_base / 2.0
+        radius = max(0, radius)
+        ratio = (radius - half) / (radius + half)
+        
+        outer = self.current_speed
+        inner = outer * ratio
+        
+        if direction == 'left':
+            self.set_wheel_speeds(inner, outer)
+        else:
+            self.set_wheel_speeds(outer, inner)
+    
+    def pivot(self, direction):
+        """
+        Gira sobre uma roda parada (raio = metade da distância entre rodas).
+        
+        Args:
+            direction: 'left' (pivô na roda esquerda) ou 'right'
+        """
+        if direction == 'left':
+            self.set_wheel_speeds(0, self.current_speed)
+        else:
+            self.set_wheel_speeds(self.current_speed, 0)
 
     
-    def stop(self):
-        """Para todos os motores"""
-        self.left_pwm.ChangeDutyCycle(0)
-        self.right_pwm.ChangeDutyCycle(0)
-        GPIO.output(self.pins['left_motor']['in1'], GPIO.LOW)
-        GPIO.output(self.pins['left_motor']['in2'], GPIO.LOW)
-        GPIO.output(self.pins['right_motor']['in3'], GPIO.LOW)
-        GPIO.output(self.pins['right_motor']['in4'], GPIO.LOW)
-        self.is_running = False
+    def stop(self, immediate=False):
+        """
+        Para todos os motores.
+        
+        Com rampa desacelera até zero (em update()); immediate=True
+        corta o PWM na hora (emergência / cleanup).
+        """
+        with self._lock:
+            if self.acceleration and not immediate:
+                self._update_ramp(self.clock.now())
+                self.left_target = 0
+                self.right_target = 0
+                self.is_running = False
+                return
+            
+            self.left_target = 0
+            self.right_target = 0
+            self.is_running = False
+            
+            self._set_duty('left', 0)
+            self._set_duty('right', 0)
+            low = self.gpio.LOW
+            self._set_direction(low, low, low, low)
+            self.left_speed = 0
+            self.right_speed = 0
+    
+    def get_wheel_speeds(self):
+        """
+        Retorna velocidade comandada em cada roda (sem trim).
+        
+        É o que a odometria integra: o trim corrige um desequilíbrio
+        mecânico, não é uma curva pedida.
+        
+        Returns:
+            tuple: (esquerda, direita) de -100 a 100
+        """
+        return (self.left_speed, self.right_speed)
+    
+    def get_applied_duties(self):
+        """
+        Duty com sinal realmente escrito em cada roda (com trim).
+        
+        Returns:
+            tuple: (esquerda, direita) de -100 a 100
+        """
+        return self._trimmed(self.left_speed, self.right_speed)
     
-    def _apply_speed(self):
-        """Aplica velocidade atual via PWM"""
-        self.left_pwm.ChangeDutyCycle(self.current_speed)
-        self.right_pwm.ChangeDutyCycle(self.current_speed)
+    def _trimmed(self, left, right):
+        """Aplica o trim diferencial a um par de velocidades"""
+        factor = self.trim / 100.0
+        return (max(-100, min(100, left * (1 + factor))),
+                max(-100, min(100, right * (1 - factor))))
+    
+    def _wheel_levels(self, speed):
+        """Níveis (INa, INb) da ponte H para o sentido da velocidade"""
+        high, low = self.gpio.HIGH, self.gpio.LOW
+        if speed > 0:
+            return high, low
+        if speed < 0:
+            return low, high
+        return low, low
+    
+    def _set_direction(self, in1, in2, in3, in4):
+        """
+        Aplica padrão de direção nos 4 pinos do L298N.
+        
+        Só escreve os pinos cujo nível mudou, todos numa única
+        chamada GPIO.output (lista de pinos + lista de níveis).
+        
+        Args:
+            in1, in2: níveis do motor esquerdo
+            in3, in4: níveis do motor direito
+        """
+        pattern = (
+            (self.pins['left_motor']['in1'], in1),
+            (self.pins['left_motor']['in2'], in2),
+            (self.pins['right_motor']['in3'], in3),
+            (self.pins['right_motor']['in4'], in4)
+        )
+        
+        changed_pins = []
+        changed_levels = []
+        for pin, level in pattern:
+            if self._pin_cache.get(pin) != level:
+                changed_pins.append(pin)
+                changed_levels.append(level)
+        
+        self.write_stats['gpio_suppressed'] += len(pattern) - len(changed_pins)
+        
+        if not changed_pins:
+            return
+        
+        self.gpio.output(changed_pins, changed_levels)
+        self.write_stats['gpio_issued'] += len(changed_pins)
+        
+        for pin, level in zip(changed_pins, changed_levels):
+            self._pin_cache[pin] = level
+    
+    def _set_duty(self, side, duty):
+        """
+        Aplica duty cycle em um canal PWM apenas se mudou.
+        
+        Args:
+            side: 'left' ou 'right'
+            duty: duty cycle (0-100)
+        """
+        if self._duty_cache[side] == duty:
+            self.write_stats['pwm_suppressed'] += 1
+            return
+        
+        pwm = self.left_pwm if side == 'left' else self.right_pwm
+        pwm.ChangeDutyCycle(duty)
+        self._duty_cache[side] = duty
+        self.write_stats['pwm_issued'] += 1
+    
+    def get_write_stats(self):
+        """
+        Retorna contadores de escritas GPIO/PWM.
+        
+        Returns:
+            dict: cópia de write_stats (emitidas vs suprimidas)
+        """
+        return dict(self.write_stats)
+    
+    def reset_write_stats(self):
+        """Zera contadores de escritas"""
+        for key in self.write_stats:
+            self.write_stats[key] = 0
     
     def cleanup(self):
         """Limpa recursos GPIO"""
-        self.stop()
+        if self._ramp_thread is not None:
+            self._ramp_stop.set()
+            self._ramp_thread.join()
+            self._ramp_thread = None
+        
+        self.stop(immediate=True)
         self.left_pwm.stop()
         self.right_pwm.stop()
-        GPIO.cleanup()
\ No newline at end of file
+        self.gpio.cleanup()
+        
+        # Pinos voltaram ao estado padrão: invalidar cache
+        self._pin_cache = {}
+        self._duty_cache = {'left': None, 'right': None}
\ No newline at end of file
@@ -0,0 +1,316 @@
+"""
+hardware/pwm.py
+===============
+Backends de PWM para motores, vassouras e servo
+
+O RPi.GPIO gera PWM por software: cada canal é uma thread em Python
+que liga/desliga o pino, consumindo CPU e gerando jitter (ruim para o
+servo). Este módulo oferece backends com a mesma API do GPIO.PWM
+(start / ChangeDutyCycle / ChangeFrequency / stop):
+
+1. HardwarePWM  - periférico PWM do BCM283x (GPIO12/18 = canal 0,
+                  GPIO13/19 = canal 1). Zero CPU, zero jitter.
+                  Requer: dtoverlay=pwm-2chan,pin=12,func=4,pin2=13,func2=4
+                  e pip3 install rpi-hardware-pwm
+2. PigpioPWM    - PWM temporizado por DMA pelo daemon pigpiod.
+                  Funciona em qualquer pino. Requer: sudo pigpiod
+3. SoftwarePWM  - GPIO.PWM original (fallback)
+4. SimulatedPWM - sem hardware, registra duty cycles (testes/simulação)
+
+Uso:
+    from .pwm import create_pwm
+    pwm = create_pwm(pin, 1000)   # backend escolhido automaticamente
+"""
+
+import time
+
+from .gpio import GPIO, GPIO_AVAILABLE
+
+# Tentar importar PWM por hardware (sysfs)
+HARDWARE_PWM_AVAILABLE = False
+try:
+    from rpi_hardware_pwm import HardwarePWM as _SysfsPWM, HardwarePWMException
+    HARDWARE_PWM_AVAILABLE = True
+except ImportError:
+    class HardwarePWMException(Exception):
+        """Sem rpi_hardware_pwm: nunca levantada"""
+
+# Tentar importar pigpio (PWM por DMA)
+PIGPIO_AVAILABLE = False
+try:
+    import pigpio
+    PIGPIO_AVAILABLE = True
+except ImportError:
+    pass
+
+
+# Pinos BCM com PWM por hardware -> canal
+HARDWARE_PWM_PINS = {
+    12: 0,
+    18: 0,
+    13: 1,
+    19: 1
+}
+
+BACKENDS = ('auto', 'hardware', 'pigpio', 'software', 'simulated')
+
+# Backend padrão (alterado por set_default_backend, ex: config.PWM_BACKEND)
+_default_backend = 'auto'
+
+# Canais de hardware já alocados: canal -> pino
+_hardware_channels = {}
+
+# Conexão compartilhada com o daemon pigpiod
+_pigpio_conn = None
+
+
+class PWMBackend:
+    """
+    Interface comum dos backends (mesma API do GPIO.PWM).
+
+    Duty cycle sempre em porcentagem (0-100).
+    """
+
+    name = 'base'
+
+    def __init__(self, pin, frequency):
+        self.pin = pin
+        self.frequency = frequency
+        self.duty_cycle = 0
+
+    def start(self, duty_cycle):
+        self.ChangeDutyCycle(duty_cycle)
+
+    def ChangeDutyCycle(self, duty_cycle):
+        raise NotImplementedError
+
+    def ChangeFrequency(self, frequency):
+        raise NotImplementedError
+
+    def stop(self):
+        raise NotImplementedError
+
+
+class SoftwarePWM(PWMBackend):
+    """PWM por software do RPi.GPIO (uma thread por canal)"""
+
+    name = 'software'
+
+    def __init__(self, pin, frequency, gpio=None):
+        super().__init__(pin, frequency)
+        gpio = gpio or GPIO
+        gpio.setup(pin, gpio.OUT)
+        self._pwm = gpio.PWM(pin, frequency)
+        self._started = False
+
+    def start(self, duty_cycle):
+        self._pwm.start(duty_cycle)
+        self._started = True
+        self.duty_cycle = duty_cycle
+
+    def ChangeDutyCycle(self, duty_cycle):
+        if not self._started:
+            self.start(duty_cycle)
+            return
+        self._pwm.ChangeDutyCycle(duty_cycle)
+        self.duty_cycle = duty_cycle
+
+    def ChangeFrequency(self, frequency):
+        self._pwm.ChangeFrequency(frequency)
+        self.frequency = frequency
+
+    def stop(self):
+        self._pwm.stop()
+        self._started = False
+
+
+class HardwarePWM(PWMBackend):
+    """
+    PWM pelo periférico do SoC via sysfs (/sys/class/pwm).
+
+    Cada canal tem uma única frequência: dois pinos do mesmo canal
+    (ex: GPIO12 e GPIO18) não podem ser usados ao mesmo tempo.
+    """
+
+    name = 'hardware'
+
+    def __init__(self, pin, frequency, chip=0):
+        super().__init__(pin, frequency)
+        self.channel = HARDWARE_PWM_PINS[pin]
+        self._pwm = _SysfsPWM(pwm_channel=self.channel, hz=frequency, chip=chip)
+        self._started = False
+
+    def start(self, duty_cycle):
+        self._pwm.start(duty_cycle)
+        self._started = True
+        self.duty_cycle = duty_cycle
+
+    def ChangeDutyCycle(self, duty_cycle):
+        if not self._started:
+            self.start(duty_cycle)
+            return
+        self._pwm.change_duty_cycle(duty_cycle)
+        self.duty_cycle = duty_cycle
+
+    def ChangeFrequency(self, frequency):
+        self._pwm.change_frequency(frequency)
+        self.frequency = frequency
+
+    def stop(self):
+        self._pwm.stop()
+        self._started = False
+        _hardware_channels.pop(self.channel, None)
+
+
+class PigpioPWM(PWMBackend):
+    """
+    PWM temporizado por DMA pelo daemon pigpiod.
+
+    A geração do sinal acontece no daemon (C + DMA), não em threads
+    Python do processo do robô.
+    """
+
+    name = 'pigpio'
+
+    # Resolução do duty cycle (0-PWM_RANGE)
+    PWM_RANGE = 10000
+
+    def __init__(self, pin, frequency, conn):
+        super().__init__(pin, frequency)
+        self._pi = conn
+        self._pi.set_mode(pin, pigpio.OUTPUT)
+        self._pi.set_PWM_range(pin, self.PWM_RANGE)
+        self._pi.set_PWM_frequency(pin, frequency)
+
+    def ChangeDutyCycle(self, duty_cycle):
+        value = int(round(duty_cycle / 100.0 * self.PWM_RANGE))
+        self._pi.set_PWM_dutycycle(self.pin, value)
+        self.duty_cycle = duty_cycle
+
+    def ChangeFrequency(self, frequency):
+        self._pi.set_PWM_frequency(self.pin, frequency)
+        self.frequency = frequency
+
+    def stop(self):
+        self._pi.set_PWM_dutycycle(self.pin, 0)
+
+
+class SimulatedPWM(PWMBackend):
+    """
+    PWM sem hardware para testes e simulação.
+
+    Guarda o histórico de (instante, duty) de cada alteração.
+    """
+
+    name = 'simulated'
+
+    def __init__(self, pin, frequency):
+        super().__init__(pin, frequency)
+        self.running = False
+        self.change_count = 0
+        self.history = []
+
+    def start(self, duty_cycle):
+        self.running = True
+        self.ChangeDutyCycle(duty_cycle)
+
+    def ChangeDutyCycle(self, duty_cycle):
+        self.duty_cycle = duty_cycle
+        self.change_count += 1
+        self.history.append((time.monotonic(), duty_cycle))
+
+    def ChangeFrequency(self, frequency):
+        self.frequency = frequency
+
+    def stop(self):
+        self.running = False
+
+
+def set_default_backend(backend):
+    """
+    Define o backend usado por create_pwm quando nenhum é informado.
+
+    Args:
+        backend: 'auto', 'hardware', 'pigpio', 'software' ou 'simulated'
+    """
+    global _default_backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend PWM inválido: {backend} (opções: {BACKENDS})")
+    _default_backend = backend
+
+
+def _get_pigpio():
+    """Conecta ao pigpiod (uma única vez). Retorna None se indisponível."""
+    global _pigpio_conn
+    if not PIGPIO_AVAILABLE:
+        return None
+    if _pigpio_conn is None:
+        conn = pigpio.pi()
+        if not conn.connected:
+            return None
+        _pigpio_conn = conn
+    return _pigpio_conn
+
+
+def _hardware_channel_free(pin):
+    """Verifica se o pino tem PWM por hardware e o canal está livre"""
+    if not HARDWARE_PWM_AVAILABLE or pin not in HARDWARE_PWM_PINS:
+        return False
+    owner = _hardware_channels.get(HARDWARE_PWM_PINS[pin])
+    return owner is None or owner == pin
+
+
+def create_pwm(pin, frequency, backend=None, gpio=None):
+    """
+    Cria canal PWM com o melhor backend disponível.
+
+    Ordem no modo 'auto':
+    1. Hardware (se pino 12/13/18/19, canal livre e overlay carregado)
+    2. pigpio (se daemon rodando)
+    3. Software (RPi.GPIO)
+    4. Simulado (sem Raspberry Pi)
+
+    Args:
+        pin: pino BCM
+        frequency: frequência em Hz
+        backend: força um backend específico (None = padrão do módulo)
+        gpio: módulo/objeto GPIO do backend software (None =
+              hardware.gpio.GPIO)
+
+    Returns:
+        PWMBackend: canal PWM (ainda não iniciado)
+
+    Raises:
+        HardwarePWMException, OSError: backend 'hardware' pedido e o
+            sysfs não aceitou o canal (sem dtoverlay=pwm-2chan, sem
+            permissão); no modo 'auto' passa para o próximo backend
+    """
+    backend = backend or _default_backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend PWM inválido: {backend} (opções: {BACKENDS})")
+
+    if backend in ('auto', 'hardware') and _hardware_channel_free(pin):
+        try:
+            pwm = HardwarePWM(pin, frequency)
+        except (HardwarePWMException, OSError) as e:
+            if backend == 'hardware':
+                raise
+            print(f"[PWM] PWM por hardware indisponível no pino {pin} ({e}) - "
+                  f"tentando pigpio/software")
+        else:
+            _hardware_channels[pwm.channel] = pin
+            return pwm
+    elif backend == 'hardware':
+        print(f"[PWM] Pino {pin} sem PWM por hardware disponível - usando auto")
+
+    if backend in ('auto', 'hardware', 'pigpio'):
+        conn = _get_pigpio()
+        if conn is not None:
+            return PigpioPWM(pin, frequency, conn)
+        if backend == 'pigpio':
+            print(f"[PWM] pigpiod não disponível para pino {pin} - usando software")
+
+    if backend != 'simulated' and GPIO_AVAILABLE:
+        return SoftwarePWM(pin, frequency, gpio)
+
+    return SimulatedPWM(pin, frequency)
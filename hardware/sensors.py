@@ -4,8 +4,13 @@ hardware/sensors.py
 Interface com sensor ultrassônico HC-SR04
 """
 
-import RPi.GPIO as GPIO
-import time
+from .gpio import GPIO
+from .clock import REAL_CLOCK
+from logger import get_logger
+import metrics
+
+
+log = get_logger('sensors')
 
 
 class UltrasonicSensor:
@@ -16,7 +21,8 @@ class UltrasonicSensor:
     que levam para voltar após bater em um obstáculo.
     """
     
-    def __init__(self, trigger_pin, echo_pin, max_distance=400):
+    def __init__(self, trigger_pin, echo_pin, max_distance=400, clock=None,
+                 gpio=None):
         """
         Inicializa sensor ultrassônico.
         
@@ -24,19 +30,34 @@ class UltrasonicSensor:
             trigger_pin: pino GPIO conectado ao TRIG
             echo_pin: pino GPIO conectado ao ECHO
             max_distance: distância máxima em cm
+            clock: relógio (None = relógio real)
+            gpio: módulo/objeto GPIO (None = hardware.gpio.GPIO);
+                  ex: GPIO simulado com eco roteirizado (bench)
         """
+        self.clock = clock or REAL_CLOCK
+        self.gpio = gpio or GPIO
         self.trigger = trigger_pin
         self.echo = echo_pin
         self.max_distance = max_distance
         
         # Configurar pinos
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setup(self.trigger, GPIO.OUT)
-        GPIO.setup(self.echo, GPIO.IN)
+        self.gpio.setmode(self.gpio.BCM)
+        self.gpio.setup(self.trigger, self.gpio.OUT)
+        self.gpio.setup(self.echo, self.gpio.IN)
         
         # Garantir TRIGGER em LOW
-        GPIO.output(self.trigger, GPIO.LOW)
-        time.sleep(0.1)
+        self.gpio.output(self.trigger, self.gpio.LOW)
+        self.clock.sleep(0.1)
+        
+        # Métricas (objetos nulos com metrics desligado)
+        self._metrics = metrics.enabled()
+        self.m_readings = metrics.counter('ultrasonic_readings_total', "Medições do HC-SR04")
+        self.m_timeouts = metrics.counter('ultrasonic_timeouts_total', "Medições sem eco (timeout)")
+        self.m_errors = metrics.counter('ultrasonic_errors_total', "Exceções na medição")
+        self.m_read_time = metrics.histogram('ultrasonic_read_seconds', "Duração de uma medição")
+        self.m_rate = metrics.gauge('ultrasonic_sample_rate_hz', "Taxa de medições (média móvel)")
+        self._last_read = None
+        self._rate = 0.0
     
     def get_distance(self):
         """
@@ -45,28 +66,47 @@ class UltrasonicSensor:
         Returns:
             float: distância em centímetros
         """
+        if not self._metrics:
+            return self._measure()
+        
+        start = self.clock.now()
+        distance = self._measure()
+        self.m_read_time.observe(self.clock.now() - start)
+        self.m_readings.inc()
+        
+        if self._last_read is not None and start > self._last_read:
+            rate = 1.0 / (start - self._last_read)
+            self._rate = rate if not self._rate else 0.9 * self._rate + 0.1 * rate
+            self.m_rate.set(self._rate)
+        self._last_read = start
+        return distance
+    
+    def _measure(self):
+        """Pulso de trigger + tempo do eco (cm)"""
         try:
             # Enviar pulso de 10µs
-            GPIO.output(self.trigger, GPIO.HIGH)
-            time.sleep(0.00001)
-            GPIO.output(self.trigger, GPIO.LOW)
+            self.gpio.output(self.trigger, self.gpio.HIGH)
+            self.clock.sleep(0.00001)
+            self.gpio.output(self.trigger, self.gpio.LOW)
             
             # Aguardar início do pulso
-            pulse_start = time.time()
-            timeout = time.time() + 0.1
+            pulse_start = self.clock.now()
+            timeout = self.clock.deadline(0.1)
             
-            while GPIO.input(self.echo) == 0:
-                pulse_start = time.time()
-                if pulse_start > timeout:
+            while self.gpio.input(self.echo) == 0:
+                pulse_start = self.clock.now()
+                if timeout.expired():
+                    self.m_timeouts.inc()
                     return self.max_distance
             
             # Aguardar fim do pulso
-            pulse_end = time.time()
-            timeout = time.time() + 0.1
+            pulse_end = self.clock.now()
+            timeout = self.clock.deadline(0.1)
             
-            while GPIO.input(self.echo) == 1:
-                pulse_end = time.time()
-                if pulse_end > timeout:
+            while self.gpio.input(self.echo) == 1:
+                pulse_end = self.clock.now()
+                if timeout.expired():
+                    self.m_timeouts.inc()
                     return self.max_distance
             
             # Calcular distância
@@ -77,5 +117,6 @@ class UltrasonicSensor:
             return round(distance, 2) if distance <= self.max_distance else self.max_distance
             
         except Exception as e:
-            print(f"Erro no sensor: {e}")
+            self.m_errors.inc()
+            log.error("Erro no sensor: %s", e, every=5.0)
             return self.max_distance
\ No newline at end of file
@@ -4,8 +4,15 @@ hardware/servo.py
 Controlador do servo motor para levantar/abaixar vassouras
 """
 
-import RPi.GPIO as GPIO
-import time
+from .gpio import GPIO
+from .pwm import create_pwm
+from .clock import REAL_CLOCK
+from .actuators import ActuatorTask
+from logger import get_logger
+import metrics
+
+
+log = get_logger('servo')
 
 
 class ServoController:
@@ -15,31 +22,70 @@ class ServoController:
     Posições:
     - 0°: Vassouras levantadas (não tocam a placa)
     - 90°: Vassouras abaixadas (tocam a placa para limpar)
+    
+    A espera de cada movimento vem da distância angular e da velocidade
+    calibrada (°/s), não de um tempo fixo; movimento para a posição
+    atual não envia pulso nem espera. Durante um movimento a posição é
+    estimada pelo tempo decorrido, então um movimento interrompido
+    espera só o trajeto que falta.
+    
+    Calibrar `speed`: mandar 0° -> 90° com as vassouras montadas,
+    filmar e medir quanto o braço leva para parar (90 / tempo).
     """
     
-    def __init__(self, servo_pin, pwm_frequency=50):
+    def __init__(self, servo_pin, pwm_frequency=50, clock=None, speed=360,
+                 margin=0.05, hold=False, gpio=None):
         """
         Inicializa controlador do servo.
         
         Args:
             servo_pin: pino GPIO do servo
             pwm_frequency: frequência PWM (padrão 50Hz para servos)
+            clock: relógio das esperas (None = relógio real)
+            speed: velocidade de giro calibrada (°/s)
+            margin: folga após o tempo calculado (s)
+            hold: True = mantém o pulso após chegar (segura a posição
+                  contra a reação das vassouras); False = corta o pulso
+                  (servo não trepida nem consome para segurar)
+            gpio: módulo/objeto GPIO (None = hardware.gpio.GPIO)
         """
         self.pin = servo_pin
+        self.clock = clock or REAL_CLOCK
+        self.speed = speed
+        self.margin = margin
+        self.hold = hold
+        self.gpio = gpio or GPIO
         
         # Configurar GPIO
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setwarnings(False)
-        GPIO.setup(self.pin, GPIO.OUT)
+        self.gpio.setmode(self.gpio.BCM)
+        self.gpio.setwarnings(False)
         
         # Criar objeto PWM (50Hz padrão para servos)
-        self.pwm = GPIO.PWM(self.pin, pwm_frequency)
+        # O backend configura o pino (no PWM por hardware o pino
+        # NÃO pode virar saída comum, senão perde a função PWM)
+        self.pwm = create_pwm(self.pin, pwm_frequency, gpio=self.gpio)
         self.pwm.start(0)
         
-        # Estado atual
-        self.current_angle = 0
+        # Estado atual (current_angle muda quando o movimento termina;
+        # None = desconhecido até o primeiro movimento)
+        self.current_angle = None
+        self.target_angle = None
+        self.task = None    # Movimento não-bloqueante em curso
+        self._moving = False
+        self._move_from = None
+        self._move_started = 0.0
         
-        # Iniciar na posição levantada (0°)
+        # Movimentos evitados (já na posição) e tempo total esperado
+        self.skipped_moves = 0
+        self.travel_time_total = 0.0
+        
+        self.m_moves = metrics.counter('servo_moves_total', "Movimentos do servo das vassouras")
+        self.m_skipped = metrics.counter('servo_moves_skipped_total',
+                                         "Movimentos para a posição atual (sem pulso nem espera)")
+        metrics.gauge('servo_angle_degrees', "Ângulo atual do servo", fn=self.get_angle)
+        
+        # Iniciar na posição levantada (0°); posição desconhecida =
+        # espera do pior trajeto
         self.lift_up()
         
         print(f"[SERVO] Inicializado no pino {servo_pin}")
@@ -69,18 +115,103 @@ class ServoController:
     
     def set_angle(self, angle):
         """
-        Move servo para ângulo específico.
+        Move servo para ângulo específico (bloqueia até chegar).
+        
+        Args:
+            angle: ângulo desejado (0-180°)
+        """
+        self.move_to(angle).wait()
+    
+    def move_to(self, angle):
+        """
+        Move servo sem bloquear: a sequência avança em update().
         
         Args:
             angle: ângulo desejado (0-180°)
+            
+        Returns:
+            ActuatorTask: sequência do movimento (future completa ao chegar)
+        """
+        if self.task is not None:
+            self.task.cancel()
+        self.task = ActuatorTask(self.move_steps(angle), self.clock)
+        self.task.update()
+        return self.task
+    
+    def move_steps(self, angle):
         """
-        duty_cycle = self._angle_to_duty_cycle(angle)
+        Passos (estado, ação) de um movimento, para compor sequências
+        maiores (ex: BrushController).
+        """
+        return [('moving', lambda: self._begin_move(angle)),
+                ('idle', self._end_move)]
+    
+    def _begin_move(self, angle):
+        """Envia o pulso do ângulo; retorna o tempo de espera (s)"""
+        angle = max(0, min(180, angle))
+        start = self.position()
+        
+        if not self._moving and start == angle:
+            # Já na posição: nada a enviar nem esperar
+            self.skipped_moves += 1
+            self.m_skipped.inc()
+            return 0.0
+        
+        self._moving = True
+        self._move_from = start
+        self._move_started = self.clock.now()
+        self.target_angle = angle
+        self.pwm.ChangeDutyCycle(self._angle_to_duty_cycle(angle))
+        
+        wait = self.travel_time(start, angle)
+        self.travel_time_total += wait
+        return wait
+    
+    def _end_move(self):
+        """Servo na posição: para de enviar sinal (exceto em hold)"""
+        if not self._moving:
+            return
+        if not self.hold:
+            self.pwm.ChangeDutyCycle(0)
+        self._moving = False
+        self.current_angle = self.target_angle
+        self.m_moves.inc()
+    
+    def travel_time(self, start, angle):
+        """
+        Tempo (s) para ir de `start` até `angle` na velocidade calibrada.
         
-        self.pwm.ChangeDutyCycle(duty_cycle)
-        time.sleep(0.5)  # Aguardar servo atingir posição
-        self.pwm.ChangeDutyCycle(0)  # Parar envio de sinal
+        Args:
+            start: ângulo de partida (None = desconhecido: pior caso)
+            angle: ângulo de destino
+        """
+        if start is None:
+            distance = max(angle, 180 - angle)
+        else:
+            distance = abs(angle - start)
+        return distance / self.speed + self.margin
+    
+    def position(self):
+        """
+        Ângulo estimado agora (interpolado durante um movimento).
         
-        self.current_angle = angle
+        Returns:
+            float: ângulo (None = desconhecido)
+        """
+        if not self._moving:
+            return self.current_angle
+        if self._move_from is None:
+            return None
+        travel = self.speed * (self.clock.now() - self._move_started)
+        delta = self.target_angle - self._move_from
+        if abs(delta) <= travel:
+            return self.target_angle
+        return self._move_from + (travel if delta > 0 else -travel)
+    
+    def update(self):
+        """Avança o movimento em curso (chamar a cada iteração do loop)"""
+        if self.task is not None and self.task.update():
+            self.task = None
     
     def lift_up(self):
         """
@@ -88,7 +219,7 @@ class ServoController:
         
         Vassouras NÃO tocam a placa.
         """
-        print("[SERVO] Levantando vassouras (0°)...")
+        log.debug("[SERVO] Levantando vassouras (0°)...")
         self.set_angle(0)
     
     def lower_down(self):
@@ -97,7 +228,7 @@ class ServoController:
         
         Vassouras tocam a placa para limpar.
         """
-        print("[SERVO] Abaixando vassouras (90°)...")
+        log.debug("[SERVO] Abaixando vassouras (90°)...")
         self.set_angle(90)
     
     def get_angle(self):
@@ -105,7 +236,7 @@ class ServoController:
         Retorna ângulo atual do servo.
         
         Returns:
-            int: ângulo atual (0-180°)
+            int: ângulo atual (0-180°, None antes do primeiro movimento)
         """
         return self.current_angle
     
@@ -116,13 +247,13 @@ class ServoController:
         Returns:
             bool: True se vassouras estão na posição de limpeza
         """
-        return self.current_angle >= 45  # Considera "abaixado" se > 45°
+        # Considera "abaixado" se > 45°
+        return self.current_angle is not None and self.current_angle >= 45
     
     def cleanup(self):
         """Limpa recursos GPIO"""
-        # Levantar vassouras antes de desligar
+        # Levantar vassouras antes de desligar (nada se já levantadas)
         self.lift_up()
-        time.sleep(0.3)
         
         self.pwm.stop()
         print("[SERVO] Recursos liberados")
\ No newline at end of file
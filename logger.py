@@ -0,0 +1,266 @@
+"""
+logger.py
+=========
+Logger assíncrono do robô
+
+As chamadas no loop de controle só enfileiram (nível, mensagem, args):
+a formatação e a escrita no terminal/arquivo acontecem numa thread de
+fundo. Um console lento (serial, SSH) deixa de travar o loop; se a fila
+encher, mensagens são descartadas e contadas em vez de bloquear.
+
+- Níveis: DEBUG, INFO, WARNING, ERROR (OFF = silencioso)
+- Formatação preguiçosa estilo %: log.info("Dist: %.1fcm", d) não
+  formata nada se o nível estiver desligado
+- Limite de taxa por mensagem: every=s emite no máximo uma vez a cada
+  s segundos e informa quantas foram suprimidas
+- log.sensor(): leituras detalhadas, só com verbose_sensors
+
+Uso:
+    import logger
+    logger.configure(debug=DEBUG_MODE, verbose_sensors=VERBOSE_SENSORS,
+                     log_file=LOG_FILE if LOG_TO_FILE else None)
+
+    log = logger.get_logger('robot')
+    log.info(">>> PLACA ENCONTRADA!")
+    log.debug("[PLACA] Dist: %5.1fcm", distance, every=0.5)
+"""
+
+import atexit
+import queue
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+LEVEL_NAMES = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'AVISO', ERROR: 'ERRO'}
+
+
+class _Backend:
+    """Fila + thread de escrita compartilhadas por todos os loggers"""
+
+    def __init__(self, queue_size=1000):
+        self.level = INFO
+        self.verbose_sensors = False
+        self.stream = None              # None = sys.stdout do momento
+        self.file = None
+        self.clock = time.monotonic     # Relógio do limite de taxa
+
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.thread = None
+        self.lock = threading.Lock()
+
+        self.dropped = 0                # Fila cheia
+        self.last_emit = {}             # chave -> instante da última emissão
+        self.suppressed = {}            # chave -> mensagens suprimidas
+
+    def submit(self, level, name, msg, args, key, every):
+        """Enfileira uma mensagem (chamado no loop de controle)"""
+        if every is not None:
+            key = key or msg
+            now = self.clock()
+            with self.lock:     # Produtores em várias threads (loop, rampa, câmera)
+                last = self.last_emit.get(key)
+                if last is not None and now - last < every:
+                    self.suppressed[key] = self.suppressed.get(key, 0) + 1
+                    return
+                self.last_emit[key] = now
+                skipped = self.suppressed.pop(key, 0)
+        else:
+            skipped = 0
+
+        if self.thread is None:
+            self._start()
+        try:
+            self.queue.put_nowait((level, name, msg, args, skipped, time.time()))
+        except queue.Full:
+            with self.lock:     # Produtores em várias threads
+                self.dropped += 1
+
+    def _start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name='logger',
+                                               daemon=True)
+                self.thread.start()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+            finally:
+                self.queue.task_done()
+
+    def _write(self, level, name, msg, args, skipped, timestamp):
+        try:
+            text = msg % args if args else msg
+        except (TypeError, ValueError) as e:
+            text = f"{msg} {args} (erro de formatação: {e})"
+        if skipped:
+            text += f" (+{skipped} suprimidas)"
+        with self.lock:
+            dropped, self.dropped = self.dropped, 0
+        if dropped:
+            text += f" (+{dropped} descartadas: fila cheia)"
+
+        stream = self.stream or sys.stdout
+        try:
+            stream.write(text + "\n")
+            stream.flush()
+        except (OSError, ValueError):
+            pass
+
+        if self.file is not None:
+            stamp = time.strftime('%H:%M:%S', time.localtime(timestamp))
+            millis = int(timestamp * 1000) % 1000
+            self.file.write(f"{stamp}.{millis:03d} {LEVEL_NAMES.get(level, level):5s} "
+                            f"{name}: {text}\n")
+            self.file.flush()
+
+    def flush(self):
+        """Espera a fila esvaziar"""
+        if self.thread is not None:
+            self.queue.join()
+
+    def close(self):
+        """Escreve o que falta, encerra a thread e fecha o arquivo"""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+_backend = _Backend()
+atexit.register(_backend.close)
+
+
+class Logger:
+    """Logger com nome; barato quando o nível está desligado"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def is_enabled(self, level):
+        return level >= _backend.level
+
+    def log(self, level, msg, *args, key=None, every=None):
+        """
+        Registra uma mensagem.
+
+        Args:
+            level: DEBUG, INFO, WARNING ou ERROR
+            msg: texto com marcadores % (formatado na thread de escrita)
+            *args: valores dos marcadores (imutáveis: são lidos depois)
+            key: identifica a mensagem no limite de taxa (padrão: msg)
+            every: intervalo mínimo entre emissões (s), None = sempre
+        """
+        if level >= _backend.level:
+            _backend.submit(level, self.name, msg, args, key, every)
+
+    def debug(self, msg, *args, key=None, every=None):
+        if DEBUG >= _backend.level:
+            _backend.submit(DEBUG, self.name, msg, args, key, every)
+
+    def info(self, msg, *args, key=None, every=None):
+        if INFO >= _backend.level:
+            _backend.submit(INFO, self.name, msg, args, key, every)
+
+    def warning(self, msg, *args, key=None, every=None):
+        if WARNING >= _backend.level:
+            _backend.submit(WARNING, self.name, msg, args, key, every)
+
+    def error(self, msg, *args, key=None, every=None):
+        if ERROR >= _backend.level:
+            _backend.submit(ERROR, self.name, msg, args, key, every)
+
+    def sensor(self, msg, *args, key=None, every=None):
+        """Leitura detalhada de sensor (DEBUG, só com verbose_sensors)"""
+        if _backend.verbose_sensors and DEBUG >= _backend.level:
+            _backend.submit(DEBUG, self.name, msg, args, key, every)
+
+    def flush(self):
+        """Espera as mensagens pendentes (de todos os loggers) serem escritas"""
+        _backend.flush()
+
+
+_loggers = {}
+
+
+def get_logger(name):
+    """
+    Logger com o nome dado (mesmo objeto para o mesmo nome).
+
+    Returns:
+        Logger
+    """
+    if name not in _loggers:
+        _loggers[name] = Logger(name)
+    return _loggers[name]
+
+
+def configure(debug=False, verbose_sensors=False, log_file=None, level=None,
+              stream=None, clock=None):
+    """
+    Configura todos os loggers.
+
+    Args:
+        debug: DEBUG_MODE (nível DEBUG em vez de INFO)
+        verbose_sensors: VERBOSE_SENSORS (habilita log.sensor())
+        log_file: caminho do arquivo de log (None = só terminal)
+        level: nível explícito (sobrepõe debug)
+        stream: destino do terminal (None = sys.stdout)
+        clock: função -> segundos para o limite de taxa
+               (ex: VirtualClock.now; padrão time.monotonic)
+    """
+    _backend.flush()
+    _backend.level = level if level is not None else (DEBUG if debug else INFO)
+    _backend.verbose_sensors = verbose_sensors
+    _backend.stream = stream
+    _backend.clock = clock or time.monotonic
+    with _backend.lock:
+        _backend.last_emit.clear()
+        _backend.suppressed.clear()
+
+    if _backend.file is not None:
+        _backend.file.close()
+        _backend.file = None
+    if log_file:
+        _backend.file = open(log_file, 'a', encoding='utf-8')
+
+
+def set_level(level):
+    """Troca o nível sem mexer no resto da configuração"""
+    _backend.level = level
+
+
+@contextmanager
+def silenced():
+    """Desliga todos os loggers dentro do bloco (ex: lotes de simulação)"""
+    previous = _backend.level
+    _backend.level = OFF
+    try:
+        yield
+    finally:
+        _backend.level = previous
+
+
+def flush():
+    """Espera as mensagens pendentes serem escritas"""
+    _backend.flush()
+
+
+def dropped():
+    """Mensagens descartadas por fila cheia ainda não informadas"""
+    return _backend.dropped
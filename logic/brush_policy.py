@@ -0,0 +1,196 @@
+"""
+logic/brush_policy.py
+=====================
+Potência das vassouras e velocidade de avanço pela sujeira estimada,
+e quando ligar/desligar sem ficar abaixando e levantando o servo
+"""
+
+import numpy as np
+
+
+# (probabilidade de sujeira, fração do duty máximo das vassouras,
+#  fração da velocidade de escaneamento), interpolada entre os pontos
+DEFAULT_CURVE = ((0.55, 0.5, 0.75), (0.8, 0.75, 0.5), (1.0, 1.0, 0.33))
+
+
+class BrushPolicy:
+    """
+    Mapeia a probabilidade de sujeira da visão para duty das vassouras
+    e velocidade de avanço.
+
+    Poeira leve: vassouras a meia potência e o robô anda quase na
+    velocidade de escaneamento (menos energia e tempo por faixa).
+    Sujeira pesada: potência máxima e o robô anda devagar.
+
+    Histerese: liga com o nível >= on_threshold e só desliga abaixo de
+    off_threshold - uma leitura perto de 0.5 não liga e desliga o
+    conjunto servo + motores a cada verificação. O nível é uma média
+    móvel exponencial das probabilidades (smoothing = peso da última).
+    """
+
+    def __init__(self, max_duty, scan_speed, curve=DEFAULT_CURVE,
+                 on_threshold=0.55, off_threshold=0.45, smoothing=1.0,
+                 auto_activate=True):
+        """
+        Args:
+            max_duty: duty das vassouras com sujeira máxima (0-100)
+            scan_speed: velocidade de escaneamento sem sujeira (0-100)
+            curve: pontos (probabilidade, fração do duty, fração da
+                   velocidade) em ordem crescente de probabilidade
+            on_threshold: nível que liga as vassouras
+            off_threshold: nível abaixo do qual desligam
+            smoothing: peso da última probabilidade na média (1 = sem média)
+            auto_activate: False = nunca liga sozinha (só velocidade)
+
+        Raises:
+            ValueError: curva vazia/fora de ordem ou limiares invertidos
+        """
+        points = np.asarray(curve, dtype=float)
+        if points.ndim != 2 or points.shape[1] != 3 or len(points) == 0:
+            raise ValueError("curve deve ter pontos (probabilidade, duty, velocidade)")
+        if np.any(np.diff(points[:, 0]) <= 0):
+            raise ValueError("curve deve estar em ordem crescente de probabilidade")
+        if off_threshold > on_threshold:
+            raise ValueError("off_threshold deve ser <= on_threshold")
+
+        self.max_duty = max_duty
+        self.scan_speed = scan_speed
+        self.points = points
+        self.on_threshold = on_threshold
+        self.off_threshold = off_threshold
+        self.smoothing = smoothing
+        self.auto_activate = auto_activate
+
+        self.level = 0.0        # Probabilidade média
+        self.active = False     # Vassouras pedidas
+
+    def update(self, probability):
+        """
+        Nova probabilidade de sujeira (uma verificação de visão).
+
+        Returns:
+            bool: vassouras pedidas após a histerese
+        """
+        self.level += self.smoothing * (probability - self.level)
+        if not self.auto_activate:
+            self.active = False
+        elif self.active:
+            self.active = self.level >= self.off_threshold
+        else:
+            self.active = self.level >= self.on_threshold
+        return self.active
+
+    def brush_duty(self):
+        """Duty das vassouras (0-100) para o nível atual (0 se inativas)"""
+        if not self.active:
+            return 0
+        fraction = np.interp(self.level, self.points[:, 0], self.points[:, 1])
+        return int(round(self.max_duty * fraction))
+
+    def drive_speed(self):
+        """Velocidade de avanço (0-100) sobre a placa"""
+        if not self.active:
+            return self.scan_speed
+        fraction = np.interp(self.level, self.points[:, 0], self.points[:, 2])
+        return int(round(self.scan_speed * fraction))
+
+
+# Motivos de uma troca do pedido não chegar às vassouras
+HOLD_REASONS = ('min_on', 'min_off', 'trail', 'maneuver')
+
+
+class BrushScheduler:
+    """
+    Decide se as vassouras giram a partir do pedido (sujeira sobre a
+    placa), sem alternar servo + motores a cada verificação.
+
+    - min_on_time / min_off_time: tempo mínimo em cada estado antes de
+      trocar (s)
+    - trail_distance: depois da última leitura suja (dirty_reading) as
+      vassouras seguem ligadas por mais essa distância percorrida (cm)
+    - manobras: o estado atual é mantido (nada de servo girando)
+
+    Contadores: requested = trocas do pedido, toggles = trocas feitas,
+    held[motivo] = trocas do pedido seguradas no momento em que
+    aconteceram. Trocas evitadas = requested - toggles.
+    """
+
+    def __init__(self, clock, min_on_time=4.0, min_off_time=2.0, trail_distance=38.0):
+        """
+        Args:
+            clock: relógio (hardware.clock)
+            min_on_time: ligadas, tempo mínimo antes de desligar (s)
+            min_off_time: desligadas, tempo mínimo antes de religar (s)
+            trail_distance: distância ligada após a última leitura suja (cm)
+        """
+        self.clock = clock
+        self.min_on_time = min_on_time
+        self.min_off_time = min_off_time
+        self.trail_distance = trail_distance
+
+        self.running = False
+        self.changed_at = float('-inf')     # Última troca (s)
+        self.dirty_at = None                # Distância da última leitura suja (cm)
+        self._wanted = False
+
+        self.requested = 0
+        self.toggles = 0
+        self.held = dict.fromkeys(HOLD_REASONS, 0)
+
+    def dirty_reading(self, distance):
+        """
+        Leitura de visão suja: o rastro conta a partir daqui.
+
+        Args:
+            distance: distância total percorrida na captura (odometria, cm)
+        """
+        self.dirty_at = distance
+
+    def decide(self, wanted, distance, maneuvering=False):
+        """
+        Args:
+            wanted: pedido sem filtro (sujeira e sobre a placa)
+            distance: distância total percorrida (odometria, cm)
+            maneuvering: True durante manobras (estado mantido)
+
+        Returns:
+            bool: True se as vassouras devem girar
+        """
+        now = self.clock.now()
+        target, reason = wanted, None
+        if maneuvering:
+            target, reason = self.running, 'maneuver'
+        elif self.running and not wanted and self.dirty_at is not None \
+                and distance - self.dirty_at < self.trail_distance:
+            target, reason = True, 'trail'
+
+        if target != self.running:
+            dwell = self.min_off_time if target else self.min_on_time
+            if now - self.changed_at < dwell:
+                target, reason = self.running, 'min_off' if target else 'min_on'
+
+        if wanted != self._wanted:
+            self._wanted = wanted
+            self.requested += 1
+            if target != wanted:
+                self.held[reason] += 1
+
+        if target != self.running:
+            self.running = target
+            self.changed_at = now
+            self.toggles += 1
+        return self.running
+
+    def halt(self):
+        """Desliga sem filtro (fim da missão)"""
+        if self._wanted:
+            self._wanted = False
+            self.requested += 1
+        if self.running:
+            self.running = False
+            self.changed_at = self.clock.now()
+            self.toggles += 1
+
+    def avoided(self):
+        """Trocas do pedido que não viraram troca das vassouras"""
+        return max(0, self.requested - self.toggles)
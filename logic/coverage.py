@@ -0,0 +1,285 @@
+"""
+logic/coverage.py
+=================
+Mapa de cobertura da placa (grade NumPy de área visitada, limpa e suja)
+"""
+
+import math
+
+import numpy as np
+
+
+class CoverageMap:
+    """
+    Grade de resolução fixa no referencial da odometria.
+
+    Camadas:
+    - visited: célula já esteve sob o robô (bool)
+    - brushed: quantas vezes a célula passou sob as vassouras ligadas (uint16)
+    - dirt:    probabilidade de sujeira (float32, 0.5 = desconhecido)
+    - panel:   célula é placa (bool) - denominador das frações
+
+    O carimbo do footprint (retângulo rotacionado) é vetorizado: só a
+    sub-grade que contém o retângulo é avaliada a cada iteração.
+
+    Com grow=True a grade cresce (em blocos de GROW_MARGIN) quando um
+    footprint sai dela: a posição da placa na odometria depende de onde
+    o robô foi posto. A placa começa como a área visitada com o sensor
+    vendo vidro; com o plano de faixas, set_panel() a substitui pelo
+    retângulo das bordas observadas.
+    """
+
+    GROW_MARGIN = 50.0  # Folga ao crescer a grade (cm)
+
+    def __init__(self, size=(200, 100), origin=(-10, -50), resolution=2.0,
+                 robot_size=(25, 20), brush_size=(6, 20), brush_offset=-8,
+                 camera_size=(20, 20), camera_offset=20, brush_efficiency=0.8,
+                 grow=False):
+        """
+        Args:
+            size: (comprimento x, largura y) da área mapeada inicial (cm)
+            origin: coordenada (x, y) do canto da grade na odometria (cm)
+            resolution: lado de cada célula (cm)
+            robot_size: (comprimento, largura) do robô (cm)
+            brush_size: (comprimento, largura) da faixa das vassouras (cm)
+            brush_offset: posição das vassouras à frente do centro (cm,
+                          negativo = atrás)
+            camera_size: (comprimento, largura) da área vista pela câmera (cm)
+            camera_offset: centro da área da câmera à frente do robô (cm)
+            brush_efficiency: fração da sujeira removida por passada
+            grow: True = cresce a grade quando o robô sai dela
+        """
+        self.origin = origin
+        self.resolution = resolution
+        self.robot_size = robot_size
+        self.brush_size = brush_size
+        self.brush_offset = brush_offset
+        self.camera_size = camera_size
+        self.camera_offset = camera_offset
+        self.brush_efficiency = brush_efficiency
+        self.grow = grow
+
+        self.nx = int(math.ceil(size[0] / resolution))
+        self.ny = int(math.ceil(size[1] / resolution))
+        self._set_axes()
+
+        self.visited = np.zeros((self.nx, self.ny), dtype=bool)
+        self.brushed = np.zeros((self.nx, self.ny), dtype=np.uint16)
+        self.dirt = np.full((self.nx, self.ny), 0.5, dtype=np.float32)
+        self.panel = np.zeros((self.nx, self.ny), dtype=bool)
+        self.panel_area = None      # Retângulo de set_panel() (None = pelo sensor)
+
+    def _set_axes(self):
+        """Centro de cada célula (coordenadas da odometria)"""
+        self.xs = self.origin[0] + (np.arange(self.nx) + 0.5) * self.resolution
+        self.ys = self.origin[1] + (np.arange(self.ny) + 0.5) * self.resolution
+
+    def _ensure(self, x0, x1, y0, y1):
+        """Cresce a grade para conter [x0, x1] x [y0, y1] (com grow=True)"""
+        res = self.resolution
+        ox, oy = self.origin
+        before_x = max(0, int(math.ceil((ox - x0) / res)))
+        before_y = max(0, int(math.ceil((oy - y0) / res)))
+        after_x = max(0, int(math.ceil((x1 - ox) / res)) - self.nx)
+        after_y = max(0, int(math.ceil((y1 - oy) / res)) - self.ny)
+        if not (before_x or before_y or after_x or after_y):
+            return
+
+        margin = int(math.ceil(self.GROW_MARGIN / res))
+        pad = tuple((n + margin if n else 0) for n in (before_x, after_x, before_y, after_y))
+        widths = ((pad[0], pad[1]), (pad[2], pad[3]))
+        self.visited = np.pad(self.visited, widths)
+        self.brushed = np.pad(self.brushed, widths)
+        self.dirt = np.pad(self.dirt, widths, constant_values=0.5)
+        self.panel = np.pad(self.panel, widths)
+        self.origin = (ox - pad[0] * res, oy - pad[2] * res)
+        self.nx, self.ny = self.visited.shape
+        self._set_axes()
+
+    # ------------------------------------------------------------------
+    # Carimbo do footprint
+    # ------------------------------------------------------------------
+
+    def _footprint(self, pose, size, offset=0.0):
+        """
+        Células cobertas por um retângulo preso ao robô.
+
+        Args:
+            pose: (x, y, θ) do robô
+            size: (comprimento, largura) do retângulo (cm)
+            offset: deslocamento do centro à frente do robô (cm)
+
+        Returns:
+            tuple: (fatia x, fatia y, máscara bool) ou None se fora da grade
+        """
+        x, y, theta = pose
+        cos_t = math.cos(theta)
+        sin_t = math.sin(theta)
+        cx = x + offset * cos_t
+        cy = y + offset * sin_t
+        half_l = size[0] / 2.0
+        half_w = size[1] / 2.0
+
+        # Caixa alinhada aos eixos que contém o retângulo rotacionado
+        ext_x = abs(half_l * cos_t) + abs(half_w * sin_t)
+        ext_y = abs(half_l * sin_t) + abs(half_w * cos_t)
+        if self.grow:
+            self._ensure(cx - ext_x, cx + ext_x, cy - ext_y, cy + ext_y)
+        i0 = max(0, int((cx - ext_x - self.origin[0]) / self.resolution))
+        i1 = min(self.nx, int((cx + ext_x - self.origin[0]) / self.resolution) + 1)
+        j0 = max(0, int((cy - ext_y - self.origin[1]) / self.resolution))
+        j1 = min(self.ny, int((cy + ext_y - self.origin[1]) / self.resolution) + 1)
+        if i0 >= i1 or j0 >= j1:
+            return None
+
+        # Coordenadas locais (referencial do robô) de cada célula da caixa
+        dx = self.xs[i0:i1, None] - cx
+        dy = self.ys[None, j0:j1] - cy
+        local_l = dx * cos_t + dy * sin_t
+        local_w = -dx * sin_t + dy * cos_t
+        mask = (np.abs(local_l) <= half_l) & (np.abs(local_w) <= half_w)
+
+        return slice(i0, i1), slice(j0, j1), mask
+
+    def update(self, pose, brushing=False, on_panel=False):
+        """
+        Marca área visitada (e limpa, se vassouras ligadas) na pose atual.
+
+        Args:
+            pose: (x, y, θ) da odometria
+            brushing: True se as vassouras estão abaixadas e girando
+            on_panel: True se o sensor vê vidro (marca placa até set_panel)
+        """
+        cells = self._footprint(pose, self.robot_size)
+        if cells is not None:
+            sx, sy, mask = cells
+            self.visited[sx, sy] |= mask
+            if on_panel and self.panel_area is None:
+                self.panel[sx, sy] |= mask
+
+        if brushing:
+            cells = self._footprint(pose, self.brush_size, self.brush_offset)
+            if cells is not None:
+                sx, sy, mask = cells
+                sub = self.brushed[sx, sy]
+                sub[mask] = np.minimum(sub[mask].astype(np.uint32) + 1, 65535)
+                dirt = self.dirt[sx, sy]
+                dirt[mask] *= (1.0 - self.brush_efficiency)
+
+    def update_dirt(self, pose, probability):
+        """
+        Registra resultado da visão na área vista pela câmera.
+
+        Args:
+            pose: (x, y, θ) da odometria no momento da captura
+            probability: probabilidade de sujeira (0-1)
+        """
+        cells = self._footprint(pose, self.camera_size, self.camera_offset)
+        if cells is not None:
+            sx, sy, mask = cells
+            self.dirt[sx, sy][mask] = probability
+
+    def set_panel(self, axis, along, lateral):
+        """
+        Define a placa como um retângulo no referencial das faixas.
+
+        As bordas são vistas com o centro do robô ainda sobre o vidro:
+        o comprimento é estendido por meio robô em cada ponta.
+
+        Args:
+            axis: (x, y, θ) da origem e direção das faixas (odometria)
+            along: (início, fim) ao longo das faixas (cm)
+            lateral: (início, fim) na direção lateral, + = esquerda (cm)
+        """
+        ox, oy, theta = axis
+        half = self.robot_size[0] / 2.0
+        a0, a1 = along[0] - half, along[1] + half
+        l0, l1 = lateral
+        cos_t = math.cos(theta)
+        sin_t = math.sin(theta)
+
+        if self.grow:
+            corners = [(ox + a * cos_t - l * sin_t, oy + a * sin_t + l * cos_t)
+                       for a in (a0, a1) for l in (l0, l1)]
+            xs, ys = zip(*corners)
+            self._ensure(min(xs), max(xs), min(ys), max(ys))
+
+        dx = self.xs[:, None] - ox
+        dy = self.ys[None, :] - oy
+        a = dx * cos_t + dy * sin_t
+        l = -dx * sin_t + dy * cos_t
+        self.panel = (a >= a0) & (a <= a1) & (l >= l0) & (l <= l1)
+        self.panel_area = (axis, (a0, a1), (l0, l1))
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def _layer_mask(self, layer):
+        """Máscara bool de células cobertas para uma camada"""
+        if layer == 'visited':
+            return self.visited
+        if layer == 'brushed':
+            return self.brushed > 0
+        raise ValueError(f"Camada inválida: {layer} (use 'visited' ou 'brushed')")
+
+    def coverage_fraction(self, layer='visited'):
+        """
+        Fração da placa já coberta (células de placa conhecidas).
+
+        Args:
+            layer: 'visited' ou 'brushed'
+
+        Returns:
+            float: 0.0 a 1.0 (0.0 sem placa conhecida)
+        """
+        panel_cells = np.count_nonzero(self.panel)
+        if panel_cells == 0:
+            return 0.0
+        return float(np.count_nonzero(self._layer_mask(layer) & self.panel)) / panel_cells
+
+    def dirty_fraction(self, threshold=0.5):
+        """
+        Fração da placa com probabilidade de sujeira acima do limiar.
+
+        Mesmo denominador de coverage_fraction (células de placa
+        conhecidas), então não cai quando a grade cresce.
+
+        Args:
+            threshold: probabilidade mínima para contar como suja
+
+        Returns:
+            float: 0.0 a 1.0 (0.0 sem placa conhecida)
+        """
+        panel_cells = np.count_nonzero(self.panel)
+        if panel_cells == 0:
+            return 0.0
+        return float(np.count_nonzero((self.dirt > threshold) & self.panel)) / panel_cells
+
+    def nearest_uncovered(self, x, y, layer='visited'):
+        """
+        Centro da célula de placa não coberta mais próxima de (x, y).
+
+        Args:
+            x, y: posição de referência (cm)
+            layer: 'visited' ou 'brushed'
+
+        Returns:
+            tuple: (x, y, distância) ou None se tudo coberto
+        """
+        uncovered = ~self._layer_mask(layer) & self.panel
+        if not uncovered.any():
+            return None
+
+        dist2 = (self.xs[:, None] - x) ** 2 + (self.ys[None, :] - y) ** 2
+        dist2 = np.where(uncovered, dist2, np.inf)
+        i, j = np.unravel_index(np.argmin(dist2), dist2.shape)
+        return float(self.xs[i]), float(self.ys[j]), float(math.sqrt(dist2[i, j]))
+
+    def reset(self):
+        """Apaga todas as camadas"""
+        self.visited[:] = False
+        self.brushed[:] = 0
+        self.dirt[:] = 0.5
+        self.panel[:] = False
+        self.panel_area = None
@@ -0,0 +1,235 @@
+"""
+logic/fsm.py
+============
+Máquina de estados dirigida por tabela, com tempo gasto por estado
+
+A tabela declara, para cada estado, o handler chamado a cada iteração,
+a ação de entrada e os destinos permitidos. Ela é validada ao criar a
+máquina (estado faltando, destino desconhecido, estado inalcançável ou
+sem saída = ValueError); o despacho é uma consulta de dicionário.
+
+Uso:
+    machine = StateMachine('robô', {
+        A: State(handle_a, targets=(B,)),
+        B: State(handle_b, targets=()),       # terminal
+    }, initial=A, clock=clock)
+
+    machine.dispatch(leitura)       # chama o handler do estado atual
+    machine.transition(B)           # só destinos declarados
+"""
+
+from hardware.clock import REAL_CLOCK
+
+
+# Destino especial: sai da máquina (ex: fim de uma manobra)
+EXIT = None
+
+
+class State:
+    """Linha da tabela: handler, ação de entrada e destinos permitidos"""
+
+    def __init__(self, handler, on_enter=None, targets=()):
+        """
+        Args:
+            handler: função chamada por dispatch() enquanto no estado
+            on_enter: função sem argumentos chamada ao entrar (ou None)
+            targets: estados de destino permitidos (EXIT = sair da máquina)
+        """
+        self.handler = handler
+        self.on_enter = on_enter
+        self.targets = frozenset(targets)
+
+
+class StateMachine:
+    """
+    Máquina de estados sobre uma tabela {estado: State}.
+
+    Estados sem destinos são terminais. Com entries, a máquina começa
+    fora de qualquer estado (current = EXIT) e só pode entrar por eles;
+    estados que listam EXIT podem sair, voltando a ficar ociosa.
+
+    Mede o tempo acumulado e o número de entradas de cada estado.
+    """
+
+    def __init__(self, name, table, initial=EXIT, entries=None, clock=None):
+        """
+        Args:
+            name: nome para relatórios e erros
+            table: dict {estado: State}; deve cobrir todo o Enum dos estados
+            initial: estado inicial (EXIT = começa ociosa)
+            entries: estados pelos quais se entra a partir de EXIT
+                     (padrão: só o inicial)
+            clock: relógio (hardware.clock, None = relógio real)
+
+        Raises:
+            ValueError: tabela inválida
+        """
+        self.name = name
+        self.table = dict(table)
+        self.entries = frozenset(entries if entries is not None else (initial,)) - {EXIT}
+        self.clock = clock or REAL_CLOCK
+
+        self._validate(initial)
+
+        self.time_in = {state: 0.0 for state in self.table}
+        self.visits = {state: 0 for state in self.table}
+        self.current = EXIT
+        self.entered_at = self.clock.now()
+        if initial is not EXIT:
+            self._enter(initial, self.entered_at)
+
+    # ==================== VALIDAÇÃO ====================
+
+    def _validate(self, initial):
+        errors = []
+        states = set(self.table)
+
+        if not states:
+            raise ValueError(f"Máquina {self.name}: tabela vazia")
+
+        # Cobertura do Enum: nenhum membro sem linha na tabela
+        enum_type = type(next(iter(states)))
+        missing = [s for s in enum_type if s not in states]
+        if missing:
+            errors.append(f"estados sem linha na tabela: {_names(missing)}")
+
+        if initial is not EXIT and initial not in states:
+            errors.append(f"estado inicial desconhecido: {initial}")
+        if not self.entries:
+            errors.append("nenhum estado de entrada")
+        unknown = self.entries - states
+        if unknown:
+            errors.append(f"entradas desconhecidas: {_names(unknown)}")
+
+        for state, row in self.table.items():
+            if not callable(row.handler):
+                errors.append(f"{state.name}: handler não é chamável")
+            if row.on_enter is not None and not callable(row.on_enter):
+                errors.append(f"{state.name}: on_enter não é chamável")
+            bad = row.targets - states - {EXIT}
+            if bad:
+                errors.append(f"{state.name}: destinos desconhecidos {_names(bad)}")
+
+        if not errors:
+            reachable = self._closure(self.entries, lambda s: self.table[s].targets - {EXIT})
+            unreachable = states - reachable
+            if unreachable:
+                errors.append(f"estados inalcançáveis: {_names(unreachable)}")
+
+            # Todo estado chega a um terminal ou à saída (sem becos)
+            ends = {s for s, row in self.table.items() if not row.targets or EXIT in row.targets}
+            sources = {s: set() for s in states}
+            for state, row in self.table.items():
+                for target in row.targets - {EXIT}:
+                    sources[target].add(state)
+            finishing = self._closure(ends, lambda s: sources[s])
+            stuck = states - finishing
+            if stuck:
+                errors.append(f"estados sem caminho até o fim: {_names(stuck)}")
+
+        if errors:
+            raise ValueError(f"Máquina {self.name}: " + "; ".join(errors))
+
+    @staticmethod
+    def _closure(start, neighbours):
+        seen = set(start)
+        pending = list(start)
+        while pending:
+            for other in neighbours(pending.pop()):
+                if other not in seen:
+                    seen.add(other)
+                    pending.append(other)
+        return seen
+
+    # ==================== EXECUÇÃO ====================
+
+    def dispatch(self, *args):
+        """
+        Chama o handler do estado atual (nada se ociosa).
+
+        Returns:
+            retorno do handler
+        """
+        if self.current is EXIT:
+            return None
+        return self.table[self.current].handler(*args)
+
+    def transition(self, target):
+        """
+        Troca de estado (só para destinos declarados na tabela).
+
+        Args:
+            target: próximo estado, ou EXIT para sair da máquina
+
+        Raises:
+            ValueError: transição não declarada
+        """
+        if self.current is EXIT:
+            allowed = self.entries
+        else:
+            allowed = self.table[self.current].targets
+        if target not in allowed:
+            source = 'EXIT' if self.current is EXIT else self.current.name
+            dest = 'EXIT' if target is EXIT else target.name
+            raise ValueError(f"Máquina {self.name}: transição {source} -> {dest} não declarada")
+
+        now = self.clock.now()
+        self._leave(now)
+        if target is not EXIT:
+            self._enter(target, now)
+
+    def halt(self):
+        """Sai da máquina de qualquer estado (parada, emergência)"""
+        self._leave(self.clock.now())
+
+    def _enter(self, state, now):
+        self.current = state
+        self.entered_at = now
+        self.visits[state] += 1
+        on_enter = self.table[state].on_enter
+        if on_enter is not None:
+            on_enter()
+
+    def _leave(self, now):
+        if self.current is not EXIT:
+            self.time_in[self.current] += now - self.entered_at
+        self.current = EXIT
+        self.entered_at = now
+
+    # ==================== MÉTRICAS ====================
+
+    def elapsed(self):
+        """Tempo (s) desde a entrada no estado atual"""
+        return self.clock.now() - self.entered_at
+
+    def durations(self):
+        """
+        Tempo acumulado por estado, incluindo o estado atual até agora.
+
+        Returns:
+            dict: {estado: segundos}
+        """
+        durations = dict(self.time_in)
+        if self.current is not EXIT:
+            durations[self.current] += self.elapsed()
+        return durations
+
+    def report(self):
+        """
+        Tabela de tempo por estado (ordem da tabela).
+
+        Returns:
+            str: texto multi-linha
+        """
+        durations = self.durations()
+        total = sum(durations.values()) or 1.0
+        lines = [f"Tempo por estado ({self.name}):"]
+        for state in self.table:
+            lines.append(f"  {state.value:20s} {durations[state]:8.1f}s "
+                         f"{durations[state] / total * 100:5.1f}% | "
+                         f"{self.visits[state]:4d} entradas")
+        return "\n".join(lines)
+
+
+def _names(states):
+    return ", ".join(sorted(s.name for s in states))
@@ -0,0 +1,75 @@
+"""
+logic/kinematics.py
+===================
+Modelo cinemático de tração diferencial calibrado pelos tempos de manobra
+"""
+
+import math
+
+
+class DifferentialDriveModel:
+    """
+    Converte duty cycle das rodas em velocidades e tempos de manobra.
+
+    Não há encoders: a velocidade linear de cada roda é estimada a partir
+    da calibração já existente do giro no lugar (TURN_90_TIME a uma
+    velocidade conhecida). Girando no lugar, cada roda percorre um arco
+    de raio L/2 (L = distância entre rodas):
+
+        v_roda = (π/2) / TURN_90_TIME * L/2
+
+    Assume-se velocidade proporcional ao duty cycle.
+    """
+
+    def __init__(self, wheel_base, turn_90_time, turn_speed):
+        """
+        Args:
+            wheel_base: distância entre as rodas (cm)
+            turn_90_time: tempo para girar 90° no lugar (s)
+            turn_speed: duty cycle usado ao medir turn_90_time (0-100)
+        """
+        self.wheel_base = wheel_base
+
+        wheel_speed = (math.pi / 2) / turn_90_time * (wheel_base / 2.0)
+        self.cm_per_duty = wheel_speed / turn_speed  # (cm/s) por 1% de duty
+
+    def wheel_speed(self, duty):
+        """Velocidade linear da roda (cm/s) para um duty (-100 a 100)"""
+        return duty * self.cm_per_duty
+
+    def body_velocity(self, left_duty, right_duty):
+        """
+        Velocidades do robô para os duties das rodas.
+
+        Returns:
+            tuple: (linear cm/s, angular rad/s, positivo = esquerda)
+        """
+        v_left = self.wheel_speed(left_duty)
+        v_right = self.wheel_speed(right_duty)
+        linear = (v_left + v_right) / 2.0
+        angular = (v_right - v_left) / self.wheel_base
+        return linear, angular
+
+    def distance_time(self, distance, duty):
+        """Tempo (s) para andar reto uma distância (cm)"""
+        return distance / self.wheel_speed(duty)
+
+    def drive_distance(self, duration, duty):
+        """Distância (cm) percorrida andando reto por um tempo"""
+        return self.wheel_speed(duty) * duration
+
+    def arc_time(self, radius, angle, outer_duty):
+        """
+        Tempo para percorrer um arco (mesma fórmula de L298NController.arc).
+
+        Args:
+            radius: raio no centro do robô (cm)
+            angle: ângulo a girar (graus)
+            outer_duty: duty da roda externa (0-100)
+
+        Returns:
+            float: tempo em segundos
+        """
+        outer_radius = radius + self.wheel_base / 2.0
+        angular = self.wheel_speed(outer_duty) / outer_radius
+        return math.radians(angle) / angular
@@ -0,0 +1,191 @@
+"""
+logic/motion.py
+===============
+Executor não-bloqueante de primitivas de movimento temporizadas
+"""
+
+from collections import deque
+
+from hardware.clock import REAL_CLOCK
+
+
+class MotionPrimitive:
+    """
+    Movimento temporizado a ser executado pelo MotionExecutor.
+
+    Tipos:
+    - 'drive':  anda reto (speed negativo = ré)
+    - 'turn':   gira no próprio eixo ('left' ou 'right')
+    - 'arc':    anda em arco de raio dado
+    - 'settle': para os motores e espera estabilizar
+    """
+
+    def __init__(self, kind, duration, speed=0, direction=None, radius=None):
+        self.kind = kind
+        self.duration = duration
+        self.speed = speed
+        self.direction = direction
+        self.radius = radius
+
+    def __repr__(self):
+        return f"MotionPrimitive({self.kind}, {self.duration:.2f}s)"
+
+
+class MotionExecutor:
+    """
+    Fila de primitivas com deadlines no relógio injetado.
+
+    Nada aqui dorme: update() é chamado a cada iteração do loop
+    principal, aplica o comando da primitiva quando ela começa e passa
+    para a próxima quando o deadline vence. Enquanto isso o loop continua
+    lendo sensores.
+
+    Primitivas 'settle' são puladas quando o robô já está parado
+    (motores desligados ao começar a espera).
+
+    Com rampas de aceleração no controlador, a duração de cada
+    movimento é compensada pelo deslocamento perdido na aceleração
+    (e ganho na desaceleração seguinte), e a estabilização dura no
+    mínimo o tempo da rampa de parada.
+    """
+
+    def __init__(self, motors, clock=None):
+        """
+        Args:
+            motors: L298NController (ou compatível)
+            clock: relógio (hardware.clock, None = relógio real)
+        """
+        self.motors = motors
+        self.clock = clock or REAL_CLOCK
+
+        self.queue = deque()
+        self.current = None
+        self.started_at = 0
+        self.deadline = None    # Deadline da primitiva atual
+
+        # Estatísticas de esperas evitadas
+        self.skipped_settles = 0
+        self.skipped_settle_time = 0.0
+
+    # ------------------------------------------------------------------
+    # Enfileirar primitivas
+    # ------------------------------------------------------------------
+
+    def drive(self, duration, speed):
+        """Anda reto por um tempo (speed negativo = ré)"""
+        self.queue.append(MotionPrimitive('drive', duration, speed=speed))
+
+    def turn(self, direction, duration, speed):
+        """Gira no próprio eixo ('left' ou 'right') por um tempo"""
+        self.queue.append(MotionPrimitive('turn', duration, speed=speed,
+                                          direction=direction))
+
+    def arc(self, radius, direction, duration, speed):
+        """Anda em arco (raio em cm) por um tempo"""
+        self.queue.append(MotionPrimitive('arc', duration, speed=speed,
+                                          direction=direction, radius=radius))
+
+    def settle(self, duration):
+        """Para e espera estabilizar (pulado se já estiver parado)"""
+        self.queue.append(MotionPrimitive('settle', duration))
+
+    # ------------------------------------------------------------------
+    # Execução
+    # ------------------------------------------------------------------
+
+    def update(self):
+        """
+        Avança a fila. Chamar a cada iteração do loop principal.
+
+        Returns:
+            MotionPrimitive em execução, ou None se a fila acabou
+        """
+        now = self.clock.now()
+
+        while True:
+            if self.current is not None:
+                if now < self.deadline.at:
+                    return self.current
+                self.current = None
+
+            if not self.queue:
+                return None
+
+            primitive = self.queue.popleft()
+            if self._start(primitive):
+                self.current = primitive
+                self.started_at = now
+                self.deadline = self.clock.deadline(self._effective_duration(primitive))
+
+    def _start(self, primitive):
+        """
+        Aplica o comando de motor da primitiva.
+
+        Returns:
+            bool: False se a primitiva foi pulada
+        """
+        if primitive.kind == 'settle':
+            if not self.motors.is_running:
+                self.skipped_settles += 1
+                self.skipped_settle_time += primitive.duration
+                return False
+            self.motors.stop()
+            return True
+
+        self.motors.set_speed(abs(primitive.speed))
+
+        if primitive.kind == 'drive':
+            if primitive.speed >= 0:
+                self.motors.move_forward()
+            else:
+                self.motors.move_backward()
+        elif primitive.kind == 'turn':
+            if primitive.direction == 'left':
+                self.motors.turn_left()
+            else:
+                self.motors.turn_right()
+        elif primitive.kind == 'arc':
+            self.motors.arc(primitive.radius, primitive.direction)
+
+        return True
+
+    def _effective_duration(self, primitive):
+        """
+        Duração ajustada pelas rampas do controlador.
+
+        Numa rampa linear de 0 até v em t_a, o robô anda v*t_a/2 a
+        menos que em velocidade constante; numa parada em rampa (t_d)
+        anda v*t_d/2 a mais. Logo o movimento é estendido em
+        (t_a - t_d) / 2, com t_d só quando o próximo passo para.
+        """
+        if primitive.kind == 'settle':
+            return max(primitive.duration, self.motors.time_to_target())
+
+        ramp_up = self.motors.time_to_target()
+        stops_next = not self.queue or self.queue[0].kind == 'settle'
+        ramp_down = self.motors.stop_time() if stops_next else 0.0
+
+        return max(0.0, primitive.duration + (ramp_up - ramp_down) / 2.0)
+
+    def cancel(self):
+        """Descarta a fila e para os motores"""
+        self.queue.clear()
+        self.current = None
+        self.motors.stop(immediate=True)
+
+    def is_busy(self):
+        """True se há primitiva em execução ou na fila"""
+        return self.current is not None or bool(self.queue)
+
+    def elapsed(self):
+        """Tempo (s) desde o início da primitiva atual"""
+        if self.current is None:
+            return 0
+        return self.clock.now() - self.started_at
+
+    def time_left(self):
+        """Tempo (s) restante até esvaziar a fila (estimado)"""
+        remaining = sum(p.duration for p in self.queue)
+        if self.current is not None:
+            remaining += self.deadline.remaining()
+        return remaining
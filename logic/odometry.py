@@ -0,0 +1,137 @@
+"""
+logic/odometry.py
+=================
+Odometria por dead-reckoning a partir dos comandos enviados aos motores
+"""
+
+import math
+
+import numpy as np
+
+from hardware.clock import REAL_CLOCK
+
+
+class Odometry:
+    """
+    Estima a pose (x, y, θ) integrando os duties aplicados nas rodas.
+
+    Sem encoders, a velocidade de cada roda vem do modelo calibrado
+    (DifferentialDriveModel). Entre duas chamadas de update() assume-se
+    que os duties ficaram constantes (segurador de ordem zero), o que
+    dá um arco exato por intervalo.
+
+    A incerteza é propagada como num EKF: cada roda tem erro de
+    deslocamento proporcional à distância percorrida (patinagem no
+    vidro, variação de bateria).
+
+    Convenção:
+        x para frente na pose inicial, y para a esquerda, θ em radianos
+        (positivo = anti-horário / esquerda).
+    """
+
+    def __init__(self, model, slip_noise=0.05, clock=None):
+        """
+        Args:
+            model: DifferentialDriveModel calibrado
+            slip_noise: desvio padrão do erro por cm percorrido por roda
+                        (0.05 = 5%)
+            clock: relógio (hardware.clock, None = relógio real)
+        """
+        self.model = model
+        self.slip_noise = slip_noise
+        self.clock = clock or REAL_CLOCK
+
+        self.reset()
+
+    def reset(self, x=0.0, y=0.0, theta=0.0):
+        """Reinicia a pose (incerteza zerada)"""
+        self.x = x
+        self.y = y
+        self.theta = theta
+        self.covariance = np.zeros((3, 3))
+        self.distance = 0.0  # Distância total percorrida (cm)
+
+        self._left_duty = 0
+        self._right_duty = 0
+        self._last_update = self.clock.now()
+
+    def update(self, left_duty, right_duty):
+        """
+        Integra o intervalo desde a última chamada e registra novos duties.
+
+        Os duties informados valem a partir de agora; o intervalo que
+        terminou é integrado com os duties da chamada anterior.
+
+        Args:
+            left_duty: duty aplicado na roda esquerda (-100 a 100)
+            right_duty: duty aplicado na roda direita (-100 a 100)
+        """
+        now = self.clock.now()
+        dt = now - self._last_update
+        self._last_update = now
+
+        if dt > 0 and (self._left_duty or self._right_duty):
+            self._integrate(self._left_duty, self._right_duty, dt)
+
+        self._left_duty = left_duty
+        self._right_duty = right_duty
+
+    def _integrate(self, left_duty, right_duty, dt):
+        """Avança a pose e a covariância por dt com duties constantes"""
+        d_left = self.model.wheel_speed(left_duty) * dt
+        d_right = self.model.wheel_speed(right_duty) * dt
+        wheel_base = self.model.wheel_base
+
+        d = (d_left + d_right) / 2.0
+        d_theta = (d_right - d_left) / wheel_base
+
+        # Arco exato (ou reta quando d_theta ~ 0)
+        theta_mid = self.theta + d_theta / 2.0
+        if abs(d_theta) < 1e-9:
+            dx = d * math.cos(self.theta)
+            dy = d * math.sin(self.theta)
+        else:
+            chord = 2.0 * d / d_theta * math.sin(d_theta / 2.0)
+            dx = chord * math.cos(theta_mid)
+            dy = chord * math.sin(theta_mid)
+
+        # Jacobianos em relação à pose (F) e aos deslocamentos das rodas (G)
+        cos_m = math.cos(theta_mid)
+        sin_m = math.sin(theta_mid)
+        F = np.array([
+            [1.0, 0.0, -d * sin_m],
+            [0.0, 1.0, d * cos_m],
+            [0.0, 0.0, 1.0]
+        ])
+        G = np.array([
+            [0.5 * cos_m + d * sin_m / (2 * wheel_base), 0.5 * cos_m - d * sin_m / (2 * wheel_base)],
+            [0.5 * sin_m - d * cos_m / (2 * wheel_base), 0.5 * sin_m + d * cos_m / (2 * wheel_base)],
+            [-1.0 / wheel_base, 1.0 / wheel_base]
+        ])
+        Q = np.diag([
+            (self.slip_noise * abs(d_left)) ** 2,
+            (self.slip_noise * abs(d_right)) ** 2
+        ])
+        self.covariance = F @ self.covariance @ F.T + G @ Q @ G.T
+
+        self.x += dx
+        self.y += dy
+        self.theta = math.atan2(math.sin(self.theta + d_theta),
+                                math.cos(self.theta + d_theta))
+        self.distance += (abs(d_left) + abs(d_right)) / 2.0
+
+    def get_pose(self):
+        """
+        Returns:
+            tuple: (x cm, y cm, θ rad)
+        """
+        return (self.x, self.y, self.theta)
+
+    def get_uncertainty(self):
+        """
+        Desvio padrão de cada componente da pose.
+
+        Returns:
+            tuple: (σx cm, σy cm, σθ rad)
+        """
+        return tuple(float(math.sqrt(max(0.0, v))) for v in np.diag(self.covariance))
@@ -0,0 +1,270 @@
+"""
+logic/planner.py
+================
+Planejador de cobertura boustrofédica (vai-e-volta) de uma placa
+"""
+
+import math
+
+from logger import get_logger
+
+
+log = get_logger('planner')
+
+
+class Lane:
+    """Uma faixa do plano, no referencial da primeira faixa"""
+
+    def __init__(self, index, offset, forward):
+        self.index = index        # 0 = primeira faixa medida
+        self.offset = offset      # Deslocamento lateral (cm, + = esquerda)
+        self.forward = forward    # True = mesmo sentido da primeira faixa
+
+    def __repr__(self):
+        sentido = "ida" if self.forward else "volta"
+        return f"Lane({self.index}, {self.offset:+.1f}cm, {sentido})"
+
+
+class BoustrophedonPlanner:
+    """
+    Gera e executa um plano de faixas paralelas sobre a placa.
+
+    Fase 1 - observação (robô em modo reativo):
+        Cada perda de placa ao fim de uma faixa é registrada com a pose
+        da odometria. Com duas bordas opostas vistas o planejador
+        conhece o eixo das faixas, o comprimento da placa e para qual
+        lado a placa continua.
+
+    Fase 2 - plano:
+        Faixas espaçadas pela largura das vassouras. Se panel_width for
+        conhecido o número de faixas é fixo; senão o plano termina
+        quando o robô não encontra placa ao iniciar a próxima faixa.
+        Cada troca de faixa é um U-turn em arco de raio uturn_radius(),
+        executado pelo Robot como primitivas 'arc' do MotionExecutor.
+    """
+
+    def __init__(self, model, lane_spacing, speed, panel_width=None,
+                 coverage_target=None):
+        """
+        Args:
+            model: DifferentialDriveModel calibrado
+            lane_spacing: distância entre faixas (cm) = largura das vassouras
+            speed: duty usado nas trocas de faixa (0-100)
+            panel_width: largura da placa na direção das trocas (cm),
+                         None = descobrir pela borda lateral
+            coverage_target: fração da placa coberta que encerra antes
+                             (None = só pelo plano); só com panel_width -
+                             sem ela a placa conhecida são as faixas já
+                             feitas e a fração seria alta desde o início
+        """
+        self.model = model
+        self.lane_spacing = lane_spacing
+        self.speed = speed
+        self.panel_width = panel_width
+        self.coverage_target = coverage_target
+
+        self.edges = []         # Poses (x, y, θ) das bordas de fim de faixa
+        self.lanes = []         # Plano gerado
+        self.lane_index = 0     # Faixa atual no plano
+        self.axis = None        # (origem x, origem y, θ) da primeira faixa
+        self.side = 0           # +1 = placa continua à esquerda, -1 = direita
+        self.lane_length = None
+        self.complete = False
+
+    # ------------------------------------------------------------------
+    # Observação
+    # ------------------------------------------------------------------
+
+    def has_plan(self):
+        """True quando o plano já foi gerado"""
+        return bool(self.lanes)
+
+    def observe_lane_end(self, pose):
+        """
+        Registra uma borda de fim de faixa (placa perdida andando reto).
+
+        Args:
+            pose: (x, y, θ) da odometria no momento da perda
+        """
+        self.edges.append(pose)
+        if not self.has_plan() and len(self.edges) >= 2:
+            self._build_plan()
+
+    def _make_lane(self, index, first_step):
+        """Faixa index: 0 na origem, 1 no passo medido, depois lane_spacing"""
+        if index == 0:
+            offset = 0.0
+        else:
+            offset = first_step + (index - 1) * self.lane_spacing
+        return Lane(index, self.side * offset, forward=(index % 2 == 0))
+
+    def _to_lane_frame(self, x, y):
+        """Converte ponto da odometria para (ao longo, lateral) da faixa 0"""
+        ox, oy, theta = self.axis
+        dx = x - ox
+        dy = y - oy
+        along = dx * math.cos(theta) + dy * math.sin(theta)
+        lateral = -dx * math.sin(theta) + dy * math.cos(theta)
+        return along, lateral
+
+    def _build_plan(self):
+        """Gera as faixas a partir das duas primeiras bordas opostas"""
+        first, second = self.edges[0], self.edges[1]
+
+        # Eixo das faixas: sentido da primeira faixa, origem na primeira borda
+        self.axis = first
+        along, lateral = self._to_lane_frame(second[0], second[1])
+
+        self.lane_length = abs(along)
+        self.side = 1 if lateral >= 0 else -1
+        first_step = abs(lateral)
+
+        # Faixa 0 terminou na primeira borda, faixa 1 (atual) na segunda.
+        # A partir daqui as trocas usam o espaçamento das vassouras.
+        if self.panel_width is not None:
+            remaining = max(0.0, self.panel_width - self.lane_spacing - first_step)
+            total = 2 + int(math.ceil(remaining / self.lane_spacing))
+        else:
+            total = None
+
+        count = total if total is not None else 2
+        self.lanes = [self._make_lane(i, first_step) for i in range(count)]
+        self.lane_index = 1
+        current = 1
+
+        log.info("[PLANO] Faixas de %.0fcm, espaçamento %.0fcm, lado %s",
+                 self.lane_length, self.lane_spacing,
+                 'ESQUERDA' if self.side > 0 else 'DIREITA')
+        if total is not None:
+            log.info("[PLANO] %d faixas (faltam %d)", total, max(0, total - current - 1))
+        else:
+            log.info("[PLANO] Largura desconhecida: continua até achar a borda lateral")
+
+    # ------------------------------------------------------------------
+    # Execução
+    # ------------------------------------------------------------------
+
+    def next_lane(self, coverage_fraction=None):
+        """
+        Avança para a próxima faixa ao fim da atual.
+
+        Args:
+            coverage_fraction: fração da placa coberta
+                               (CoverageMap.coverage_fraction, para encerrar cedo)
+
+        Returns:
+            Lane, ou None se a placa terminou
+        """
+        if (self.coverage_target is not None and self.panel_width is not None
+                and coverage_fraction is not None
+                and coverage_fraction >= self.coverage_target):
+            log.info("[PLANO] Cobertura %.0f%% atingida", coverage_fraction * 100)
+            self.complete = True
+            return None
+
+        self.lane_index += 1
+
+        if self.lane_index >= len(self.lanes):
+            if self.panel_width is not None:
+                self.complete = True
+                return None
+            # Largura desconhecida: estender o plano uma faixa
+            first_step = abs(self.lanes[1].offset)
+            self.lanes.append(self._make_lane(self.lane_index, first_step))
+
+        return self.lanes[self.lane_index]
+
+    def panel_bounds(self):
+        """
+        Retângulo da placa conhecido pelo plano, no referencial das faixas.
+
+        Comprimento entre as duas bordas observadas; largura de
+        panel_width ou, sem ela, até a faixa atual (as seguintes ainda
+        não acharam placa).
+
+        Returns:
+            tuple: (eixo (x, y, θ), (início, fim) ao longo, (início, fim)
+                   lateral) ou None sem plano
+        """
+        if not self.has_plan():
+            return None
+        half = self.lane_spacing / 2.0
+        if self.panel_width is not None:
+            width = self.panel_width
+        else:
+            lanes = self.lanes[:self.lane_index + 1]
+            width = max(abs(lane.offset) for lane in lanes) + self.lane_spacing
+        lateral = (-half, width - half) if self.side > 0 else (half - width, half)
+        return self.axis, (-self.lane_length, 0.0), lateral
+
+    def turn_direction(self, heading):
+        """
+        Lado do U-turn para avançar em direção ao lado da placa.
+
+        Args:
+            heading: θ atual do robô (rad)
+
+        Returns:
+            str: 'left' ou 'right'
+        """
+        forward = math.cos(heading - self.axis[2]) >= 0
+        toward_left = (self.side > 0) == forward
+        return 'left' if toward_left else 'right'
+
+    def uturn_radius(self):
+        """Raio do U-turn entre faixas (cm): metade do espaçamento"""
+        return self.lane_spacing / 2.0
+
+
+# ==================== COMPARAÇÃO ====================
+
+def estimate_completion_time(model, panel_length, panel_width, lane_spacing,
+                             lane_speed, maneuver_time):
+    """
+    Tempo para cobrir uma placa com faixas paralelas.
+
+    Args:
+        model: DifferentialDriveModel calibrado
+        panel_length: comprimento das faixas (cm)
+        panel_width: largura a cobrir (cm)
+        lane_spacing: deslocamento lateral por faixa (cm)
+        lane_speed: duty ao percorrer a faixa
+        maneuver_time: tempo de uma troca de faixa (s)
+
+    Returns:
+        tuple: (tempo total s, número de faixas)
+    """
+    lanes = int(math.ceil(panel_width / lane_spacing))
+    lane_time = model.distance_time(panel_length, lane_speed)
+    return lanes * lane_time + (lanes - 1) * maneuver_time, lanes
+
+
+if __name__ == "__main__":
+    from .kinematics import DifferentialDriveModel
+    from config import (TURN_90_TIME, SIDEWAYS_TIME, SEARCH_SPEED, SCAN_SPEED,
+                        WHEEL_BASE, COVERAGE_CONFIG)
+
+    PANEL_LENGTH = 165  # cm (placa 60 células típica)
+    PANEL_WIDTH = 99    # cm
+
+    model = DifferentialDriveModel(WHEEL_BASE, TURN_90_TIME, SEARCH_SPEED)
+
+    # Reativo: gira 90°, pausa, verifica, anda lateral, pausa, gira 90°, pausa
+    reactive_step = model.drive_distance(SIDEWAYS_TIME, SEARCH_SPEED)
+    reactive_maneuver = 2 * TURN_90_TIME + SIDEWAYS_TIME + 0.3 + 0.3 + 0.2 + 0.2
+
+    # Planejado: U-turn em arco com espaçamento = largura das vassouras
+    spacing = COVERAGE_CONFIG['brush_size'][1]
+    planned_maneuver = model.arc_time(spacing / 2.0, 180, SEARCH_SPEED) + 0.2
+
+    print("\n" + "="*60)
+    print("COMPARAÇÃO: MANOBRA REATIVA x PLANO BOUSTROFÉDICO")
+    print("="*60)
+    print(f"Placa: {PANEL_LENGTH}x{PANEL_WIDTH}cm | Faixa a {SCAN_SPEED}%")
+
+    for name, step, maneuver in (("Reativo", reactive_step, reactive_maneuver),
+                                 ("Planejado", spacing, planned_maneuver)):
+        total, lanes = estimate_completion_time(
+            model, PANEL_LENGTH, PANEL_WIDTH, step, SCAN_SPEED, maneuver)
+        print(f"  {name:10s} | passo {step:5.1f}cm | {lanes:3d} faixas | "
+              f"manobra {maneuver:4.1f}s | total {total/60:6.1f} min")
@@ -4,10 +4,48 @@ logic/robot.py
 Classe principal que coordena todo o robô
 """
 
-import time
-from turtle import distance
+from collections import deque
+
 from .states import RobotState, TurnDirection, RepositionStep
-from hardware import L298NController, BrushController, UltrasonicSensor, CameraVision
+from .kinematics import DifferentialDriveModel
+from .motion import MotionExecutor
+from .odometry import Odometry
+from .coverage import CoverageMap
+from .planner import BoustrophedonPlanner
+from .brush_policy import BrushPolicy, BrushScheduler, HOLD_REASONS
+from .scheduler import CyclicExecutive
+from .fsm import StateMachine, State, EXIT
+from hardware import (L298NController, BrushController, BrushState, UltrasonicSensor,
+                      CameraVision)
+from hardware.clock import REAL_CLOCK
+from logger import get_logger, DEBUG
+import metrics
+from telemetry import (FLAG_ON_PANEL, FLAG_BRUSHING, FLAG_DIRT, FLAG_MOTION_BUSY,
+                       FLAG_PLANNED, FLAG_SERVO_DOWN)
+
+
+log = get_logger('robot')
+
+# Intervalo mínimo entre linhas de status (s)
+STATUS_LOG_INTERVAL = 0.5
+
+# Vassouras na linha de status
+BRUSH_STATUS = {
+    BrushState.RAISED: "[OFF]",
+    BrushState.LOWERING: "[ABAIXANDO]",
+    BrushState.RUNNING: "[LIMPANDO]",
+    BrushState.STOPPING: "[LEVANTANDO]",
+}
+
+
+# Taxas padrão do executivo cíclico (máquina de estados: loop_period)
+DEFAULT_SCHEDULER = {
+    'sensor_hz': 50,
+    'vision_hz': 1,
+    'status_hz': 2,
+    'sensor_median': 3,
+    'overrun_policy': 'skip'
+}
 
 
 class Robot:
@@ -26,7 +64,14 @@ class Robot:
     
     def __init__(self, motor_pins, brush_pins, servo_pin, ultrasonic_pins, 
                  panel_distance=15, search_speed=50, scan_speed=40,
-                 vision_check_interval=15, turn_90_time=2.6, sideways_time=0.7):
+                 vision_check_interval=15, turn_90_time=2.6, sideways_time=0.7,
+                 wheel_base=20, use_arc_uturn=False, motor_acceleration=None,
+                 motor_deceleration=None, motor_ramp_thread=False,
+                 odometry_slip_noise=0.05, coverage_config=None,
+                 planner_config=None, motors=None, brushes=None,
+                 ultrasonic=None, camera=None, clock=None, loop_period=0.1,
+                 scheduler_config=None, recorder=None, servo_config=None,
+                 brush_config=None):
         """
         Inicializa o robô completo.
 
@@ -41,36 +86,124 @@ class Robot:
             vision_check_interval: intervalo entre verificações de visão (s)
             turn_90_time: tempo para virar 90 graus (s)
             sideways_time: tempo andando para o lado (s)
+            wheel_base: distância entre as rodas (cm)
+            use_arc_uturn: troca de faixa em arco contínuo (U-turn)
+                           em vez de girar/parar/andar/girar
+            motor_acceleration: rampa de aceleração (%/s), None = sem rampa
+            motor_deceleration: rampa de desaceleração (%/s)
+            motor_ramp_thread: rampa gerada por thread (senão pelo loop)
+            odometry_slip_noise: erro relativo por roda na odometria (0.05 = 5%)
+            coverage_config: dict com argumentos do CoverageMap
+                             (None = valores padrão)
+            planner_config: dict do planejador boustrofédico
+                {'enabled', 'lane_spacing', 'panel_width', 'coverage_target'}
+                (None = desativado, só manobras reativas)
+            motors, brushes, ultrasonic, camera: componentes já criados
+                (ex: drivers simulados); None = criar o hardware real
+            clock: relógio de todo o robô (hardware.clock); None = real.
+                   Com VirtualClock a missão roda mais rápido que o real
+            loop_period: período da máquina de estados em start() (s)
+            scheduler_config: dict das demais taxas do executivo cíclico
+                {'sensor_hz', 'vision_hz', 'status_hz', 'sensor_median',
+                 'overrun_policy'}
+            recorder: telemetry.FlightRecorder (registro por iteração da
+                      máquina de estados), None = sem gravação
+            servo_config: dict do servo das vassouras {'speed', 'margin',
+                          'hold'} (None = padrões do ServoController)
+            brush_config: dict das vassouras {'speed' (duty máximo),
+                'activation_delay', 'auto_activate', 'curve',
+                'on_threshold', 'off_threshold', 'smoothing',
+                'min_on_time', 'min_off_time', 'trail_distance'}
+                (None = padrões do BrushPolicy/BrushScheduler, duty máximo 50)
         """
         print("Inicializando robô de limpeza de placas solares...")
         
+        self.clock = clock or REAL_CLOCK
+        
         # Inicializar componentes
-        self.motors = L298NController(motor_pins)
-        self.brushes = BrushController(brush_pins, servo_pin, brush_speed=50)
-        self.ultrasonic = UltrasonicSensor(
+        self.motors = motors or L298NController(
+            motor_pins,
+            wheel_base=wheel_base,
+            acceleration=motor_acceleration,
+            deceleration=motor_deceleration,
+            ramp_thread=motor_ramp_thread,
+            clock=self.clock
+        )
+        brush_config = brush_config or {}
+        self.brushes = brushes or BrushController(brush_pins, servo_pin,
+                                                  brush_speed=brush_config.get('speed', 50),
+                                                  clock=self.clock,
+                                                  servo_config=servo_config)
+        self.ultrasonic = ultrasonic or UltrasonicSensor(
             ultrasonic_pins['trigger'], 
-            ultrasonic_pins['echo']
+            ultrasonic_pins['echo'],
+            clock=self.clock
         )
-        self.camera = CameraVision()
+        self.camera = camera or CameraVision(clock=self.clock)
         
-        # Estado e controle
-        self.state = RobotState.INITIAL_SEARCH
+        # Executor de movimentos temporizados (manobras sem sleep)
+        self.motion = MotionExecutor(self.motors, clock=self.clock)
+        
+        # Estado e controle (tabela de estados: _build_state_machines)
         self.running = False
         
         # Parâmetros
         self.panel_distance = panel_distance
         self.search_speed = search_speed
         self.scan_speed = scan_speed
-        self.brush_activation_delay = 0.2
+        self.brush_activation_delay = brush_config.get('activation_delay', 0.2)
+        
+        # Potência das vassouras e velocidade pela sujeira (com histerese)
+        self.brush_policy = BrushPolicy(
+            brush_config.get('speed', 50), scan_speed,
+            **{key: brush_config[key] for key in ('curve', 'on_threshold', 'off_threshold',
+                                                  'smoothing', 'auto_activate')
+               if key in brush_config})
+        # Quando ligar/desligar: tempos mínimos, rastro após a sujeira
+        self.brush_scheduler = BrushScheduler(
+            self.clock,
+            **{key: brush_config[key] for key in ('min_on_time', 'min_off_time',
+                                                  'trail_distance')
+               if key in brush_config})
         
         # Parâmetros de manobra
         self.turn_90_time = turn_90_time
         self.sideways_time = sideways_time
+        self.sideways_duration = sideways_time
+        
+        # U-turn em arco: raio = metade da largura da faixa
+        # (mesma largura percorrida em sideways_time a search_speed)
+        self.use_arc_uturn = use_arc_uturn
+        self.kinematics = DifferentialDriveModel(wheel_base, turn_90_time, search_speed)
+        lane_width = self.kinematics.drive_distance(sideways_time, search_speed)
+        self.uturn_radius = lane_width / 2.0
+        self.arc_90_time = self.kinematics.arc_time(self.uturn_radius, 90, search_speed)
+        
+        # Odometria: pose estimada a partir dos comandos dos motores
+        self.odometry = Odometry(self.kinematics, slip_noise=odometry_slip_noise,
+                                 clock=self.clock)
+        
+        # Mapa de cobertura (área visitada / limpa / suja)
+        self.coverage = CoverageMap(**(coverage_config or {}))
+        
+        # Planejador de faixas (assume após ver duas bordas opostas)
+        self.planner = None
+        if planner_config and planner_config.get('enabled'):
+            self.planner = BoustrophedonPlanner(
+                self.kinematics,
+                lane_spacing=planner_config['lane_spacing'],
+                speed=search_speed,
+                panel_width=planner_config.get('panel_width'),
+                coverage_target=planner_config.get('coverage_target')
+            )
+        
+        # Arco da manobra em curso (reativa ou planejada)
+        self.planned_maneuver = False
+        self.maneuver_radius = self.uturn_radius
+        self.maneuver_arc_time = self.arc_90_time
         
         # Estado da manobra de reposicionamento
-        self.reposition_step = RepositionStep.FIRST_TURN_90
         self.turn_direction = TurnDirection.LEFT  # Começa virando à esquerda
-        self.step_start_time = 0
         self.scenario_b_active = False
         
         # NOVO: Contador de falhas para filtrar interferências
@@ -79,8 +212,49 @@ class Robot:
 
         # Controle de intervalo de visão
         self.vision_check_interval = vision_check_interval
-        self.last_vision_check = 0
+        self.last_vision_check = float('-inf')  # Verificar na primeira vez
         self.dirt_detected = False
+        self.dirt_probability = 0.0
+        self.vision_result = None   # Resultado ainda não gravado na telemetria
+        self.vision_probability = None
+        
+        # Última leitura do sensor (tarefa de sensores); mediana das
+        # últimas leituras quando o sensor roda mais rápido que os estados
+        self.distance = float('inf')
+        self.on_panel = False
+        self.readings = deque(maxlen=1)
+        
+        # Executivo cíclico: cada parte do loop na sua taxa
+        self.loop_period = loop_period
+        self.scheduler_config = dict(DEFAULT_SCHEDULER, **(scheduler_config or {}))
+        self.executive = None
+        
+        # Máquinas de estados (tabelas validadas aqui, na inicialização)
+        self.fsm, self.steps = self._build_state_machines()
+        
+        # Gravador de voo
+        self.recorder = recorder
+        
+        # Métricas (objetos nulos com metrics desligado); o resto é lido
+        # do próprio robô na hora da exposição
+        self._metrics = metrics.enabled()
+        self.m_tick = metrics.histogram('robot_state_tick_seconds',
+                                        "Duração de uma iteração da máquina de estados")
+        for state in RobotState:
+            metrics.gauge('robot_state', "Estado atual (1 = estado corrente)",
+                          fn=lambda s=state: int(self.state == s), state=state.value)
+            metrics.counter('robot_state_entries_total', "Entradas em cada estado",
+                            fn=lambda s=state: self.fsm.visits[s], state=state.value)
+        metrics.gauge('robot_distance_cm', "Distância usada pela máquina de estados",
+                      fn=lambda: self.distance)
+        metrics.gauge('robot_panel_lost_count', "Contador do filtro anti-interferência",
+                      fn=lambda: self.panel_lost_count)
+        metrics.counter('brush_toggles_total', "Trocas liga/desliga das vassouras",
+                        fn=lambda: self.brush_scheduler.toggles)
+        for reason in HOLD_REASONS:
+            metrics.counter('brush_toggles_held_total',
+                            "Trocas pedidas e seguradas pelo escalonador das vassouras",
+                            fn=lambda r=reason: self.brush_scheduler.held[r], reason=reason)
         
         print("Robô inicializado!")
         print(f"  - Distância da placa: {panel_distance}cm")
@@ -88,8 +262,86 @@ class Robot:
         print(f"  - Velocidade de escaneamento: {scan_speed}%")
         print(f"  - Tempo de curva 90°: {turn_90_time}s")
         print(f"  - Tempo lateral (largura robô): {sideways_time}s")
+        if use_arc_uturn:
+            print(f"  - U-turn em arco: raio {self.uturn_radius:.1f}cm, "
+                  f"{self.arc_90_time:.2f}s por 90°")
         print(f"  - Filtro anti-interferência: {self.panel_lost_threshold} leituras")
     
+    def _build_state_machines(self):
+        """
+        Tabelas de estados do robô e dos passos da manobra.
+        
+        Returns:
+            tuple: (StateMachine dos estados, StateMachine dos passos)
+        
+        Raises:
+            ValueError: tabela inválida (ver logic/fsm.py)
+        """
+        fsm = StateMachine('robô', {
+            RobotState.INITIAL_SEARCH: State(
+                self._state_initial_search,
+                targets=(RobotState.MOVING_TO_TARGET,)),
+            RobotState.MOVING_TO_TARGET: State(
+                self._state_moving_on_panel,
+                targets=(RobotState.REPOSITIONING,)),
+            RobotState.REPOSITIONING: State(
+                self._state_repositioning,
+                targets=(RobotState.MOVING_TO_TARGET, RobotState.STOPPED)),
+            RobotState.STOPPED: State(self._state_stopped),
+        }, initial=RobotState.INITIAL_SEARCH, clock=self.clock)
+        
+        # Ociosa fora do REPOSITIONING; entra pelo arco ou pelo giro
+        steps = StateMachine('manobra', {
+            RepositionStep.ARC_FIRST_90: State(
+                self._step_arc_first_90, self._enter_arc_first_90,
+                targets=(RepositionStep.ARC_FINAL_90, RepositionStep.TURN_180_BACK)),
+            RepositionStep.ARC_FINAL_90: State(
+                self._step_arc_final_90, self._enter_arc_final_90,
+                targets=(EXIT,)),
+            RepositionStep.FIRST_TURN_90: State(
+                self._step_first_turn_90, self._enter_first_turn_90,
+                targets=(RepositionStep.CHECK_PANEL,)),
+            RepositionStep.CHECK_PANEL: State(
+                self._step_check_panel, self._enter_check_panel,
+                targets=(RepositionStep.MOVING_SIDEWAYS, RepositionStep.TURN_180_BACK)),
+            RepositionStep.TURN_180_BACK: State(
+                self._step_turn_180_back, self._enter_turn_180_back,
+                targets=(RepositionStep.MOVING_SIDEWAYS,)),
+            RepositionStep.MOVING_SIDEWAYS: State(
+                self._step_moving_sideways, self._enter_moving_sideways,
+                targets=(RepositionStep.FINAL_TURN_90,)),
+            RepositionStep.FINAL_TURN_90: State(
+                self._step_final_turn_90, self._enter_final_turn_90,
+                targets=(EXIT,)),
+        }, entries=(RepositionStep.ARC_FIRST_90, RepositionStep.FIRST_TURN_90),
+           clock=self.clock)
+        
+        return fsm, steps
+    
+    @property
+    def state(self):
+        """RobotState atual"""
+        return self.fsm.current
+    
+    @property
+    def reposition_step(self):
+        """RepositionStep atual (None fora de uma manobra)"""
+        return self.steps.current
+    
+    def timing_report(self):
+        """
+        Tempo gasto em cada estado e em cada passo de manobra (e em cada
+        etapa da visão, se a câmera mede).
+        
+        Returns:
+            str: texto multi-linha
+        """
+        report = self.fsm.report() + "\n" + self.steps.report()
+        profiler = getattr(self.camera, 'profiler', None)
+        if profiler is not None and profiler.samples:
+            report += "\nTempo por etapa da visão:\n" + profiler.report()
+        return report
+    
     def start(self):
         """Inicia o robô e entra no loop principal"""
         self.running = True
@@ -107,61 +359,225 @@ class Robot:
         print("  4. Se não achar: repete invertendo lado")
         print("\nPressione Ctrl+C para parar\n")
         
+        self.executive = self._build_executive()
         try:
-            while self.running:
-                self.main_loop()
-                time.sleep(0.1)
+            self.executive.run(lambda: self.running)
                 
         except KeyboardInterrupt:
             print("\n\nParando robô...")
         finally:
+            # Atuadores primeiro: nada de relatório/log antes de parar
             self.stop()
+            print(self.executive.report())
+            print(self.timing_report())
+    
+    def _build_executive(self):
+        """
+        Executivo cíclico com as tarefas do robô.
+        
+        Ordem de cadastro = prioridade no empate: sensores primeiro,
+        para a máquina de estados decidir com a leitura mais recente.
+        """
+        config = self.scheduler_config
+        policy = config['overrun_policy']
+        
+        # Sensor sobreamostrado: a mediana descarta leituras espúrias
+        # isoladas (timeout do eco = 400cm) sem atrasar a máquina de estados
+        self.readings = deque(maxlen=config['sensor_median'])
+        
+        executive = CyclicExecutive(self.clock)
+        executive.add_task('sensores', config['sensor_hz'], self._sense, policy)
+        executive.add_task('estados', 1.0 / self.loop_period, self._step_state_machine, policy)
+        executive.add_task('visão', config['vision_hz'], self._vision_tick, policy)
+        executive.add_task('status', config['status_hz'], self._print_status, policy)
+        
+        for task in executive.tasks:
+            metrics.counter('scheduler_task_runs_total', "Execuções de cada tarefa do executivo",
+                            fn=lambda t=task: t.runs, task=task.name)
+            metrics.counter('scheduler_task_overruns_total', "Execuções que passaram do período",
+                            fn=lambda t=task: t.overruns, task=task.name)
+            metrics.counter('scheduler_task_skipped_total', "Liberações puladas (política skip)",
+                            fn=lambda t=task: t.skipped, task=task.name)
+        return executive
     
     def main_loop(self):
-        """Loop principal - executado a cada 100ms (10Hz)"""
+        """
+        Uma iteração completa em taxa única (todas as tarefas em sequência).
+        
+        start() usa o executivo cíclico; main_loop() serve a quem avança
+        o robô passo a passo (simulador, replay, testes).
+        """
+        self._sense()
+        self._step_state_machine()
+        self._vision_tick()
+        self._print_status()
+    
+    def _sense(self):
+        """Tarefa de sensores: lê o sensor, avança movimentos e a pose"""
         # Ler sensor ultrassônico (sempre)
-        distance_to_ground = self.ultrasonic.get_distance()
+        self.readings.append(self.ultrasonic.get_distance())
+        self.distance = sorted(self.readings)[len(self.readings) // 2]
         
         # Verificar se está sobre a placa solar
-        on_panel = distance_to_ground <= self.panel_distance
+        self.on_panel = self.distance <= self.panel_distance
+        
+        # Avançar movimentos temporizados (manobras / estabilização)
+        # e a sequência das vassouras (servo descendo/subindo)
+        self.motion.update()
+        self.brushes.update()
+        self.motors.update()  # Rampas de velocidade
+        
+        # Odometria: integra o intervalo anterior e registra os duties
+        # que valem a partir de agora
+        self.odometry.update(*self.motors.get_wheel_speeds())
+        self.coverage.update(
+            self.odometry.get_pose(),
+            brushing=self.on_panel and self.brushes.is_running(),
+            on_panel=self.on_panel
+        )
+    
+    def _step_state_machine(self):
+        """Tarefa da máquina de estados (usa a última leitura do sensor)"""
+        on_panel = self.on_panel
+        distance_to_ground = self.distance
+        tick_start = self.clock.now()
+        
+        # Máquina de estados principal (handler da tabela)
+        self.fsm.dispatch(on_panel, distance_to_ground)
+        
+        # Registrar os duties comandados nesta iteração
+        self.odometry.update(*self.motors.get_wheel_speeds())
+        
+        if self.recorder is not None or self._metrics:
+            tick_time = self.clock.now() - tick_start
+            self.m_tick.observe(tick_time)
+            if self.recorder is not None:
+                self._record_tick(tick_time)
+    
+    def _record_tick(self, tick_time):
+        """Grava o registro de telemetria desta iteração"""
+        left, right = self.motors.get_wheel_speeds()
+        x, y, theta = self.odometry.get_pose()
+        brushing = self.brushes.is_running()
+        servo = getattr(self.brushes, 'servo', None)
+        servo_down = servo.is_down() if servo is not None else brushing
+        
+        flags = ((FLAG_ON_PANEL if self.on_panel else 0)
+                 | (FLAG_BRUSHING if brushing else 0)
+                 | (FLAG_DIRT if self.dirt_detected else 0)
+                 | (FLAG_MOTION_BUSY if self.motion.is_busy() else 0)
+                 | (FLAG_PLANNED if self.planned_maneuver else 0)
+                 | (FLAG_SERVO_DOWN if servo_down else 0))
+        
+        self.recorder.record(
+            self.clock.now(), self.state, self.reposition_step, flags,
+            self.vision_result, left, right, self.panel_lost_count,
+            self.brushes.brush_speed,
+            self.readings[-1] if self.readings else self.distance, self.distance,
+            x, y, theta, tick_time, self.vision_probability
+        )
+        self.vision_result = None
+        self.vision_probability = None
+    
+    def _vision_tick(self):
+        """
+        Tarefa de visão: dispara a câmera quando o intervalo venceu.
+        
+        Só sobre a placa, andando (fora de manobras e estabilizações).
+        """
+        if (self.state != RobotState.MOVING_TO_TARGET or self.motion.is_busy()
+                or not self.on_panel):
+            return
+        
+        current_time = self.clock.now()
+        if current_time - self.last_vision_check < self.vision_check_interval:
+            return
+        
+        log.debug("\n[%ss] Verificando visão...", self.vision_check_interval)
+        self.dirt_detected = self.camera.detect_target()
+        # Probabilidade do classificador (câmeras sem ela: 0 ou 1)
+        probability = getattr(self.camera, 'last_probability', None)
+        if probability is None:
+            probability = 1.0 if self.dirt_detected else 0.0
+        self.dirt_probability = probability
+        if self.brush_policy.update(probability):
+            # Rastro das vassouras medido desde esta captura
+            self.brush_scheduler.dirty_reading(self.odometry.distance)
+        self.vision_result = self.dirt_detected
+        self.vision_probability = probability
+        self.last_vision_check = current_time
+        self.coverage.update_dirt(self.odometry.get_pose(), probability)
+        
+        if self.dirt_detected:
+            log.info("   >>> SUJEIRA DETECTADA! Limpando... (p=%.2f, nível %.2f)",
+                     probability, self.brush_policy.level)
+        else:
+            log.info("   >>> Placa limpa. Continuando... (p=%.2f, nível %.2f)",
+                     probability, self.brush_policy.level)
+    
+    def _print_status(self):
+        """
+        Tarefa de status: uma linha com o estado atual.
+        
+        Nível DEBUG e no máximo uma linha a cada STATUS_LOG_INTERVAL s
+        (main_loop chama a cada iteração); desligado, não monta nada.
+        """
+        if not log.is_enabled(DEBUG):
+            return
+        distance = self.distance
         
-        # Máquina de estados principal
         if self.state == RobotState.INITIAL_SEARCH:
-            # Busca inicial: girando procurando placa
-            self._state_initial_search(on_panel, distance_to_ground)
+            log.debug("[BUSCA INICIAL] Girando... | Dist: %5.1fcm", distance,
+                      key='status', every=STATUS_LOG_INTERVAL)
         
         elif self.state == RobotState.MOVING_TO_TARGET:
-            # Sobre a placa: limpando
-            self._state_moving_on_panel(on_panel, distance_to_ground)
+            brush = BRUSH_STATUS[self.brushes.state]
+            dirt = "[SUJEIRA]" if self.dirt_detected else "[Limpo]"
+            since_check = self.clock.now() - self.last_vision_check
+            next_check = max(0, self.vision_check_interval - since_check)
+            fail_status = (f" | Falhas:{self.panel_lost_count}/{self.panel_lost_threshold}"
+                           if self.panel_lost_count > 0 else "")
+            
+            log.debug("[PLACA] %s | %s | Vel: %3d%% | Próx: %.1fs | Dist: %5.1fcm%s",
+                      dirt, brush, self.motors.current_speed, next_check, distance,
+                      fail_status, key='status', every=STATUS_LOG_INTERVAL)
         
         elif self.state == RobotState.REPOSITIONING:
-            # Perdeu placa: fazendo manobra
-            self._state_repositioning(on_panel, distance_to_ground)
+            dir_name = "ESQUERDA" if self.turn_direction == TurnDirection.LEFT else "DIREITA"
+            log.debug("[MANOBRA] %-20s | Dir: %-8s | Tempo: %.1fs | Placa: %-3s | Dist: %5.1fcm",
+                      self.reposition_step.value, dir_name, self.steps.elapsed(),
+                      'SIM' if self.on_panel else 'NÃO', distance,
+                      key='status', every=STATUS_LOG_INTERVAL)
     
     def _state_initial_search(self, on_panel, distance):
         """
         INITIAL_SEARCH: Busca inicial girando no próprio eixo.
         """
-        print(f"[BUSCA INICIAL] Girando... | Dist: {distance:5.1f}cm")
-        
         if on_panel:
             # Encontrou placa!
-            print("\n>>> PLACA ENCONTRADA! Iniciando limpeza...")
-            self.motors.stop()
-            time.sleep(0.2)
-            self.state = RobotState.MOVING_TO_TARGET
-            self.last_vision_check = 0  # Verificar visão imediatamente
+            log.info("\n>>> PLACA ENCONTRADA! Iniciando limpeza...")
+            self.motion.settle(0.2)
+            self.motion.update()
+            self.fsm.transition(RobotState.MOVING_TO_TARGET)
+            self.last_vision_check = float('-inf')  # Verificar visão imediatamente
         else:
             # Continua girando
             self.motors.set_speed(self.search_speed)
             self.motors.turn_right()
     
+    def _state_stopped(self, on_panel, distance):
+        """STOPPED: plano concluído, encerrar o loop"""
+        self.running = False
+    
     def _state_moving_on_panel(self, on_panel, distance):
         """
         MOVING_TO_TARGET: Sobre a placa, andando reto e limpando.
         
     Usa contador de falhas para confirmar perda da placa.
         """
+        # Estabilizando após parada: só amostrar
+        if self.motion.is_busy():
+            return
     
         # Sistema anti-interferência: contar falhas consecutivas
         if not on_panel:
@@ -169,69 +585,95 @@ class Robot:
         
             if self.panel_lost_count >= self.panel_lost_threshold:
                 # Confirmado: perdeu placa (3x seguidas)
-                print(f"\n>>> PLACA PERDIDA (confirmado após {self.panel_lost_count} leituras)!")
-                self.motors.stop()
-                time.sleep(0.2)
-                self.state = RobotState.REPOSITIONING
-                self.reposition_step = RepositionStep.FIRST_TURN_90
-                self.step_start_time = time.time()
-                self.scenario_b_active = False
+                log.info("\n>>> PLACA PERDIDA (confirmado após %d leituras)!",
+                         self.panel_lost_count)
                 self.panel_lost_count = 0  # Resetar contador
+                self._start_repositioning()
                 return
             else:
                 # Interferência provável - continuar normalmente
                 if self.panel_lost_count == 1:
-                    print(f"[AVISO] Possível interferência ({self.panel_lost_count}/{self.panel_lost_threshold}) - continuando...")
+                    log.sensor("[AVISO] Possível interferência (%d/%d) - continuando...",
+                               self.panel_lost_count, self.panel_lost_threshold)
         else:
             # Placa detectada - resetar contador de falhas
             if self.panel_lost_count > 0:
-                print(f"[OK] Placa detectada novamente (resetando contador: {self.panel_lost_count}→0)")
+                log.sensor("[OK] Placa detectada novamente (resetando contador: %d→0)",
+                           self.panel_lost_count)
             self.panel_lost_count = 0
-            
 
-        # Está sobre a placa: verificar visão periodicamente
-        current_time = time.time()
-        time_since_last_check = current_time - self.last_vision_check
-        
-        if time_since_last_check >= self.vision_check_interval:
-            # Verificar visão
-            print(f"\n[{self.vision_check_interval}s] Verificando visão...")
-            self.dirt_detected = self.camera.detect_target()
-            self.last_vision_check = current_time
-            
-            if self.dirt_detected:
-                print(f"   >>> SUJEIRA DETECTADA! Limpando...")
-            else:
-                print(f"   >>> Placa limpa. Continuando...")
+        # Visão: resultado mais recente da tarefa de visão (_vision_tick)
         
-        # Controlar vassouras
-        self._control_brushes(self.dirt_detected, on_panel=True)
+        # Controlar vassouras (política: potência pela sujeira estimada)
+        self._control_brushes(self.brush_policy.active, on_panel=True)
         
-        # Ajustar velocidade
-        if self.dirt_detected:
-            speed = self.scan_speed // 3  # Devagar para limpar bem
-        else:
-            speed = self.scan_speed
+        # Ajustar velocidade: mais devagar quanto mais sujo
+        speed = self.brush_policy.drive_speed()
         
         # Andar para frente
         self.motors.set_speed(speed)
         self.motors.move_forward()
+    
+    def _start_repositioning(self):
+        """
+        Inicia a troca de faixa após perder a placa andando reto.
+        
+        Com plano boustrofédico pronto: U-turn em arco para a próxima
+        faixa planejada (ou fim da placa). Senão: manobra reativa.
+        """
+        pose = self.odometry.get_pose()
+        
+        self.fsm.transition(RobotState.REPOSITIONING)
+        self.scenario_b_active = False
+        self.sideways_duration = self.sideways_time
+        self.planned_maneuver = False
+        self.maneuver_radius = self.uturn_radius
+        self.maneuver_arc_time = self.arc_90_time
         
-        # Status - Preparar variáveis de status (definir ANTES de usar)
-        brush = "[LIMPANDO]" if self.brushes.is_running() else "[OFF]"
-        dirt = "[SUJEIRA]" if self.dirt_detected else "[Limpo]"
-        next_check = max(0, self.vision_check_interval - time_since_last_check)
-        fail_status = f" | Falhas:{self.panel_lost_count}/{self.panel_lost_threshold}" if self.panel_lost_count > 0 else ""
-
-        print(f"[PLACA] {dirt} | {brush} | "
-            f"Vel: {speed:3d}% | Próx: {next_check:.1f}s | "
-            f"Dist: {distance:5.1f}cm{fail_status}")
-        '''
-        print(f"[PLACA] {dirt_status} | {brush_status} | "
-              f"Vel: {speed:3d}% | Próx: {time_until_next:.1f}s | "
-              f"Dist: {distance:5.1f}cm")
-        '''
-              
+        if self.planner is not None:
+            self.planner.observe_lane_end(pose)
+        
+        if self.planner is not None and self.planner.has_plan():
+            self._update_panel_area()
+            lane = self.planner.next_lane(self.coverage.coverage_fraction())
+            if lane is None:
+                self._finish_mission()
+                return
+            
+            log.info("[PLANO] Próxima faixa: %d%s (lateral %+.0fcm)", lane.index + 1,
+                     '/' + str(len(self.planner.lanes)) if self.planner.panel_width else '',
+                     lane.offset)
+            self.planned_maneuver = True
+            self.turn_direction = TurnDirection(self.planner.turn_direction(pose[2]))
+            self.maneuver_radius = self.planner.uturn_radius()
+            self.maneuver_arc_time = self.kinematics.arc_time(
+                self.maneuver_radius, 90, self.search_speed)
+        
+        # Parar e iniciar manobra (estabilização não bloqueante)
+        self.motion.settle(0.2)
+        if self.use_arc_uturn or self.planned_maneuver:
+            self._enter_reposition_step(RepositionStep.ARC_FIRST_90)
+        else:
+            self._enter_reposition_step(RepositionStep.FIRST_TURN_90)
+    
+    def _update_panel_area(self):
+        """Placa do mapa de cobertura = retângulo das bordas do plano"""
+        self.coverage.set_panel(*self.planner.panel_bounds())
+    
+    def _finish_mission(self):
+        """Plano concluído: para tudo e entra em STOPPED"""
+        log.info("\n>>> PLACA CONCLUÍDA!")
+        log.info("    Cobertura: %.0f%% visitada, %.0f%% limpa",
+                 self.coverage.coverage_fraction() * 100,
+                 self.coverage.coverage_fraction('brushed') * 100)
+        self.motion.cancel()
+        self.brush_scheduler.halt()
+        log.info("    Vassouras: %d trocas, %d evitadas",
+                 self.brush_scheduler.toggles, self.brush_scheduler.avoided())
+        self.brushes.request_stop()
+        self.steps.halt()
+        self.fsm.transition(RobotState.STOPPED)
+    
     def _state_repositioning(self, on_panel, distance):
         """
         Estado REPOSITIONING: Manobra quando perde a placa.
@@ -257,223 +699,282 @@ class Robot:
         6. MANTÉM status (próxima vez tenta mesmo lado)
         7. Volta para MOVING_TO_TARGET
         
+        Os passos estão na tabela self.steps: ao entrar em um passo
+        (_enter_*) seus movimentos vão para o MotionExecutor; quando a
+        fila esvazia, o handler do passo (_step_*) decide o próximo -
+        sem sleep, o sensor continua sendo lido a cada iteração.
+        
         Args:
             on_panel: True se sensor detecta placa (distância <= 15cm)
             distance: Distância medida pelo sensor (cm)
         """
-        
-        # Obter tempo decorrido desde início do passo atual
-        current_time = time.time()
-        elapsed = current_time - self.step_start_time
 
+        # Vassouras: estado mantido durante a manobra
+        self._control_brushes(self.brush_policy.active, on_panel, maneuvering=True)
+        
         # Nome da direção para logs
         dir_name = "ESQUERDA" if self.turn_direction == TurnDirection.LEFT else "DIREITA"
 
-        # Log de status
-        print(f"[MANOBRA] {self.reposition_step.value:20s} | "
-              f"Dir: {dir_name:8s} | Tempo: {elapsed:.1f}s | "
-              f"Placa: {'SIM' if on_panel else 'NÃO':3s} | "
-              f"Dist: {distance:5.1f}cm")
-
-        # =========================================================================
-        # PASSO 1: FIRST_TURN_90
-        # Primeiro giro de 90° (esquerda ou direita conforme status)
-        # =========================================================================
-        if self.reposition_step == RepositionStep.FIRST_TURN_90:
-            # Executar giro
-            self._execute_turn(self.turn_direction)
-
-            # Verificar se tempo decorrido >= tempo necessário
-            if elapsed >= self.turn_90_time:
-                print(f"[MANOBRA] Primeiro giro 90° concluído ({dir_name})")
-                self.motors.stop()
-                time.sleep(0.3)  # Pausa para estabilizar
-
-                # Próximo passo: verificar se detecta placa
-                self.reposition_step = RepositionStep.CHECK_PANEL
-                self.step_start_time = time.time()
-
-        # =========================================================================
-        # PASSO 2: CHECK_PANEL
-        # Verificar se ainda detecta placa após virar
-        # =========================================================================
-        elif self.reposition_step == RepositionStep.CHECK_PANEL:
-            # Aguarda um momento para leitura estável do sensor
-            if elapsed >= 0.3:
-
-                # -------------------------------------------------------------
-                # CENÁRIO A: Ainda detecta placa!
-                # -------------------------------------------------------------
-                if on_panel:
-                    print(f"[MANOBRA] >>> CENÁRIO A: Placa detectada após curva!")
-                    print(f"[MANOBRA] Continuando na mesma direção...")
-
-                    # Flag indica que é cenário A
-                    self.scenario_b_active = False
-
-                    # Vai direto para andar lateral
-                    self.reposition_step = RepositionStep.MOVING_SIDEWAYS
-                    self.step_start_time = time.time()
-
-                # -------------------------------------------------------------
-                # CENÁRIO B: Saiu completamente da placa
-                # -------------------------------------------------------------
-                else:
-                    print(f"[MANOBRA] >>> CENÁRIO B: Placa NÃO detectada!")
-                    print(f"[MANOBRA] Virando 180° de volta...")
-
-                    # Flag indica que é cenário B
-                    self.scenario_b_active = True
-
-                    # Precisa virar 180° de volta
-                    self.reposition_step = RepositionStep.TURN_180_BACK
-                    self.step_start_time = time.time()
-
-        # =========================================================================
-        # PASSO 3: TURN_180_BACK
-        # Virar 180° de volta (APENAS no Cenário B)
-        # =========================================================================
-        elif self.reposition_step == RepositionStep.TURN_180_BACK:
-            # Vira para o lado OPOSTO (180° = 2x 90°)
-            # Se virou esquerda antes, agora vira direita
-            opposite_dir = (TurnDirection.RIGHT if self.turn_direction == TurnDirection.LEFT 
-                           else TurnDirection.LEFT)
-
-            self._execute_turn(opposite_dir)
-
-            # 180° = duas curvas de 90°
-            if elapsed >= (self.turn_90_time * 2):
-                print(f"[MANOBRA] Giro 180° concluído (agora indo para lado oposto)")
-                self.motors.stop()
-                time.sleep(0.2)
-
-                # Próximo: andar lateral
-                self.reposition_step = RepositionStep.MOVING_SIDEWAYS
-                self.step_start_time = time.time()
-
-        # =========================================================================
-        # PASSO 4: MOVING_SIDEWAYS
-        # Andar largura do robô (ambos os cenários)
-        # =========================================================================
-        elif self.reposition_step == RepositionStep.MOVING_SIDEWAYS:
-            # Andar para frente
-            self.motors.set_speed(self.search_speed)
-            self.motors.move_forward()
-
-            # Verificar se andou tempo suficiente
-            if elapsed >= self.sideways_time:
-                print(f"[MANOBRA] Deslocamento lateral concluído")
-                self.motors.stop()
-                time.sleep(0.2)
-
-                # Próximo: giro final
-                self.reposition_step = RepositionStep.FINAL_TURN_90
-                self.step_start_time = time.time()
-
-        # =========================================================================
-        # PASSO 5: FINAL_TURN_90
-        # Giro final de 90° (direção depende do cenário)
-        # =========================================================================
-        elif self.reposition_step == RepositionStep.FINAL_TURN_90:
-
-            # -------------------------------------------------------------
-            # DECISÃO: Qual direção girar no giro final?
-            # -------------------------------------------------------------
-            if self.scenario_b_active:
-                # CENÁRIO B: última curva foi para lado oposto
-                # Então gira para esse lado oposto
-                final_dir = (TurnDirection.RIGHT if self.turn_direction == TurnDirection.LEFT 
-                            else TurnDirection.LEFT)
-            else:
-                # CENÁRIO A: mesma direção original
-                final_dir = self.turn_direction
-
-            # Executar giro final
-            self._execute_turn(final_dir)
-
-            # Verificar se completou o giro
-            if elapsed >= self.turn_90_time:
-                print(f"[MANOBRA] Giro final concluído")
-                self.motors.stop()
-                time.sleep(0.2)
-
-                # ---------------------------------------------------------
-                # ATUALIZAR STATUS DA PRÓXIMA CURVA
-                # ---------------------------------------------------------
-                if not self.scenario_b_active:
-                    # =================================================
-                    # CENÁRIO A: INVERTE direção para próxima vez
-                    # =================================================
-                    if self.turn_direction == TurnDirection.LEFT:
-                        self.turn_direction = TurnDirection.RIGHT
-                        print("[MANOBRA] >>> Status atualizado: Próxima curva = DIREITA")
-                    else:
-                        self.turn_direction = TurnDirection.LEFT
-                        print("[MANOBRA] >>> Status atualizado: Próxima curva = ESQUERDA")
-                else:
-                    # =================================================
-                    # CENÁRIO B: MANTÉM direção
-                    # =================================================
-                    print(f"[MANOBRA] >>> Status mantido: Próxima curva = {dir_name}")
-
-                # ---------------------------------------------------------
-                # VOLTAR PARA LIMPEZA
-                # ---------------------------------------------------------
-                print("[MANOBRA] Retornando ao modo de limpeza...")
-                self.state = RobotState.MOVING_TO_TARGET
-                self.last_vision_check = 0  # Forçar verificação de visão
-    
-    # ==============================================================================
-    # MÉTODO AUXILIAR: _execute_turn()
-    # ==============================================================================
-
-    def _execute_turn(self, direction):
-        """
-        Executa curva na direção especificada.
+        # Arco planejado saindo pela borda lateral: não esperar o arco
+        # terminar (o robô passaria da borda), encerrar ao confirmar.
+        # Só conta durante o arco (no recuo o sensor ainda está fora)
+        arcing = self.motion.current is not None and self.motion.current.kind == 'arc'
+        if self.planned_maneuver and arcing and self.reposition_step == RepositionStep.ARC_FIRST_90:
+            self.panel_lost_count = 0 if on_panel else self.panel_lost_count + 1
+            if self.panel_lost_count >= self.panel_lost_threshold:
+                log.info("[PLANO] Borda lateral durante o arco")
+                self.panel_lost_count = 0
+                self._finish_mission()
+                return
 
-        Este método é chamado pelos passos da manobra para virar o robô.
+        # Passo ainda em execução (movimento ou estabilização)
+        if self.motion.is_busy():
+            return
 
-        Args:
-            direction: TurnDirection.LEFT ou TurnDirection.RIGHT
-        """
-        # Definir velocidade
-        self.motors.set_speed(self.search_speed)
+        # Passo concluído: handler do passo decide o próximo
+        self.steps.dispatch(on_panel, dir_name)
 
-        # Executar giro
-        if direction == TurnDirection.LEFT:
-            self.motors.turn_left()
+    # =========================================================================
+    # U-TURN EM ARCO: ARC_FIRST_90 / ARC_FINAL_90
+    # Primeiro quarto do arco; se ainda há placa (cenário A) continua o
+    # arco sem parar. Senão (cenário B) cai na sequência de giros.
+    # =========================================================================
+
+    def _step_arc_first_90(self, on_panel, dir_name):
+        if on_panel:
+            log.info("[MANOBRA] >>> CENÁRIO A: Placa detectada no arco!")
+            log.info("[MANOBRA] Completando U-turn (%s)...", dir_name)
+            self.scenario_b_active = False
+            self._enter_reposition_step(RepositionStep.ARC_FINAL_90)
+        elif self.planned_maneuver:
+            # Plano sem largura conhecida: borda lateral encontrada
+            log.info("[PLANO] Sem placa ao iniciar a faixa: borda lateral")
+            self._finish_mission()
         else:
-            self.motors.turn_right()
+            log.info("[MANOBRA] >>> CENÁRIO B: Placa NÃO detectada no arco!")
+            log.info("[MANOBRA] Virando 180° de volta...")
+            self.scenario_b_active = True
+            # Arco já deslocou meia faixa para o lado errado
+            self.sideways_duration = self.sideways_time * 1.5
+            self._enter_reposition_step(RepositionStep.TURN_180_BACK)
+
+    def _step_arc_final_90(self, on_panel, dir_name):
+        log.info("[MANOBRA] U-turn em arco concluído")
+        self._finish_repositioning(dir_name)
+
+    # =========================================================================
+    # PASSO 1: FIRST_TURN_90
+    # Primeiro giro de 90° (esquerda ou direita conforme status)
+    # =========================================================================
+
+    def _step_first_turn_90(self, on_panel, dir_name):
+        log.info("[MANOBRA] Primeiro giro 90° concluído (%s)", dir_name)
+
+        # Próximo passo: verificar se detecta placa
+        self._enter_reposition_step(RepositionStep.CHECK_PANEL)
+
+    # =========================================================================
+    # PASSO 2: CHECK_PANEL
+    # Verificar se ainda detecta placa após virar
+    # =========================================================================
+
+    def _step_check_panel(self, on_panel, dir_name):
+        # -------------------------------------------------------------
+        # CENÁRIO A: Ainda detecta placa!
+        # -------------------------------------------------------------
+        if on_panel:
+            log.info("[MANOBRA] >>> CENÁRIO A: Placa detectada após curva!")
+            log.info("[MANOBRA] Continuando na mesma direção...")
+
+            # Flag indica que é cenário A
+            self.scenario_b_active = False
+
+            # Vai direto para andar lateral
+            self._enter_reposition_step(RepositionStep.MOVING_SIDEWAYS)
+
+        # -------------------------------------------------------------
+        # CENÁRIO B: Saiu completamente da placa
+        # -------------------------------------------------------------
+        else:
+            log.info("[MANOBRA] >>> CENÁRIO B: Placa NÃO detectada!")
+            log.info("[MANOBRA] Virando 180° de volta...")
 
-    def _execute_turn(self, direction):
-        """Executa curva na direção especificada"""
-        self.motors.set_speed(self.search_speed)
+            # Flag indica que é cenário B
+            self.scenario_b_active = True
+
+            # Precisa virar 180° de volta
+            self._enter_reposition_step(RepositionStep.TURN_180_BACK)
+
+    # =========================================================================
+    # PASSO 3: TURN_180_BACK
+    # Virar 180° de volta (APENAS no Cenário B)
+    # =========================================================================
+
+    def _step_turn_180_back(self, on_panel, dir_name):
+        log.info("[MANOBRA] Giro 180° concluído (agora indo para lado oposto)")
+
+        # Próximo: andar lateral
+        self._enter_reposition_step(RepositionStep.MOVING_SIDEWAYS)
+
+    # =========================================================================
+    # PASSO 4: MOVING_SIDEWAYS
+    # Andar largura do robô (ambos os cenários)
+    # =========================================================================
+
+    def _step_moving_sideways(self, on_panel, dir_name):
+        log.info("[MANOBRA] Deslocamento lateral concluído")
+
+        # Próximo: giro final
+        self._enter_reposition_step(RepositionStep.FINAL_TURN_90)
+
+    # =========================================================================
+    # PASSO 5: FINAL_TURN_90
+    # Giro final de 90° (direção depende do cenário)
+    # =========================================================================
+
+    def _step_final_turn_90(self, on_panel, dir_name):
+        log.info("[MANOBRA] Giro final concluído")
+        self._finish_repositioning(dir_name)
+    
+    def _enter_reposition_step(self, step):
+        """
+        Entra em um passo da manobra (ação de entrada da tabela).
+        
+        Cada movimento termina com uma estabilização ('settle'), que o
+        executor pula se o robô já estiver parado.
+        
+        Args:
+            step: RepositionStep a iniciar
         
-        if direction == TurnDirection.LEFT:
-            self.motors.turn_left()
+        Raises:
+            ValueError: passo não declarado como destino do atual
+        """
+        self.steps.transition(step)
+        
+        # Iniciar o primeiro movimento já nesta iteração
+        self.motion.update()
+    
+    def _opposite_direction(self):
+        """Direção oposta à curva atual (cenário B)"""
+        return (TurnDirection.RIGHT if self.turn_direction == TurnDirection.LEFT 
+                else TurnDirection.LEFT)
+    
+    def _enter_arc_first_90(self):
+        if self.planned_maneuver:
+            # O arco avança um raio antes de virar: recuar esse raio
+            # para o centro do robô não passar da borda da placa
+            back_time = self.kinematics.distance_time(self.maneuver_radius,
+                                                      self.search_speed)
+            self.motion.drive(back_time, -self.search_speed)
+            self.motion.settle(0.2)
+        # Sem parar: a decisão do cenário acontece em movimento
+        self.motion.arc(self.maneuver_radius, self.turn_direction.value,
+                        self.maneuver_arc_time, self.search_speed)
+    
+    def _enter_arc_final_90(self):
+        self.motion.arc(self.maneuver_radius, self.turn_direction.value,
+                        self.maneuver_arc_time, self.search_speed)
+        self.motion.settle(0.2)
+    
+    def _enter_first_turn_90(self):
+        self.motion.turn(self.turn_direction.value, self.turn_90_time, self.search_speed)
+        self.motion.settle(0.3)  # Pausa para estabilizar
+    
+    def _enter_check_panel(self):
+        # Leitura estável do sensor (pulada se já está parado)
+        self.motion.settle(0.3)
+    
+    def _enter_turn_180_back(self):
+        # Vira para o lado OPOSTO (180° = 2x 90°)
+        self.motion.settle(0.2)  # Vindo do arco: parar antes de girar
+        self.motion.turn(self._opposite_direction().value, self.turn_90_time * 2,
+                         self.search_speed)
+        self.motion.settle(0.2)
+    
+    def _enter_moving_sideways(self):
+        self.motion.drive(self.sideways_duration, self.search_speed)
+        self.motion.settle(0.2)
+    
+    def _enter_final_turn_90(self):
+        # CENÁRIO B: última curva foi para lado oposto
+        # CENÁRIO A: mesma direção original
+        final_dir = self._opposite_direction() if self.scenario_b_active else self.turn_direction
+        self.motion.turn(final_dir.value, self.turn_90_time, self.search_speed)
+        self.motion.settle(0.2)
+    
+    def _finish_repositioning(self, dir_name):
+        """
+        Conclui a manobra: atualiza direção da próxima curva e volta a limpar.
+        
+        Args:
+            dir_name: nome da direção atual (para logs)
+        """
+        # ---------------------------------------------------------
+        # ATUALIZAR STATUS DA PRÓXIMA CURVA
+        # ---------------------------------------------------------
+        if self.planned_maneuver:
+            # Plano define o lado de cada U-turn
+            log.info("[PLANO] Faixa %d iniciada", self.planner.lane_index + 1)
+        elif not self.scenario_b_active:
+            # =================================================
+            # CENÁRIO A: INVERTE direção para próxima vez
+            # =================================================
+            if self.turn_direction == TurnDirection.LEFT:
+                self.turn_direction = TurnDirection.RIGHT
+                log.info("[MANOBRA] >>> Status atualizado: Próxima curva = DIREITA")
+            else:
+                self.turn_direction = TurnDirection.LEFT
+                log.info("[MANOBRA] >>> Status atualizado: Próxima curva = ESQUERDA")
         else:
-            self.motors.turn_right()
+            # =================================================
+            # CENÁRIO B: MANTÉM direção
+            # =================================================
+            log.info("[MANOBRA] >>> Status mantido: Próxima curva = %s", dir_name)
+
+        # ---------------------------------------------------------
+        # VOLTAR PARA LIMPEZA
+        # ---------------------------------------------------------
+        log.info("[MANOBRA] Retornando ao modo de limpeza...")
+        self.steps.transition(EXIT)
+        self.fsm.transition(RobotState.MOVING_TO_TARGET)
+        self.last_vision_check = float('-inf')  # Forçar verificação de visão
     
-    def _control_brushes(self, dirt_detected, on_panel):
-        """Controla vassouras baseado na detecção de sujeira"""
-        should_clean = on_panel and dirt_detected
+    def _control_brushes(self, dirt_detected, on_panel, maneuvering=False):
+        """
+        Controla vassouras baseado na detecção de sujeira.
+        
+        Só pede a sequência (abaixar + ligar / desligar + levantar): ela
+        avança em _sense() enquanto o robô continua andando e lendo.
+        O duty vem da política (BrushPolicy) e é ajustado sem parar; o
+        BrushScheduler segura trocas rápidas (tempos mínimos, rastro
+        após a última sujeira, manobras).
+        """
+        should_clean = self.brush_scheduler.decide(
+            on_panel and dirt_detected, self.odometry.distance, maneuvering)
+        
+        # Rastro / tempo mínimo com a política inativa: mantém o duty
+        duty = self.brush_policy.brush_duty()
+        if should_clean and duty and duty != self.brushes.brush_speed:
+            self.brushes.set_speed(duty)
         
-        if should_clean and not self.brushes.is_running():
-            time.sleep(self.brush_activation_delay)
-            self.brushes.start()
-            print("    [VASSOURAS] >>> Ativadas")
+        if should_clean and not self.brushes.is_active():
+            self.brushes.request_start(delay=self.brush_activation_delay)
+            log.info("    [VASSOURAS] >>> Ativando (abaixando)")
         
-        elif not should_clean and self.brushes.is_running():
-            self.brushes.stop()
-            print("    [VASSOURAS] >>> Desativadas")
+        elif not should_clean and self.brushes.is_active():
+            self.brushes.request_stop()
+            log.info("    [VASSOURAS] >>> Desativando (levantando)")
     
     def stop(self):
         """Para o robô e limpa recursos"""
         self.running = False
-        self.motors.stop()
+        self.motion.cancel()
         self.brushes.stop()
         self.motors.cleanup()
         self.brushes.cleanup()
+        if self.recorder is not None:
+            self.recorder.close()
+        log.flush()     # Depois dos atuadores: log nunca impede a parada
         
         print("\n" + "="*60)
         print("Robô parado!")
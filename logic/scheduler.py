@@ -0,0 +1,227 @@
+"""
+logic/scheduler.py
+==================
+Executivo cíclico multi-taxa com deadlines absolutos
+"""
+
+from hardware.clock import REAL_CLOCK, Deadline
+
+
+OVERRUN_POLICIES = ('skip', 'catch_up', 'restart')
+
+
+class TimingHistogram:
+    """
+    Histograma de tempos com baldes fixos (em ms).
+
+    Sem alocação por amostra: só incrementa contadores, então pode
+    ficar ligado no robô o tempo todo.
+    """
+
+    EDGES_MS = (0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.EDGES_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        ms = seconds * 1000.0
+        i = 0
+        while i < len(self.EDGES_MS) and ms > self.EDGES_MS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q):
+        """Limite superior (s) do balde que contém o quantil q (0-1)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                if i < len(self.EDGES_MS):
+                    return self.EDGES_MS[i] / 1000.0
+                return self.max
+        return self.max
+
+    def format(self):
+        """Linha com contagem por balde (só baldes não vazios)"""
+        parts = []
+        for i, n in enumerate(self.counts):
+            if n:
+                label = f"≤{self.EDGES_MS[i]:g}" if i < len(self.EDGES_MS) else f">{self.EDGES_MS[-1]:g}"
+                parts.append(f"{label}ms:{n}")
+        return " ".join(parts)
+
+
+class PeriodicTask:
+    """
+    Tarefa periódica do executivo.
+
+    Liberações num grade absoluta (início + k·período): o atraso de uma
+    execução não se acumula nas seguintes. O deadline de cada liberação
+    é a próxima liberação; terminar depois dele é um overrun.
+
+    Políticas de overrun:
+    - 'skip':     pula as liberações perdidas e volta à grade
+    - 'catch_up': executa as liberações perdidas em sequência
+    - 'restart':  recomeça a grade a partir do fim da execução
+    """
+
+    def __init__(self, name, period, callback, policy='skip'):
+        """
+        Args:
+            name: nome para relatórios
+            period: período (s)
+            callback: função sem argumentos
+            policy: 'skip', 'catch_up' ou 'restart'
+        """
+        if period <= 0:
+            raise ValueError(f"Tarefa {name}: período deve ser > 0")
+        if policy not in OVERRUN_POLICIES:
+            raise ValueError(f"Tarefa {name}: política inválida {policy} "
+                             f"(opções: {OVERRUN_POLICIES})")
+        self.name = name
+        self.period = period
+        self.callback = callback
+        self.policy = policy
+
+        self.release = 0.0          # Próxima liberação (absoluta)
+        self.last_start = None
+
+        self.runs = 0
+        self.overruns = 0
+        self.skipped = 0            # Liberações puladas ('skip')
+
+        self.period_hist = TimingHistogram()    # Entre inícios consecutivos
+        self.jitter_hist = TimingHistogram()    # Início - liberação
+        self.exec_hist = TimingHistogram()      # Duração da execução
+
+    def _finish(self, now):
+        """Agenda a próxima liberação após uma execução que terminou em now"""
+        self.release += self.period
+        if now <= self.release:
+            return
+
+        self.overruns += 1
+        if self.policy == 'skip':
+            missed = int((now - self.release) // self.period) + 1
+            self.skipped += missed
+            self.release += missed * self.period
+        elif self.policy == 'restart':
+            self.release = now
+        # 'catch_up': mantém a liberação vencida (roda em seguida)
+
+
+class CyclicExecutive:
+    """
+    Executa tarefas periódicas de taxas diferentes numa só thread.
+
+    A cada passo roda a tarefa com a liberação mais antiga (empate:
+    ordem de cadastro = prioridade) e dorme no relógio até a próxima.
+    Com VirtualClock o sono salta direto para a próxima liberação.
+    """
+
+    def __init__(self, clock=None):
+        """
+        Args:
+            clock: relógio (hardware.clock, None = relógio real)
+        """
+        self.clock = clock or REAL_CLOCK
+        self.tasks = []
+        self.started_at = None
+
+    def add_task(self, name, rate_hz, callback, policy='skip'):
+        """
+        Cadastra uma tarefa.
+
+        Args:
+            name: nome
+            rate_hz: frequência (Hz)
+            callback: função sem argumentos
+            policy: política de overrun
+
+        Returns:
+            PeriodicTask
+        """
+        task = PeriodicTask(name, 1.0 / rate_hz, callback, policy)
+        self.tasks.append(task)
+        return task
+
+    def start(self):
+        """Alinha todas as tarefas no instante atual"""
+        self.started_at = self.clock.now()
+        for task in self.tasks:
+            task.release = self.started_at
+            task.last_start = None
+
+    def next_task(self):
+        """Tarefa com a liberação mais antiga (prioridade no empate)"""
+        return min(self.tasks, key=lambda t: t.release)
+
+    def run_once(self):
+        """
+        Espera a próxima liberação e executa a tarefa.
+
+        Returns:
+            PeriodicTask executada
+        """
+        if self.started_at is None:
+            self.start()
+
+        task = self.next_task()
+        self.clock.sleep_until(Deadline(self.clock, task.release))
+
+        start = self.clock.now()
+        task.jitter_hist.add(max(0.0, start - task.release))
+        if task.last_start is not None:
+            task.period_hist.add(start - task.last_start)
+        task.last_start = start
+
+        task.callback()
+
+        end = self.clock.now()
+        task.exec_hist.add(end - start)
+        task.runs += 1
+        task._finish(end)
+        return task
+
+    def run(self, keep_running):
+        """
+        Executa até keep_running() retornar False.
+
+        Args:
+            keep_running: função sem argumentos -> bool
+        """
+        self.start()
+        while keep_running():
+            self.run_once()
+
+    def report(self):
+        """
+        Resumo por tarefa: período, jitter, execução e overruns.
+
+        Returns:
+            str: texto multi-linha
+        """
+        lines = ["Executivo cíclico:"]
+        for task in self.tasks:
+            lines.append(
+                f"  {task.name:14s} {1.0 / task.period:5.1f}Hz | {task.runs:6d} exec | "
+                f"período médio {task.period_hist.mean()*1000:6.1f}ms "
+                f"(máx {task.period_hist.max*1000:6.1f}) | "
+                f"jitter p95 ≤{task.jitter_hist.percentile(0.95)*1000:g}ms | "
+                f"exec máx {task.exec_hist.max*1000:6.1f}ms | "
+                f"overruns {task.overruns} (pulos {task.skipped})")
+            lines.append(f"    jitter: {task.jitter_hist.format()}")
+        return "\n".join(lines)
@@ -39,13 +39,21 @@ class RepositionStep(Enum):
     """
     Passos da manobra quando perde a placa.
     
-    Sequência:
-    1. TURNING_90: Vira 90° (esquerda ou direita)
-    2. MOVING_SIDEWAYS: Anda largura do robô
-    3. TURNING_90_BACK: Vira 90° de volta
-    4. MOVING_FORWARD: Anda reto procurando placa novamente
+    Sequência (giros no lugar):
+    1. FIRST_TURN_90: Vira 90° (esquerda ou direita)
+    2. CHECK_PANEL: Verifica se ainda detecta placa
+    3. TURN_180_BACK: Vira 180° de volta (apenas cenário B)
+    4. MOVING_SIDEWAYS: Anda largura do robô
+    5. FINAL_TURN_90: Vira 90° final
+    
+    Sequência em arco (U-turn contínuo, cenário A):
+    1. ARC_FIRST_90: Primeiro quarto do arco
+    2. ARC_FINAL_90: Segundo quarto do arco (sem parar)
     """
-    TURNING_90 = "turning_90"             # Virando 90°
+    FIRST_TURN_90 = "first_turn_90"       # Virando 90°
+    CHECK_PANEL = "check_panel"           # Verificando placa após giro
+    TURN_180_BACK = "turn_180_back"       # Virando 180° de volta (cenário B)
     MOVING_SIDEWAYS = "moving_sideways"   # Andando para o lado (largura do robô)
-    TURNING_90_BACK = "turning_90_back"   # Virando 90° de volta
-    MOVING_FORWARD = "moving_forward"     # Andando para frente procurando placa
\ No newline at end of file
+    FINAL_TURN_90 = "final_turn_90"       # Giro final de 90°
+    ARC_FIRST_90 = "arc_first_90"         # Primeiro quarto do U-turn em arco
+    ARC_FINAL_90 = "arc_final_90"         # Segundo quarto do U-turn em arco
@@ -14,6 +14,8 @@ Estrutura modular:
     config.py - Configurações centralizadas
 """
 
+import os
+
 from logic import Robot
 from config import (
     MOTOR_PINS, 
@@ -25,8 +27,34 @@ from config import (
     SEARCH_SPEED,
     SCAN_SPEED,
     TURN_90_TIME,
-    SIDEWAYS_TIME
+    SIDEWAYS_TIME,
+    WHEEL_BASE,
+    USE_ARC_UTURN,
+    MOTOR_ACCELERATION,
+    MOTOR_DECELERATION,
+    MOTOR_RAMP_THREAD,
+    ODOMETRY_SLIP_NOISE,
+    COVERAGE_CONFIG,
+    PLANNER_CONFIG,
+    PWM_BACKEND,
+    MAIN_LOOP_DELAY,
+    SCHEDULER_CONFIG,
+    DEBUG_MODE,
+    VERBOSE_SENSORS,
+    LOG_TO_FILE,
+    LOG_FILE,
+    TELEMETRY_CONFIG,
+    METRICS_CONFIG,
+    PROFILING_CONFIG,
+    SERVO_CONFIG,
+    BRUSH_CONFIG
 )
+from hardware import set_default_backend
+from logic.states import RobotState, RepositionStep
+from telemetry import FlightRecorder
+from profiling import SignalProfiler
+import logger
+import metrics
 
 
 def main():
@@ -49,23 +77,79 @@ def main():
         print("\nCorreja os erros em config.py antes de continuar.")
         return
     
+    # Logs assíncronos (terminal lento não trava o loop de controle)
+    logger.configure(
+        debug=DEBUG_MODE,
+        verbose_sensors=VERBOSE_SENSORS,
+        log_file=LOG_FILE if LOG_TO_FILE else None
+    )
+    
+    # Métricas ao vivo (antes de criar os componentes, que se registram)
+    if METRICS_CONFIG['enabled']:
+        metrics.serve(METRICS_CONFIG['host'], METRICS_CONFIG['port'])
+        print(f"Métricas em http://{METRICS_CONFIG['host']}:{METRICS_CONFIG['port']}/metrics")
+    
+    # Backend de PWM (hardware/DMA em vez de threads de software)
+    set_default_backend(PWM_BACKEND)
+    
+    # Parâmetros da lógica (também gravados na telemetria, para o replay)
+    robot_params = dict(
+        panel_distance=PANEL_DISTANCE,
+        search_speed=SEARCH_SPEED,
+        scan_speed=SCAN_SPEED,
+        vision_check_interval=15,      # Verificar visão a cada 15s
+        turn_90_time=TURN_90_TIME,     # Tempo para virar 90°
+        sideways_time=SIDEWAYS_TIME,   # Tempo andando lateral (largura robô)
+        wheel_base=WHEEL_BASE,         # Distância entre rodas (arcos)
+        use_arc_uturn=USE_ARC_UTURN,   # Troca de faixa em arco contínuo
+        motor_acceleration=MOTOR_ACCELERATION,
+        motor_deceleration=MOTOR_DECELERATION,
+        odometry_slip_noise=ODOMETRY_SLIP_NOISE,
+        coverage_config=COVERAGE_CONFIG,
+        planner_config=PLANNER_CONFIG,
+        brush_config=BRUSH_CONFIG,     # Potência das vassouras pela sujeira
+    )
+    
+    # Gravador de voo (telemetria binária por iteração)
+    recorder = None
+    if TELEMETRY_CONFIG['enabled']:
+        recorder = FlightRecorder(
+            TELEMETRY_CONFIG['path'],
+            capacity=TELEMETRY_CONFIG['capacity'],
+            states=RobotState,
+            steps=RepositionStep,
+            params=dict(robot_params, panel_lost_threshold=PANEL_LOST_THRESHOLD)
+        )
+    
     # Criar robô com configurações
     robot = Robot(
         motor_pins=MOTOR_PINS,
         brush_pins=BRUSH_MOTOR_PINS,
         servo_pin=SERVO_PIN,
         ultrasonic_pins=ULTRASONIC_PINS,
-        panel_distance=PANEL_DISTANCE,
-        search_speed=SEARCH_SPEED,
-        scan_speed=SCAN_SPEED,
-        vision_check_interval=15,      # Verificar visão a cada 15s
-        turn_90_time=TURN_90_TIME,     # Tempo para virar 90°
-        sideways_time=SIDEWAYS_TIME    # Tempo andando lateral (largura robô)
+        motor_ramp_thread=MOTOR_RAMP_THREAD,
+        loop_period=MAIN_LOOP_DELAY,   # Período da máquina de estados
+        scheduler_config=SCHEDULER_CONFIG,
+        servo_config=SERVO_CONFIG,
+        recorder=recorder,
+        **robot_params
     )
     
     # Configurar filtro anti-interferência
     robot.panel_lost_threshold = PANEL_LOST_THRESHOLD
     
+    # Perfil sob demanda por sinais (nada roda até o sinal chegar)
+    if PROFILING_CONFIG['enabled']:
+        SignalProfiler(
+            PROFILING_CONFIG['directory'],
+            duration=PROFILING_CONFIG['duration'],
+            sample_hz=PROFILING_CONFIG['sample_hz'],
+            report=lambda: ((robot.executive.report() + "\n") if robot.executive else "")
+                           + robot.timing_report()
+        ).install()
+        print(f"Perfil: kill -USR1 {os.getpid()} (cProfile) | -USR2 (amostragem) | "
+              f"-QUIT (pilhas)")
+    
     # Iniciar robô (entra no loop principal)
     robot.start()
 
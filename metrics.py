@@ -0,0 +1,281 @@
+"""
+metrics.py
+==========
+Métricas do robô em tempo real (formato texto do Prometheus)
+
+Contadores, gauges e histogramas de buckets fixos registrados pelos
+componentes (Robot, UltrasonicSensor, CameraVision, motores, vassouras,
+servo) e servidos por um HTTP local em /metrics.
+
+- Desligado (padrão): counter()/gauge()/histogram() devolvem um objeto
+  nulo cujos métodos não fazem nada - nenhum registro, nenhuma thread
+- Ligado: inc()/set()/observe() são somas em memória; a formatação do
+  texto só acontece quando alguém lê /metrics (ex: 1x por segundo)
+- fn=: o valor é lido de uma função na hora da leitura (contadores que
+  o componente já mantém, estado atual) - custo zero no loop
+
+Uso:
+    import metrics
+    metrics.enable()                        # antes de criar os componentes
+    metrics.serve('127.0.0.1', 9108)
+
+    reads = metrics.counter('ultrasonic_readings_total', "Leituras do HC-SR04")
+    reads.inc()
+
+    curl http://127.0.0.1:9108/metrics
+"""
+
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Buckets padrão dos histogramas de tempo (s)
+TIME_BUCKETS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Counter:
+    """Contador monotônico (ou lido de fn na hora da exposição)"""
+
+    def __init__(self, fn=None):
+        self.value = 0.0
+        self.fn = fn
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def samples(self, name, labels):
+        value = self.fn() if self.fn is not None else self.value
+        return [(name, labels, value)]
+
+
+class Gauge(Counter):
+    """Valor instantâneo (ou lido de fn na hora da exposição)"""
+
+    def set(self, value):
+        self.value = value
+
+
+class Histogram:
+    """Histograma de buckets fixos (limites superiores, como no Prometheus)"""
+
+    def __init__(self, buckets=TIME_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)   # último = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name, labels):
+        # Cópia antes de acumular: observe() pode rodar durante a leitura
+        counts = list(self.counts)
+        result = []
+        cumulative = 0
+        for bound, n in zip(self.buckets + (float('inf'),), counts):
+            cumulative += n
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            result.append((name + '_bucket', labels + (('le', le),), cumulative))
+        result.append((name + '_sum', labels, self.sum))
+        result.append((name + '_count', labels, cumulative))
+        return result
+
+
+class _NullMetric:
+    """Métrica desligada: aceita tudo e não faz nada"""
+
+    def inc(self, amount=1):
+        pass
+
+    def set(self, value):
+        pass
+
+    def observe(self, value):
+        pass
+
+
+NULL = _NullMetric()
+
+
+class Registry:
+    """Famílias de métricas por nome; séries por conjunto de labels"""
+
+    def __init__(self):
+        self.families = {}      # nome -> [tipo, help, {labels: métrica}]
+        self.lock = threading.Lock()
+
+    def register(self, name, help, kind, create, labels=None, fn=None):
+        """
+        Métrica com o nome e labels dados (a mesma se já existir).
+
+        Com fn, a função substitui a anterior: o componente mais recente
+        (ex: Robot recriado) é o que aparece.
+
+        Args:
+            kind: 'counter', 'gauge' ou 'histogram'
+            create: função que cria a métrica na primeira vez
+
+        Raises:
+            ValueError: nome já registrado com outro tipo
+        """
+        key = tuple(sorted((labels or {}).items()))
+        with self.lock:
+            family = self.families.setdefault(name, [kind, help, {}])
+            if family[0] != kind:
+                raise ValueError(f"Métrica {name} já registrada como {family[0]}")
+            metric = family[2].get(key)
+            if metric is None:
+                metric = family[2][key] = create()
+            elif fn is not None:
+                metric.fn = fn
+            return metric
+
+    def render(self):
+        """
+        Texto de exposição do Prometheus.
+
+        Returns:
+            str
+        """
+        with self.lock:
+            families = [(name, kind, help, list(series.items()))
+                        for name, (kind, help, series) in self.families.items()]
+
+        lines = []
+        for name, kind, help, series in families:
+            lines.append(f"# HELP {name} {_escape(help, quote=False)}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, metric in series:
+                try:
+                    # Sem valor ainda (fn retornou None, ex: servo antes do
+                    # primeiro movimento): a série fica de fora
+                    rendered = [f"{sample_name}{_labels(sample_labels)} {_number(value)}"
+                                for sample_name, sample_labels, value
+                                in metric.samples(name, labels)
+                                if value is not None]
+                except Exception:
+                    continue    # fn de um componente já desligado
+                lines.extend(rendered)
+        return "\n".join(lines) + "\n"
+
+
+def _escape(text, quote=True):
+    text = str(text).replace('\\', '\\\\').replace('\n', '\\n')
+    return text.replace('"', '\\"') if quote else text
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels) + '}'
+
+
+def _number(value):
+    value = float(value)
+    if value != value:
+        return 'NaN'
+    if value in (float('inf'), float('-inf')):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(int(value)) if value.is_integer() else repr(value)
+
+
+_registry = None
+_server = None
+
+
+def enable():
+    """Liga o registro (chamar antes de criar os componentes)"""
+    global _registry
+    if _registry is None:
+        _registry = Registry()
+    return _registry
+
+
+def enabled():
+    return _registry is not None
+
+
+def counter(name, help, fn=None, **labels):
+    """
+    Contador (NULL se desligado).
+
+    Args:
+        name: nome Prometheus (ex: 'ultrasonic_timeouts_total')
+        help: descrição
+        fn: função sem argumentos lida na exposição (None = use inc())
+        **labels: labels fixos da série
+    """
+    if _registry is None:
+        return NULL
+    return _registry.register(name, help, 'counter', lambda: Counter(fn), labels, fn)
+
+
+def gauge(name, help, fn=None, **labels):
+    """Gauge (NULL se desligado); ver counter()"""
+    if _registry is None:
+        return NULL
+    return _registry.register(name, help, 'gauge', lambda: Gauge(fn), labels, fn)
+
+
+def histogram(name, help, buckets=TIME_BUCKETS, **labels):
+    """Histograma de buckets fixos (NULL se desligado)"""
+    if _registry is None:
+        return NULL
+    return _registry.register(name, help, 'histogram', lambda: Histogram(buckets), labels)
+
+
+def render():
+    """Texto de exposição ('' se desligado)"""
+    return _registry.render() if _registry is not None else ''
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass    # Sem uma linha no terminal por leitura
+
+
+def serve(host='127.0.0.1', port=9108):
+    """
+    Serve /metrics numa thread de fundo (liga o registro se preciso).
+
+    Args:
+        host: interface (padrão só local)
+        port: porta TCP
+
+    Returns:
+        ThreadingHTTPServer
+    """
+    global _server
+    enable()
+    if _server is None:
+        _server = ThreadingHTTPServer((host, port), _Handler)
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name='metrics',
+                         daemon=True).start()
+    return _server
+
+
+def shutdown():
+    """Encerra o servidor HTTP"""
+    global _server
+    if _server is not None:
+        _server.shutdown()
+        _server.server_close()
+        _server = None
@@ -0,0 +1,227 @@
+"""
+profiling.py
+============
+Perfil sob demanda do robô em execução, disparado por sinais
+
+Nada roda até um sinal chegar: sem reiniciar o robô sob cProfile (o que
+muda os tempos e perde o estado que causou o problema).
+
+    kill -USR1 <pid>   perfil determinístico (cProfile) da thread do loop
+                       por `duration` s -> .prof + .txt (pstats)
+    kill -USR2 <pid>   perfil por amostragem de todas as threads por
+                       `duration` s -> .folded (flamegraph/speedscope) + .txt
+    kill -QUIT <pid>   pilha de todas as threads + resumo de tempos do loop
+                       (Ctrl+\\ no terminal)
+
+O mesmo sinal de novo antes do fim encerra o perfil na hora. Os arquivos
+vão para `directory`.
+
+Uso:
+    SignalProfiler('profiles', duration=30, report=robot.timing_report).install()
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import signal
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+
+from logger import get_logger
+
+
+log = get_logger('profiling')
+
+
+class SignalProfiler:
+    """Handlers de sinal que disparam perfis e despejos de pilha"""
+
+    def __init__(self, directory='profiles', duration=30.0, sample_hz=200,
+                 report=None):
+        """
+        Args:
+            directory: pasta dos arquivos gerados
+            duration: duração de cada perfil (s)
+            sample_hz: frequência do perfil por amostragem
+            report: função sem argumentos -> str com o resumo de tempos
+                    do loop (incluído no despejo de pilhas)
+        """
+        self.directory = directory
+        self.duration = duration
+        self.sample_hz = sample_hz
+        self.report = report
+
+        self._profile = None
+        self._profile_started = None
+        self._sampler = None
+        self._sampler_stop = threading.Event()
+
+    def install(self):
+        """
+        Registra os handlers (só na thread principal).
+
+        Returns:
+            SignalProfiler: self
+        """
+        handlers = (('SIGUSR1', self._on_profile), ('SIGUSR2', self._on_sample),
+                    ('SIGQUIT', self._on_dump), ('SIGALRM', self._on_alarm))
+        for name, handler in handlers:
+            if hasattr(signal, name):   # Sinais POSIX
+                signal.signal(getattr(signal, name), handler)
+        return self
+
+    def _path(self, kind, extension):
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        return os.path.join(self.directory, f"{kind}-{stamp}.{extension}")
+
+    # ==================== cProfile ====================
+
+    def _on_profile(self, signum, frame):
+        if self._profile is None:
+            self.start_profile()
+        else:
+            self.stop_profile()
+
+    def _on_alarm(self, signum, frame):
+        if self._profile is not None:
+            self.stop_profile()
+
+    def start_profile(self):
+        """
+        Liga o cProfile na thread principal (a do loop de controle).
+
+        O fim vem por SIGALRM: o handler roda na mesma thread, que é a
+        única onde disable() tem efeito.
+        """
+        self._profile = cProfile.Profile()
+        self._profile_started = time.monotonic()
+        self._profile.enable()
+        if hasattr(signal, 'setitimer'):
+            signal.setitimer(signal.ITIMER_REAL, self.duration)
+        log.info("[PERFIL] cProfile ligado por %gs", self.duration)
+
+    def stop_profile(self):
+        """
+        Desliga o cProfile e grava .prof e o resumo .txt.
+
+        Returns:
+            str: caminho do .prof (None se não havia perfil)
+        """
+        if self._profile is None:
+            return None
+        self._profile.disable()
+        if hasattr(signal, 'setitimer'):
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        profile, self._profile = self._profile, None
+        elapsed = time.monotonic() - self._profile_started
+
+        path = self._path('cprofile', 'prof')
+        profile.dump_stats(path)
+        text = io.StringIO()
+        stats = pstats.Stats(profile, stream=text)
+        stats.sort_stats('cumulative').print_stats(40)
+        with open(path[:-len('prof')] + 'txt', 'w') as f:
+            f.write(text.getvalue())
+
+        log.info("[PERFIL] cProfile de %.1fs gravado em %s", elapsed, path)
+        return path
+
+    # ==================== AMOSTRAGEM ====================
+
+    def _on_sample(self, signum, frame):
+        if self._sampler is None or not self._sampler.is_alive():
+            self.start_sampling()
+        else:
+            self._sampler_stop.set()
+
+    def start_sampling(self):
+        """Thread que amostra as pilhas de todas as threads"""
+        self._sampler_stop.clear()
+        self._sampler = threading.Thread(target=self._sample_loop, name='sampler',
+                                         daemon=True)
+        self._sampler.start()
+        log.info("[PERFIL] Amostragem a %dHz por %gs", self.sample_hz, self.duration)
+
+    def _sample_loop(self):
+        # As pilhas só são lidas quando a thread amostradora pega o GIL:
+        # código Python puro que nunca o solta aparece menos que o real
+        # (para esses casos, o cProfile)
+        me = threading.get_ident()
+        interval = 1.0 / self.sample_hz
+        stacks = Counter()
+        samples = 0
+        start = time.monotonic()
+
+        while (not self._sampler_stop.wait(interval)
+               and time.monotonic() - start < self.duration):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}"
+                                 f":{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                stacks[';'.join(reversed(stack))] += 1
+            samples += 1
+
+        self._write_samples(stacks, samples, time.monotonic() - start)
+
+    def _write_samples(self, stacks, samples, elapsed):
+        path = self._path('sample', 'folded')
+        with open(path, 'w') as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        # Resumo: funções no topo da pilha (tempo próprio) por thread
+        leaves = Counter()
+        for stack, count in stacks.items():
+            parts = stack.split(';')
+            leaves[(parts[0], parts[-1])] += count
+        lines = [f"{samples} amostras em {elapsed:.1f}s ({self.sample_hz}Hz)",
+                 f"{'%':>6s}  thread / função no topo da pilha"]
+        for (thread, leaf), count in leaves.most_common(30):
+            lines.append(f"{count / max(1, samples) * 100:6.1f}  {thread}: {leaf}")
+        with open(path[:-len('folded')] + 'txt', 'w') as f:
+            f.write("\n".join(lines) + "\n")
+
+        log.info("[PERFIL] Amostragem gravada em %s", path)
+
+    # ==================== DESPEJO ====================
+
+    def _on_dump(self, signum, frame):
+        self.dump()
+
+    def dump(self):
+        """
+        Grava a pilha de todas as threads e o resumo de tempos do loop.
+
+        Returns:
+            str: caminho do arquivo
+        """
+        names = {t.ident: t.name for t in threading.enumerate()}
+        lines = [f"Despejo em {time.strftime('%Y-%m-%d %H:%M:%S')} (pid {os.getpid()})", ""]
+        for ident, frame in sys._current_frames().items():
+            lines.append(f"--- Thread {names.get(ident, ident)} ({ident}) ---")
+            lines.extend(line.rstrip('\n') for line in traceback.format_stack(frame))
+            lines.append("")
+
+        if self.report is not None:
+            try:
+                lines.append(self.report())
+            except Exception as e:
+                lines.append(f"(resumo de tempos indisponível: {e})")
+
+        path = self._path('dump', 'txt')
+        with open(path, 'w') as f:
+            f.write("\n".join(lines) + "\n")
+        log.info("[PERFIL] Pilhas e tempos gravados em %s", path)
+        return path
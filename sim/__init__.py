@@ -0,0 +1,39 @@
+"""
+sim/__init__.py
+===============
+Simulador 2-D mais rápido que o tempo real.
+
+Roda o Robot sem alterações sobre drivers simulados e um relógio
+virtual, num arranjo de placas com frestas e sujeira sintética.
+
+Uso:
+    python -m sim -n 20
+    python -m sim --compare
+    python -m sim --seed 3 --record voo.tlm && python -m sim.replay voo.tlm
+
+    from sim import run_mission
+    metrics = run_mission({'turn_90_time': 2.4}, seed=3)
+
+    # Replay: importar do módulo (o pacote não carrega sim.replay, que
+    # também roda como script com python -m)
+    from sim.replay import replay, compare
+"""
+
+from hardware.clock import VirtualClock
+from .world import PanelArray, SimWorld
+from .drivers import SimMotors, SimUltrasonic, SimCamera, SimBrushes
+from .mission import run_mission, build_mission, ROBOT_DEFAULTS, WORLD_DEFAULTS
+
+__all__ = [
+    'VirtualClock',
+    'PanelArray',
+    'SimWorld',
+    'SimMotors',
+    'SimUltrasonic',
+    'SimCamera',
+    'SimBrushes',
+    'run_mission',
+    'build_mission',
+    'ROBOT_DEFAULTS',
+    'WORLD_DEFAULTS'
+]
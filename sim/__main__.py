@@ -0,0 +1,121 @@
+"""
+sim/__main__.py
+===============
+Lote de missões simuladas em paralelo
+
+Uso:
+    python -m sim -n 200 --workers 4
+    python -m sim --set turn_90_time=2.4 --world wheel_bias=0.03
+    python -m sim --compare          # reativo x plano boustrofédico
+    python -m sim --seed 3 --record voo.tlm     # traço para sim.replay
+"""
+
+import argparse
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from .mission import run_mission, parse_overrides, ROBOT_DEFAULTS
+
+
+def _run(job):
+    params, world_params, seed, max_time = job
+    return run_mission(params, world_params, seed=seed, max_time=max_time)
+
+
+def run_batch(params, world_params, seeds, max_time, workers=None):
+    """
+    Roda uma missão por semente num pool de processos.
+
+    Returns:
+        tuple: (lista de métricas, tempo de parede em s)
+    """
+    jobs = [(params, world_params, seed, max_time) for seed in seeds]
+    start = time.perf_counter()
+    if workers == 1:
+        results = [_run(job) for job in jobs]
+    else:
+        with Pool(workers) as pool:
+            results = pool.map(_run, jobs)
+    return results, time.perf_counter() - start
+
+
+def summarize(name, results, wall):
+    """Imprime médias do lote"""
+    def mean(key):
+        values = [r[key] for r in results if r[key] is not None]
+        return float(np.mean(values)) if values else float('nan')
+
+    def reached(key):
+        return sum(r[key] is not None for r in results)
+
+    n = len(results)
+    sim_time = sum(r['sim_time'] for r in results)
+    print(f"\n[{name}] {n} missões em {wall:.1f}s "
+          f"({n / wall * 60:.0f} missões/min, {sim_time / wall:.0f}x tempo real)")
+    print(f"  Concluídas: {sum(r['completed'] for r in results)}/{n} | "
+          f"Caíram: {sum(r['fell_off'] for r in results)}/{n}")
+    print(f"  Cobertura:  {mean('coverage')*100:5.1f}% visitada | "
+          f"{mean('brushed')*100:5.1f}% escovada | "
+          f"{mean('dirt_removed')*100:5.1f}% da sujeira removida")
+    print(f"  Vassouras:  {mean('brush_activations'):5.1f} ativações "
+          f"({mean('brush_toggles_avoided'):.1f} trocas evitadas) | "
+          f"energia {mean('brush_energy')/100:6.1f} s a 100%")
+    print(f"  Tempo:      {mean('sim_time')/60:5.1f} min | "
+          f"90% em {mean('time_to_90')/60:5.1f} min ({reached('time_to_90')}/{n}) | "
+          f"95% em {mean('time_to_95')/60:5.1f} min ({reached('time_to_95')}/{n})")
+    print(f"  Manobras:   {mean('maneuvers'):5.1f} | "
+          f"Visão: {mean('vision_checks'):5.1f} | "
+          f"Erro odometria: {mean('odometry_error'):5.1f}cm")
+
+    # Para onde vai o tempo da missão (média por estado / passo)
+    for key, label in (('state_time', 'Estados'), ('step_time', 'Manobra')):
+        names = results[0][key]
+        times = {name: np.mean([r[key][name] for r in results]) for name in names}
+        parts = [f"{name} {t/60:.1f}min" for name, t in times.items() if t > 0]
+        print(f"  {label + ':':11s} {' | '.join(parts)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulador de missões do robô")
+    parser.add_argument('-n', '--missions', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0, help="primeira semente")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="processos (padrão: um por CPU, 1 = sem pool)")
+    parser.add_argument('--max-time', type=float, default=1800,
+                        help="tempo simulado máximo por missão (s)")
+    parser.add_argument('--set', action='append', metavar='PARAM=VALOR',
+                        help=f"parâmetro do robô ({', '.join(ROBOT_DEFAULTS)})")
+    parser.add_argument('--world', action='append', metavar='PARAM=VALOR',
+                        help="parâmetro do mundo (ver WORLD_DEFAULTS)")
+    parser.add_argument('--compare', action='store_true',
+                        help="compara manobra reativa com o plano boustrofédico")
+    parser.add_argument('--record', metavar='ARQUIVO',
+                        help="roda só a missão de --seed gravando a telemetria")
+    args = parser.parse_args()
+
+    params = parse_overrides(args.set)
+    world_params = parse_overrides(args.world)
+    seeds = range(args.seed, args.seed + args.missions)
+
+    if args.record:
+        metrics = run_mission(params, world_params, seed=args.seed,
+                              max_time=args.max_time, record=args.record)
+        print(f"Missão (semente {args.seed}) gravada em {args.record}: "
+              f"{metrics['ticks']} iterações, {metrics['sim_time']/60:.1f} min, "
+              f"cobertura {metrics['coverage']*100:.1f}%")
+    elif args.compare:
+        reactive = dict(params, planner_config={'enabled': False})
+        planned = dict(params, planner_config=dict(
+            ROBOT_DEFAULTS['planner_config'], enabled=True))
+        for name, p in (("Reativo", reactive), ("Planejado", planned)):
+            results, wall = run_batch(p, world_params, seeds, args.max_time, args.workers)
+            summarize(name, results, wall)
+    else:
+        results, wall = run_batch(params, world_params, seeds, args.max_time, args.workers)
+        summarize("Simulação", results, wall)
+
+
+if __name__ == "__main__":
+    main()
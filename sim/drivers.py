@@ -0,0 +1,243 @@
+"""
+sim/drivers.py
+==============
+Drivers simulados com a mesma interface do hardware real
+"""
+
+import numpy as np
+
+from config import MOTOR_PINS, SERVO_CONFIG
+from hardware.actuators import ActuatorTask, completed
+from hardware.brushes import BrushState
+from hardware.gpio import SimulatedGPIO
+from hardware.motors import L298NController
+
+
+class SimMotors(L298NController):
+    """
+    L298NController real (rampas, trim, arcos, cache de escrita) sobre
+    GPIO e PWM simulados - nunca toca o GPIO da máquina.
+    """
+
+    def __init__(self, motor_pins=None, **kwargs):
+        super().__init__(motor_pins or MOTOR_PINS, gpio=SimulatedGPIO(),
+                         pwm_backend='simulated', **kwargs)
+
+
+class SimUltrasonic:
+    """
+    HC-SR04 apontado para baixo na frente do robô.
+
+    Sobre o vidro mede a altura do robô (~3cm); fora dele (borda ou
+    fresta) mede o chão. Leituras espúrias retornam max_distance, como
+    o timeout do sensor real.
+    """
+
+    def __init__(self, world, clock, offset=12.0, panel_height=3.0,
+                 ground_height=40.0, noise=0.3, dropout=0.01,
+                 max_distance=400, rng=None):
+        """
+        Args:
+            world: SimWorld
+            clock: relógio (tempo do timeout)
+            offset: posição do sensor à frente do centro (cm)
+            panel_height: distância medida sobre o vidro (cm)
+            ground_height: distância medida fora da placa (cm)
+            noise: desvio padrão da leitura (cm)
+            dropout: probabilidade de leitura espúria por medição
+            max_distance: valor retornado no timeout (cm)
+            rng: numpy Generator
+        """
+        self.world = world
+        self.clock = clock
+        self.offset = offset
+        self.panel_height = panel_height
+        self.ground_height = ground_height
+        self.noise = noise
+        self.dropout = dropout
+        self.max_distance = max_distance
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        self.readings = 0
+        self.dropouts = 0
+
+    def get_distance(self):
+        """Distância simulada (cm); só o timeout gasta tempo (eco < 1ms)"""
+        self.readings += 1
+
+        if self.rng.random() < self.dropout:
+            self.dropouts += 1
+            self.clock.sleep(0.1)  # Timeout do eco
+            return self.max_distance
+
+        x, y = self.world.point_ahead(self.offset)
+        base = self.panel_height if self.world.panels.on_panel(x, y) else self.ground_height
+        distance = max(0.0, base + self.rng.normal(0.0, self.noise))
+        return round(distance, 2)
+
+
+class SimCamera:
+    """
+    Classificador de sujeira sobre a verdade do mundo.
+
+    Olha a sujeira média na área da câmera, erra com as taxas de falso
+    positivo/negativo e gasta o tempo de captura + inferência.
+    last_probability imita a saída do classificador: confiante longe do
+    limiar, perto de 0.5 junto dele e nos erros.
+    """
+
+    def __init__(self, world, clock, latency=0.3, threshold=0.3,
+                 false_positive=0.05, false_negative=0.1, rng=None):
+        """
+        Args:
+            world: SimWorld
+            clock: VirtualClock
+            latency: captura + inferência (s)
+            threshold: sujeira média acima da qual a placa está suja
+            false_positive: P(suja | limpa)
+            false_negative: P(limpa | suja)
+            rng: numpy Generator
+        """
+        self.world = world
+        self.clock = clock
+        self.latency = latency
+        self.threshold = threshold
+        self.false_positive = false_positive
+        self.false_negative = false_negative
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        self.camera_ready = True
+        self.checks = 0
+        self.last_probability = None
+
+    def detect_target(self):
+        """
+        Returns:
+            bool: True = SUJEIRA, False = LIMPA
+        """
+        self.checks += 1
+        self.clock.sleep(self.latency)
+
+        dirt = self.world.dirt_under_camera()
+        dusty = dirt > self.threshold
+        confidence = 0.5 + 0.5 * min(1.0, abs(dirt - self.threshold) / self.threshold)
+        error = self.false_negative if dusty else self.false_positive
+        if self.rng.random() < error:
+            dusty = not dusty
+            confidence = 0.6    # Erro: classificador em dúvida
+        self.last_probability = confidence if dusty else 1.0 - confidence
+        return dusty
+
+    def cleanup(self):
+        pass
+
+
+class SimBrushes:
+    """
+    Vassouras + servo com os mesmos tempos de sequência do
+    BrushController (servo 90° na velocidade de SERVO_CONFIG + 0.3s ao
+    abaixar, 0.2s + servo ao levantar), não-bloqueantes: avançam em
+    update().
+    """
+
+    def __init__(self, world, clock, brush_speed=50, lower_time=None,
+                 raise_time=None):
+        """
+        Args:
+            world: SimWorld (limpa a sujeira real sob as vassouras)
+            clock: VirtualClock
+            brush_speed: velocidade das vassouras (0-100)
+            lower_time: tempo de request_start() até girar (s, None = do servo)
+            raise_time: tempo de request_stop() até levantar (s, None = do servo)
+        """
+        servo_time = 90 / SERVO_CONFIG['speed'] + SERVO_CONFIG['margin']
+        self.world = world
+        self.clock = clock
+        self.brush_speed = brush_speed
+        self.lower_time = servo_time + 0.3 if lower_time is None else lower_time
+        self.raise_time = 0.2 + servo_time if raise_time is None else raise_time
+
+        self._running = False
+        self._task = None
+        self.activations = 0
+        self._energy = 0.0          # duty x tempo girando, até _since (%·s)
+        self._since = None
+
+    @property
+    def state(self):
+        return self._task.state if self._task is not None else BrushState.RAISED
+
+    def is_active(self):
+        return self.state in (BrushState.LOWERING, BrushState.RUNNING)
+
+    def request_start(self, delay=0.0):
+        if self.state == BrushState.RUNNING:
+            return completed(BrushState.RUNNING)
+        if self.state == BrushState.LOWERING:
+            return self._task.future
+        return self._run([(BrushState.LOWERING, lambda: delay + self.lower_time),
+                          (BrushState.RUNNING, self._on)])
+
+    def request_stop(self):
+        if self.state == BrushState.RAISED:
+            return completed(BrushState.RAISED)
+        if self.state == BrushState.STOPPING:
+            return self._task.future
+        return self._run([(BrushState.STOPPING, self._off),
+                          (BrushState.RAISED, lambda: None)])
+
+    def _run(self, steps):
+        if self._task is not None:
+            self._task.cancel()
+        self._task = ActuatorTask(steps, self.clock)
+        self._task.update()
+        return self._task.future
+
+    def _on(self):
+        self._running = True
+        self.world.brushing = True
+        self.activations += 1
+        self._since = self.clock.now()
+
+    def _off(self):
+        self._accumulate()
+        self.world.brushing = False
+        self._running = False
+        return self.raise_time
+
+    def _accumulate(self):
+        if self._running:
+            now = self.clock.now()
+            self._energy += self.brush_speed * (now - self._since)
+            self._since = now
+
+    def energy(self):
+        """Energia das vassouras (proxy): duty x tempo girando, em %·s"""
+        self._accumulate()
+        return self._energy
+
+    def update(self):
+        if self._task is not None:
+            self._task.update()
+
+    def wait(self):
+        if self._task is not None:
+            self._task.wait()
+
+    def start(self):
+        self.request_start()
+        self.wait()
+
+    def stop(self):
+        self.request_stop()
+        self.wait()
+
+    def set_speed(self, speed):
+        self._accumulate()
+        self.brush_speed = max(0, min(100, speed))
+
+    def is_running(self):
+        return self._running
+
+    def cleanup(self):
+        self.stop()
@@ -0,0 +1,289 @@
+"""
+sim/mission.py
+==============
+Executa uma missão completa do Robot (sem alterações) no mundo simulado
+"""
+
+import ast
+import os
+import time
+from contextlib import nullcontext, redirect_stdout
+
+import numpy as np
+
+from config import (MOTOR_PINS, BRUSH_MOTOR_PINS, SERVO_PIN, ULTRASONIC_PINS,
+                    PANEL_DISTANCE, PANEL_LOST_THRESHOLD, SEARCH_SPEED,
+                    SCAN_SPEED, TURN_90_TIME, SIDEWAYS_TIME, WHEEL_BASE,
+                    USE_ARC_UTURN, MOTOR_ACCELERATION, MOTOR_DECELERATION,
+                    ODOMETRY_SLIP_NOISE, COVERAGE_CONFIG, PLANNER_CONFIG, BRUSH_CONFIG,
+                    MAIN_LOOP_DELAY, MEASURED_TURN_90_TIME, MEASURED_TURN_SPEED)
+import logger
+from logic import Robot, RobotState
+from logic.kinematics import DifferentialDriveModel
+from logic.states import RepositionStep
+from telemetry import FlightRecorder
+from hardware.clock import VirtualClock
+from .world import PanelArray, SimWorld
+from .drivers import SimMotors, SimUltrasonic, SimCamera, SimBrushes
+
+
+# Parâmetros do robô (mesmos nomes dos argumentos de Robot)
+ROBOT_DEFAULTS = {
+    'panel_distance': PANEL_DISTANCE,
+    'search_speed': SEARCH_SPEED,
+    'scan_speed': SCAN_SPEED,
+    'vision_check_interval': 15,
+    'turn_90_time': TURN_90_TIME,
+    'sideways_time': SIDEWAYS_TIME,
+    'wheel_base': WHEEL_BASE,
+    'use_arc_uturn': USE_ARC_UTURN,
+    'motor_acceleration': MOTOR_ACCELERATION,
+    'motor_deceleration': MOTOR_DECELERATION,
+    'odometry_slip_noise': ODOMETRY_SLIP_NOISE,
+    'coverage_config': COVERAGE_CONFIG,
+    'planner_config': PLANNER_CONFIG,
+    'panel_lost_threshold': PANEL_LOST_THRESHOLD,
+    'brush_config': BRUSH_CONFIG,
+}
+
+# Parâmetros do mundo simulado
+WORLD_DEFAULTS = {
+    'rows': 1,
+    'cols': 1,
+    'panel_size': (165, 99),
+    'gap': 2.0,
+    'start_pose': (20.0, 12.0, 0.0),   # Perto do canto, como o robô é posto
+    # Física real (fixa): giro de 90° medido no robô a uma velocidade.
+    # Os parâmetros do Robot são só a crença do robô sobre ela.
+    'wheel_base': WHEEL_BASE,
+    'turn_90_time': MEASURED_TURN_90_TIME,
+    'turn_speed': MEASURED_TURN_SPEED,
+    'random_start': False,      # Pose inicial sorteada sobre o vidro
+    'speed_error': 0.0,
+    'wheel_bias': 0.0,
+    'slip_noise': 0.02,
+    'dirt_patches': 3,
+    'dirt_level': 0.05,
+    'sensor_offset': 12.0,
+    'sensor_dropout': 0.01,
+    'camera_latency': 0.3,
+    'camera_false_positive': 0.05,
+    'camera_false_negative': 0.1,
+}
+
+
+def parse_overrides(items):
+    """['chave=valor', ...] -> dict (valor avaliado como literal Python)"""
+    overrides = {}
+    for item in items or []:
+        key, _, value = item.partition('=')
+        try:
+            overrides[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            overrides[key] = value
+    return overrides
+
+
+def _random_start(panels, rng, margin=25.0):
+    """Pose sorteada sobre a primeira placa, longe das bordas"""
+    return (rng.uniform(margin, panels.panel_size[0] - margin),
+            rng.uniform(margin, panels.panel_size[1] - margin),
+            rng.uniform(-np.pi, np.pi))
+
+
+def build_mission(params=None, world_params=None, seed=0):
+    """
+    Monta mundo, drivers simulados e Robot sobre um relógio virtual.
+
+    Args:
+        params: sobrescreve ROBOT_DEFAULTS
+        world_params: sobrescreve WORLD_DEFAULTS
+        seed: semente do mundo (sujeira, patinagem, ruído)
+
+    Returns:
+        tuple: (robot, world, clock)
+    """
+    p = dict(ROBOT_DEFAULTS, **(params or {}))
+    w = dict(WORLD_DEFAULTS, **(world_params or {}))
+    rng = np.random.default_rng(seed)
+
+    clock = VirtualClock()
+    panels = PanelArray(w['rows'], w['cols'], w['panel_size'], w['gap'])
+    model = DifferentialDriveModel(w['wheel_base'], w['turn_90_time'], w['turn_speed'])
+    start = _random_start(panels, rng) if w['random_start'] else w['start_pose']
+
+    world = SimWorld(
+        panels, model, start_pose=start,
+        speed_error=w['speed_error'],
+        wheel_bias=w['wheel_bias'],
+        slip_noise=w['slip_noise'],
+        dirt_patches=w['dirt_patches'],
+        dirt_level=w['dirt_level'],
+        coverage_config=p['coverage_config'],
+        rng=rng
+    )
+
+    robot = build_robot(
+        params, clock,
+        brushes=SimBrushes(world, clock, brush_speed=p['brush_config'].get('speed', 50)),
+        ultrasonic=SimUltrasonic(world, clock, offset=w['sensor_offset'],
+                                 dropout=w['sensor_dropout'], rng=rng),
+        camera=SimCamera(world, clock, latency=w['camera_latency'],
+                         false_positive=w['camera_false_positive'],
+                         false_negative=w['camera_false_negative'], rng=rng)
+    )
+
+    # O mundo anda sempre que o relógio anda, com os duties aplicados
+    motors = robot.motors
+    clock.listeners.append(
+        lambda dt: world.step(dt, *motors.get_applied_duties()))
+
+    return robot, world, clock
+
+
+def build_robot(params, clock, brushes, ultrasonic, camera):
+    """
+    Robot com motores simulados e os sensores dados.
+
+    Args:
+        params: sobrescreve ROBOT_DEFAULTS
+        clock: VirtualClock
+        brushes, ultrasonic, camera: drivers (simulados ou de replay)
+
+    Returns:
+        Robot
+    """
+    p = dict(ROBOT_DEFAULTS, **(params or {}))
+
+    motors = SimMotors(
+        wheel_base=p['wheel_base'],
+        acceleration=p['motor_acceleration'],
+        deceleration=p['motor_deceleration'],
+        clock=clock
+    )
+    robot = Robot(
+        MOTOR_PINS, BRUSH_MOTOR_PINS, SERVO_PIN, ULTRASONIC_PINS,
+        panel_distance=p['panel_distance'],
+        search_speed=p['search_speed'],
+        scan_speed=p['scan_speed'],
+        vision_check_interval=p['vision_check_interval'],
+        turn_90_time=p['turn_90_time'],
+        sideways_time=p['sideways_time'],
+        wheel_base=p['wheel_base'],
+        use_arc_uturn=p['use_arc_uturn'],
+        odometry_slip_noise=p['odometry_slip_noise'],
+        coverage_config=p['coverage_config'],
+        planner_config=p['planner_config'],
+        motors=motors,
+        brushes=brushes,
+        ultrasonic=ultrasonic,
+        camera=camera,
+        clock=clock,
+        brush_config=p['brush_config']
+    )
+    robot.panel_lost_threshold = p['panel_lost_threshold']
+    return robot
+
+
+def run_mission(params=None, world_params=None, seed=0, max_time=1800,
+                tick=MAIN_LOOP_DELAY, quiet=True, record=None):
+    """
+    Roda uma missão até STOPPED, queda da placa ou max_time.
+
+    Args:
+        params: sobrescreve ROBOT_DEFAULTS
+        world_params: sobrescreve WORLD_DEFAULTS
+        seed: semente do mundo
+        max_time: tempo simulado máximo (s)
+        tick: período do loop principal (s)
+        quiet: descarta os prints do robô
+        record: arquivo de telemetria da missão (gravador de voo;
+                serve de traço para sim.replay), None = sem gravação
+
+    Returns:
+        dict: métricas de cobertura e tempo
+    """
+    wall_start = time.perf_counter()
+
+    output = open(os.devnull, 'w') if quiet else None
+    with (redirect_stdout(output) if quiet else nullcontext()), \
+            (logger.silenced() if quiet else nullcontext()):
+        robot, world, clock = build_mission(params, world_params, seed)
+        if record is not None:
+            robot.recorder = FlightRecorder(
+                record, capacity=int(max_time / tick) + 100,
+                states=RobotState, steps=RepositionStep,
+                params=dict(ROBOT_DEFAULTS, **(params or {})))
+
+        metrics = {
+            'seed': seed,
+            'completed': False,
+            'fell_off': False,
+            'time_to_90': None,
+            'time_to_95': None,
+            'maneuvers': 0,
+        }
+        previous_state = robot.state
+        ticks = 0
+
+        robot.running = True
+        while robot.running and clock.now() < max_time:
+            robot.main_loop()
+            clock.sleep(tick)
+            ticks += 1
+
+            if robot.state != previous_state:
+                if robot.state == RobotState.REPOSITIONING:
+                    metrics['maneuvers'] += 1
+                previous_state = robot.state
+
+            if ticks % 10 == 0:
+                coverage = world.panel_coverage()
+                if metrics['time_to_90'] is None and coverage >= 0.90:
+                    metrics['time_to_90'] = clock.now()
+                if metrics['time_to_95'] is None and coverage >= 0.95:
+                    metrics['time_to_95'] = clock.now()
+
+            if world.fell_off():
+                metrics['fell_off'] = True
+                break
+
+        robot.motion.cancel()
+        if robot.recorder is not None:
+            robot.recorder.close()
+
+    if output is not None:
+        output.close()
+
+    pose_error = np.hypot(*_odometry_error(robot, world))
+    metrics.update({
+        'completed': robot.state == RobotState.STOPPED,
+        'sim_time': clock.now(),
+        'ticks': ticks,
+        'coverage': world.panel_coverage('visited'),
+        'brushed': world.panel_coverage('brushed'),
+        'dirt_removed': world.dirt_removed(),
+        'distance': float(world.distance),
+        'vision_checks': robot.camera.checks,
+        'brush_activations': robot.brushes.activations,
+        'brush_energy': robot.brushes.energy(),
+        'brush_toggles_avoided': robot.brush_scheduler.avoided(),
+        'sensor_dropouts': robot.ultrasonic.dropouts,
+        'skipped_settles': robot.motion.skipped_settles,
+        'odometry_error': float(pose_error),
+        'state_time': {state.value: t for state, t in robot.fsm.durations().items()},
+        'step_time': {step.value: t for step, t in robot.steps.durations().items()},
+        'wall_time': time.perf_counter() - wall_start,
+    })
+    return metrics
+
+
+def _odometry_error(robot, world):
+    """Erro (dx, dy) da odometria, trazendo a pose estimada para o mundo"""
+    x0, y0, theta0 = world.start_pose
+    ox, oy, _ = robot.odometry.get_pose()
+    cos_t = np.cos(theta0)
+    sin_t = np.sin(theta0)
+    ex = x0 + ox * cos_t - oy * sin_t
+    ey = y0 + ox * sin_t + oy * cos_t
+    return ex - world.x, ey - world.y
@@ -0,0 +1,284 @@
+"""
+sim/optimize.py
+===============
+Otimizador dos parâmetros de manobra por simulação
+
+Procura TURN_90_TIME, SIDEWAYS_TIME, SEARCH_SPEED e SCAN_SPEED que
+minimizam o tempo até a cobertura alvo. Cada candidato roda nos mesmos
+cenários (sementes + patinagem/erro de rodas sorteados), para que a
+comparação seja justa e o resultado robusto à patinagem.
+
+Busca:
+    1. Aleatória (n_init candidatos)
+    2. Bayesiana: processo gaussiano sobre os resultados e próximo
+       candidato pela melhoria esperada (EI)
+
+Uso:
+    python -m sim.optimize --iterations 40 --scenarios 8
+    python -m sim.optimize --random-only --output profiles/rapido.json
+
+    ROBOT_PROFILE=profiles/otimizado.json python3 main.py
+"""
+
+import argparse
+import json
+import math
+import os
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from config import TURN_90_TIME, SIDEWAYS_TIME, SEARCH_SPEED, SCAN_SPEED
+from .mission import run_mission
+
+
+# Espaço de busca: nome do parâmetro do Robot -> (constante, mín, máx, inteiro)
+SPACE = {
+    'turn_90_time': ('TURN_90_TIME', 1.5, 4.0, False),
+    'sideways_time': ('SIDEWAYS_TIME', 0.3, 1.5, False),
+    'search_speed': ('SEARCH_SPEED', 30, 80, True),
+    'scan_speed': ('SCAN_SPEED', 20, 70, True),
+}
+
+CURRENT = {
+    'turn_90_time': TURN_90_TIME,
+    'sideways_time': SIDEWAYS_TIME,
+    'search_speed': SEARCH_SPEED,
+    'scan_speed': SCAN_SPEED,
+}
+
+# Faixas da amostragem de robustez (física real por cenário)
+ROBUSTNESS = {
+    'slip_noise': (0.0, 0.06),
+    'wheel_bias': (-0.03, 0.03),
+    'speed_error': (-0.05, 0.05),
+}
+
+
+# ==================== ESPAÇO DE BUSCA ====================
+
+def _to_unit(params):
+    """dict de parâmetros -> vetor em [0, 1]^d"""
+    return np.array([(params[name] - lo) / (hi - lo)
+                     for name, (_, lo, hi, _) in SPACE.items()])
+
+
+def _from_unit(u):
+    """vetor em [0, 1]^d -> dict de parâmetros (inteiros arredondados)"""
+    params = {}
+    for value, (name, (_, lo, hi, integer)) in zip(u, SPACE.items()):
+        x = lo + float(np.clip(value, 0.0, 1.0)) * (hi - lo)
+        params[name] = int(round(x)) if integer else round(x, 3)
+    return params
+
+
+def make_scenarios(count, seed=0):
+    """
+    Cenários fixos de robustez (iguais para todos os candidatos).
+
+    Returns:
+        list: [(semente, world_params), ...]
+    """
+    rng = np.random.default_rng(seed)
+    scenarios = []
+    for i in range(count):
+        world = {key: float(rng.uniform(lo, hi)) for key, (lo, hi) in ROBUSTNESS.items()}
+        scenarios.append((seed * 1000 + i, world))
+    return scenarios
+
+
+# ==================== AVALIAÇÃO ====================
+
+def mission_cost(metrics, target, max_time):
+    """
+    Custo de uma missão (s): tempo até a cobertura alvo.
+
+    Sem atingir o alvo: max_time acrescido da falta de cobertura, para
+    ainda ordenar os candidatos. Queda da placa: 3x max_time.
+    """
+    if metrics['fell_off']:
+        return 3.0 * max_time
+    key = {0.90: 'time_to_90', 0.95: 'time_to_95'}.get(target)
+    reached = metrics[key] if key else None
+    if reached is not None:
+        return reached
+    return max_time * (1.0 + max(0.0, target - metrics['coverage']) * 10.0)
+
+
+def _run(job):
+    params, world_params, seed, target, max_time = job
+    metrics = run_mission(params, world_params, seed=seed, max_time=max_time)
+    return mission_cost(metrics, target, max_time), metrics
+
+
+def evaluate(pool, params, scenarios, target, max_time, risk=1.0):
+    """
+    Roda o candidato em todos os cenários.
+
+    Returns:
+        dict: {'params', 'score', 'mean', 'std', 'worst', 'coverage', 'fell_off'}
+    """
+    jobs = [(params, world, seed, target, max_time) for seed, world in scenarios]
+    results = pool.map(_run, jobs) if pool is not None else [_run(j) for j in jobs]
+    costs = np.array([cost for cost, _ in results])
+
+    return {
+        'params': params,
+        'score': float(costs.mean() + risk * costs.std()),
+        'mean': float(costs.mean()),
+        'std': float(costs.std()),
+        'worst': float(costs.max()),
+        'coverage': float(np.mean([m['coverage'] for _, m in results])),
+        'fell_off': int(sum(m['fell_off'] for _, m in results)),
+    }
+
+
+# ==================== PROCESSO GAUSSIANO ====================
+
+def _kernel(a, b, length_scale):
+    d2 = ((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=2)
+    return np.exp(-0.5 * d2 / length_scale ** 2)
+
+
+def _gp_posterior(X, y, candidates, length_scale=0.25, noise=1e-3):
+    """Média e desvio do GP (y normalizado) nos candidatos"""
+    mean_y = y.mean()
+    std_y = y.std() or 1.0
+    yn = (y - mean_y) / std_y
+
+    K = _kernel(X, X, length_scale) + noise * np.eye(len(X))
+    L = np.linalg.cholesky(K)
+    alpha = np.linalg.solve(L.T, np.linalg.solve(L, yn))
+
+    Ks = _kernel(candidates, X, length_scale)
+    mu = Ks @ alpha
+    v = np.linalg.solve(L, Ks.T)
+    var = np.maximum(1e-12, 1.0 - (v ** 2).sum(axis=0))
+    return mu * std_y + mean_y, np.sqrt(var) * std_y
+
+
+def _expected_improvement(mu, sigma, best):
+    """EI para minimização"""
+    z = (best - mu) / sigma
+    cdf = 0.5 * (1.0 + np.vectorize(math.erf)(z / math.sqrt(2.0)))
+    pdf = np.exp(-0.5 * z ** 2) / math.sqrt(2.0 * math.pi)
+    return (best - mu) * cdf + sigma * pdf
+
+
+def propose(history, rng, n_candidates=2000):
+    """Próximo candidato pela máxima melhoria esperada"""
+    X = np.array([_to_unit(h['params']) for h in history])
+    y = np.array([h['score'] for h in history])
+    candidates = rng.random((n_candidates, len(SPACE)))
+    mu, sigma = _gp_posterior(X, y, candidates)
+    ei = _expected_improvement(mu, sigma, y.min())
+    return _from_unit(candidates[int(np.argmax(ei))])
+
+
+# ==================== PERFIL ====================
+
+def write_profile(path, best, baseline, settings):
+    """
+    Salva o melhor candidato como perfil carregável por config.py.
+
+    Chaves em maiúsculas = constantes do config; '_meta' = contexto.
+    """
+    profile = {SPACE[name][0]: value for name, value in best['params'].items()}
+    profile['_meta'] = {
+        'score': best['score'],
+        'mean_time': best['mean'],
+        'coverage': best['coverage'],
+        'baseline_score': baseline['score'],
+        'baseline_params': baseline['params'],
+        'settings': settings,
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(profile, f, indent=2)
+
+
+# ==================== PRINCIPAL ====================
+
+def _format(result):
+    p = result['params']
+    return (f"T90={p['turn_90_time']:.2f}s lateral={p['sideways_time']:.2f}s "
+            f"busca={p['search_speed']:3d}% scan={p['scan_speed']:3d}% | "
+            f"custo {result['score']/60:6.1f} min (média {result['mean']/60:5.1f}, "
+            f"±{result['std']/60:4.1f}) | cobertura {result['coverage']*100:4.1f}% | "
+            f"quedas {result['fell_off']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Otimizador de parâmetros de manobra")
+    parser.add_argument('--iterations', type=int, default=40,
+                        help="candidatos avaliados (inclui os aleatórios)")
+    parser.add_argument('--init', type=int, default=10,
+                        help="candidatos aleatórios antes da busca bayesiana")
+    parser.add_argument('--random-only', action='store_true',
+                        help="só busca aleatória")
+    parser.add_argument('--scenarios', type=int, default=8,
+                        help="cenários de patinagem por candidato")
+    parser.add_argument('--target', type=float, default=0.90, choices=(0.90, 0.95),
+                        help="cobertura alvo")
+    parser.add_argument('--max-time', type=float, default=1800,
+                        help="tempo simulado máximo por missão (s)")
+    parser.add_argument('--risk', type=float, default=1.0,
+                        help="peso do desvio padrão no custo (robustez)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None,
+                        help="processos (padrão: um por CPU, 1 = sem pool)")
+    parser.add_argument('--output', default='profiles/otimizado.json')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    scenarios = make_scenarios(args.scenarios, args.seed)
+    settings = {key: getattr(args, key) for key in
+                ('iterations', 'init', 'random_only', 'scenarios', 'target',
+                 'max_time', 'risk', 'seed')}
+
+    pool = Pool(args.workers) if args.workers != 1 else None
+    start = time.perf_counter()
+    try:
+        def run(params):
+            return evaluate(pool, params, scenarios, args.target, args.max_time, args.risk)
+
+        print(f"Cenários: {args.scenarios} | alvo {args.target*100:.0f}% | "
+              f"{args.iterations} candidatos")
+        baseline = run(dict(CURRENT))
+        print(f"[config atual] {_format(baseline)}")
+
+        history = [baseline]
+        for i in range(args.iterations):
+            if args.random_only or len(history) < args.init:
+                params = _from_unit(rng.random(len(SPACE)))
+                kind = "aleatório"
+            else:
+                params = propose(history, rng)
+                kind = "bayesiano"
+            result = run(params)
+            history.append(result)
+            marker = " *" if result['score'] == min(h['score'] for h in history) else ""
+            print(f"[{i + 1:3d} {kind:9s}] {_format(result)}{marker}")
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    best = min(history, key=lambda h: h['score'])
+    missions = len(history) * len(scenarios)
+    wall = time.perf_counter() - start
+
+    print("\n" + "="*60)
+    print(f"{missions} missões em {wall:.0f}s ({missions / wall * 60:.0f} missões/min)")
+    print(f"Atual:  {_format(baseline)}")
+    print(f"Melhor: {_format(best)}")
+    write_profile(args.output, best, baseline, settings)
+    print(f"Perfil salvo em {args.output} (ROBOT_PROFILE={args.output} python3 main.py)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""
+sim/replay.py
+=============
+Replay determinístico de um traço gravado (telemetria) através do Robot
+
+Cada registro do gravador de voo tem a distância que a máquina de
+estados usou e o resultado da visão. O replay reconstrói o Robot sobre
+um relógio virtual, devolve esses valores pelos drivers de replay no
+mesmo instante de cada iteração gravada e captura os comandos que a
+lógica produz (estado, passo, duties, vassouras) para comparar com a
+gravação. Uma missão de 20 minutos roda em segundos.
+
+Serve para depurar um voo (o Robot fica disponível para inspeção no
+ponto da divergência) e como teste de regressão da lógica: o mesmo
+traço, depois de uma mudança no código, deve produzir os mesmos
+comandos.
+
+O traço precisa cobrir a missão desde o início (anel sem volta). Os
+parâmetros do robô vêm do cabeçalho da gravação; --set muda algum.
+Traços do simulador (python -m sim --record) reproduzem exatamente;
+traços do robô real rodaram no executivo multi-taxa (movimentos
+avançados a 50Hz) e podem divergir nos instantes em que primitivas
+terminam.
+
+Uso:
+    python -m sim --seed 3 --record voo.tlm
+    python -m sim.replay voo.tlm
+    python -m sim.replay voo.tlm --set turn_90_time=2.4    # efeito de uma mudança
+"""
+
+import argparse
+import sys
+import time
+import os
+from contextlib import nullcontext, redirect_stdout
+from types import SimpleNamespace
+
+import numpy as np
+
+import logger
+from hardware.clock import VirtualClock
+from logic import RobotState
+from logic.states import RepositionStep
+from telemetry import MemoryRecorder, load, describe, FLAG_BRUSHING, NO_VISION
+from .drivers import SimBrushes
+from .mission import build_robot, parse_overrides
+
+
+# Campos comparados entre gravação e replay
+COMPARED = ('state', 'step', 'left_duty', 'right_duty', 'vision', 'brushing')
+
+
+class TracePlayer:
+    """Cursor sobre os registros gravados, compartilhado pelos drivers"""
+
+    def __init__(self, records):
+        self.records = records
+        self.index = 0
+
+    def value(self, field, index=None):
+        """Valor do campo no registro atual (ou no índice dado)"""
+        return self.records[field][self.index if index is None else index]
+
+
+class ReplayUltrasonic:
+    """Devolve a distância filtrada gravada na iteração atual"""
+
+    def __init__(self, player):
+        self.player = player
+        self.readings = 0
+        self.dropouts = 0
+
+    def get_distance(self):
+        self.readings += 1
+        distance = float(self.player.value('distance'))
+        return float('inf') if distance < 0 else distance
+
+
+class ReplayCamera:
+    """
+    Devolve o resultado de visão gravado.
+
+    A visão roda depois da máquina de estados, e o resultado aparece no
+    registro da iteração seguinte: a chamada na iteração k lê o registro
+    k+1. Uma verificação que não existe na gravação retorna LIMPA e é
+    contada em unexpected.
+    """
+
+    def __init__(self, player):
+        self.player = player
+        self.camera_ready = True
+        self.checks = 0
+        self.unexpected = 0
+        self.last_probability = None
+
+    def detect_target(self):
+        self.checks += 1
+        following = self.player.index + 1
+        if following >= len(self.player.records):
+            vision = NO_VISION
+        else:
+            vision = int(self.player.value('vision', following))
+        if vision == NO_VISION:
+            self.unexpected += 1
+            self.last_probability = None
+            return False
+        probability = float(self.player.value('dirt_prob', following))
+        self.last_probability = probability if probability >= 0 else None
+        return bool(vision)
+
+    def cleanup(self):
+        pass
+
+
+def build_replay(records, params=None):
+    """
+    Robot com drivers de replay sobre um relógio virtual.
+
+    Args:
+        records: registros (telemetry.load), começando no início da missão
+        params: parâmetros do robô (sobrescrevem ROBOT_DEFAULTS)
+
+    Returns:
+        tuple: (robot, player, clock)
+    """
+    starts = records['t'] - records['tick_time'].astype('f8')
+    clock = VirtualClock(start=float(starts[0]))
+    player = TracePlayer(records)
+
+    # Vassouras com os tempos bloqueantes reais; sem mundo para limpar
+    brushes = SimBrushes(SimpleNamespace(brushing=False), clock)
+    robot = build_robot(params, clock, brushes=brushes,
+                        ultrasonic=ReplayUltrasonic(player),
+                        camera=ReplayCamera(player))
+    return robot, player, clock
+
+
+def replay(records, params=None, quiet=True):
+    """
+    Passa o traço pelo Robot e captura os comandos de cada iteração.
+
+    Args:
+        records: registros gravados (telemetry.load)
+        params: parâmetros do robô (ex: meta['params'] da gravação)
+        quiet: silencia os logs do robô
+
+    Returns:
+        tuple: (meta, registros do replay, robot, tempo de parede em s)
+
+    Raises:
+        ValueError: traço vazio ou sem o início da missão
+    """
+    if len(records) == 0:
+        raise ValueError("Traço vazio")
+    if records['seq'][0] != 0:
+        raise ValueError(f"Traço começa no registro #{records['seq'][0]}: "
+                         f"o anel deu a volta e o início da missão se perdeu")
+
+    wall_start = time.perf_counter()
+    starts = records['t'] - records['tick_time'].astype('f8')
+
+    output = open(os.devnull, 'w') if quiet else None
+    with (redirect_stdout(output) if quiet else nullcontext()), \
+            (logger.silenced() if quiet else nullcontext()):
+        robot, player, clock = build_replay(records, params)
+        capture = MemoryRecorder(capacity=len(records) + 1,
+                                 states=RobotState, steps=RepositionStep)
+        robot.recorder = capture
+
+        robot.running = True
+        for index in range(len(records)):
+            if not robot.running:
+                break
+            player.index = index
+            clock.advance_to(float(starts[index]))
+            robot.main_loop()
+        robot.motion.cancel()
+
+    if output is not None:
+        output.close()
+
+    meta, replayed = capture.load()
+    return meta, replayed, robot, time.perf_counter() - wall_start
+
+
+def _names(meta, key, indices):
+    """Índices de estado/passo -> nomes (valores dos Enums)"""
+    table = np.full(256, '-', dtype=object)
+    table[:len(meta[key])] = meta[key]
+    return table[indices]
+
+
+def _columns(meta, records):
+    return {
+        'state': _names(meta, 'states', records['state']),
+        'step': _names(meta, 'steps', records['step']),
+        'left_duty': records['left_duty'],
+        'right_duty': records['right_duty'],
+        'vision': records['vision'],
+        'brushing': (records['flags'] & FLAG_BRUSHING) != 0,
+    }
+
+
+def compare(meta, recorded, replay_meta, replayed):
+    """
+    Compara os comandos iteração a iteração.
+
+    Estados e passos são comparados pelo nome, então o traço continua
+    válido se a ordem dos Enums mudar.
+
+    Returns:
+        dict: {'ticks', 'recorded', 'replayed', 'mismatches' {campo: n},
+               'first' (índice da primeira divergência ou None),
+               'max_dt' (maior diferença de instante, s)}
+    """
+    n = min(len(recorded), len(replayed))
+    a = _columns(meta, recorded[:n])
+    b = _columns(replay_meta, replayed[:n])
+
+    differs = np.zeros(n, dtype=bool)
+    mismatches = {}
+    for field in COMPARED:
+        diff = a[field] != b[field]
+        mismatches[field] = int(np.count_nonzero(diff))
+        differs |= diff
+
+    first = int(np.argmax(differs)) if differs.any() else None
+    if first is None and len(recorded) != len(replayed):
+        first = n
+
+    return {
+        'ticks': n,
+        'recorded': len(recorded),
+        'replayed': len(replayed),
+        'mismatches': mismatches,
+        'first': first,
+        'max_dt': float(np.max(np.abs(recorded['t'][:n] - replayed['t'][:n]))) if n else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay de um traço de telemetria")
+    parser.add_argument('path', help="arquivo .tlm (gravador de voo)")
+    parser.add_argument('--set', action='append', metavar='PARAM=VALOR',
+                        help="parâmetro do robô no replay (ver ROBOT_DEFAULTS)")
+    parser.add_argument('--context', type=int, default=3,
+                        help="iterações mostradas em volta da divergência")
+    parser.add_argument('--verbose', action='store_true', help="logs do robô")
+    args = parser.parse_args()
+
+    if args.verbose:
+        logger.configure(debug=True)
+
+    meta, recorded = load(args.path)
+    params = dict(meta.get('params', {}), **parse_overrides(args.set))
+    replay_meta, replayed, robot, wall = replay(recorded, params,
+                                                quiet=not args.verbose)
+    result = compare(meta, recorded, replay_meta, replayed)
+    logger.flush()
+
+    sim_time = float(recorded['t'][-1] - recorded['t'][0])
+    print(f"{args.path}: {result['recorded']} iterações ({sim_time/60:.1f} min) "
+          f"reproduzidas em {wall:.2f}s ({sim_time / wall:.0f}x tempo real)")
+    print(f"  Replay: {result['replayed']} iterações | visões fora da gravação: "
+          f"{robot.camera.unexpected} | maior diferença de instante: "
+          f"{result['max_dt']*1000:.3f}ms")
+
+    first = result['first']
+    if first is None:
+        print("  Comandos idênticos à gravação")
+        return 0
+
+    counts = ", ".join(f"{field} {n}" for field, n in result['mismatches'].items() if n)
+    print(f"  DIVERGÊNCIA na iteração #{first}"
+          + (f" ({counts})" if counts else " (tamanhos diferentes)"))
+    for index in range(max(0, first - args.context), first + args.context + 1):
+        marker = '>' if index == first else ' '
+        if index < len(recorded):
+            print(f"  {marker} gravado  {describe(meta, recorded[index])}")
+        if index < len(replayed):
+            print(f"  {marker} replay   {describe(replay_meta, replayed[index])}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
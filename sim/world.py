@@ -0,0 +1,219 @@
+"""
+sim/world.py
+============
+Mundo 2-D: arranjo de placas com frestas, sujeira sintética e o
+movimento real (com patinagem) do robô
+"""
+
+import math
+
+import numpy as np
+
+from logic.coverage import CoverageMap
+
+
+class PanelArray:
+    """
+    Placas retangulares em grade, separadas por frestas.
+
+    Referencial do mundo: x ao longo do comprimento das placas (colunas),
+    y ao longo da largura (linhas), origem no canto da primeira placa.
+    """
+
+    def __init__(self, rows=1, cols=1, panel_size=(165, 99), gap=2.0):
+        """
+        Args:
+            rows: placas na direção y
+            cols: placas na direção x
+            panel_size: (comprimento x, largura y) de cada placa (cm)
+            gap: fresta entre placas vizinhas (cm)
+        """
+        self.rows = rows
+        self.cols = cols
+        self.panel_size = panel_size
+        self.gap = gap
+
+        self.length = cols * panel_size[0] + (cols - 1) * gap
+        self.width = rows * panel_size[1] + (rows - 1) * gap
+
+    def _inside(self, u, size, count):
+        """Coordenada u (cm) cai sobre uma placa nesse eixo?"""
+        total = count * size + (count - 1) * self.gap
+        cell = np.mod(u, size + self.gap)
+        return (u >= 0) & (u <= total) & (cell <= size)
+
+    def on_panel(self, x, y):
+        """True se o ponto (x, y) está sobre vidro (fora das frestas)"""
+        return bool(self._inside(x, self.panel_size[0], self.cols)
+                    and self._inside(y, self.panel_size[1], self.rows))
+
+    def in_bounds(self, x, y):
+        """True se o ponto está dentro do contorno do arranjo"""
+        return 0 <= x <= self.length and 0 <= y <= self.width
+
+    def mask(self, xs, ys):
+        """Grade bool (len(xs), len(ys)) de células sobre vidro"""
+        mx = self._inside(xs, self.panel_size[0], self.cols)
+        my = self._inside(ys, self.panel_size[1], self.rows)
+        return mx[:, None] & my[None, :]
+
+
+class SimWorld:
+    """
+    Estado verdadeiro do mundo simulado.
+
+    `model` é a física real do robô (não a calibração em que o Robot
+    acredita). Sobre ela o corpo anda com erro de velocidade
+    (speed_error), diferença fixa entre as rodas (wheel_bias) e
+    patinagem aleatória (slip_noise) - é isso que separa a pose da
+    odometria da pose verdadeira.
+
+    A verdade de cobertura e sujeira usa um CoverageMap no referencial
+    do mundo: `dirt` é a sujeira real (0-1), limpa pelas vassouras.
+    """
+
+    def __init__(self, panels, model, start_pose=(20.0, 20.0, 0.0),
+                 speed_error=0.0, wheel_bias=0.0, slip_noise=0.02,
+                 dirt_patches=3, dirt_level=0.05, coverage_config=None,
+                 max_step=0.1, rng=None):
+        """
+        Args:
+            panels: PanelArray
+            model: DifferentialDriveModel com a física real
+            start_pose: pose inicial verdadeira (x, y, θ) no mundo
+            speed_error: erro relativo da velocidade real (0.1 = 10% mais rápido)
+            wheel_bias: diferença relativa direita - esquerda (deriva em curva)
+            slip_noise: desvio padrão da patinagem por passo de integração
+            dirt_patches: número de manchas de sujeira
+            dirt_level: sujeira de fundo no vidro (0-1)
+            coverage_config: dict do CoverageMap (footprints; size/origin
+                             são calculados a partir do arranjo)
+            max_step: maior passo de integração (s)
+            rng: numpy Generator (reprodutibilidade)
+        """
+        self.panels = panels
+        self.model = model
+        self.speed_error = speed_error
+        self.wheel_bias = wheel_bias
+        self.slip_noise = slip_noise
+        self.max_step = max_step
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        self.start_pose = start_pose
+        self.x, self.y, self.theta = start_pose
+        self.brushing = False
+        self.distance = 0.0
+        self._unstamped = 0.0   # Tempo desde o último carimbo de cobertura
+
+        # Verdade de cobertura: grade cobrindo o arranjo com margem
+        config = dict(coverage_config or {})
+        config.pop('size', None)
+        config.pop('origin', None)
+        config.pop('grow', None)    # Grade fixa: panel_mask e dirt presos a ela
+        margin = 30.0
+        self.truth = CoverageMap(
+            size=(panels.length + 2 * margin, panels.width + 2 * margin),
+            origin=(-margin, -margin),
+            **config
+        )
+        self.panel_mask = panels.mask(self.truth.xs, self.truth.ys)
+        self.panel_cells = int(np.count_nonzero(self.panel_mask))
+
+        self.truth.dirt[:] = self._make_dirt(dirt_patches, dirt_level)
+        self.initial_dirt = float(self.truth.dirt.sum())
+
+    def _make_dirt(self, patches, level):
+        """Fundo uniforme + manchas gaussianas, só sobre vidro"""
+        xs = self.truth.xs[:, None]
+        ys = self.truth.ys[None, :]
+        dirt = np.full(self.panel_mask.shape, level, dtype=np.float32)
+
+        for _ in range(patches):
+            cx = self.rng.uniform(0, self.panels.length)
+            cy = self.rng.uniform(0, self.panels.width)
+            sigma = self.rng.uniform(10, 30)
+            dirt += np.exp(-((xs - cx) ** 2 + (ys - cy) ** 2) / (2 * sigma ** 2))
+
+        return np.clip(dirt, 0.0, 1.0) * self.panel_mask
+
+    # ------------------------------------------------------------------
+    # Movimento
+    # ------------------------------------------------------------------
+
+    def step(self, dt, left_duty, right_duty):
+        """
+        Integra o corpo real por dt com os duties aplicados.
+
+        Intervalos longos (sleeps bloqueantes) são divididos em passos
+        de no máximo max_step para o footprint não pular células; o
+        carimbo na verdade de cobertura (a parte cara) acontece uma vez
+        a cada max_step de tempo simulado.
+        """
+        steps = max(1, int(math.ceil(dt / self.max_step)))
+        h = dt / steps
+        for _ in range(steps):
+            if left_duty or right_duty:
+                self._integrate(left_duty, right_duty, h)
+            self._unstamped += h
+            if self._unstamped >= self.max_step:
+                self.truth.update(self.get_pose(), brushing=self.brushing)
+                self._unstamped = 0.0
+
+    def _integrate(self, left_duty, right_duty, dt):
+        """Arco exato com velocidades reais (erro + patinagem)"""
+        gain = 1.0 + self.speed_error
+        slip_l, slip_r = self.rng.normal(0.0, self.slip_noise, 2)
+        d_left = self.model.wheel_speed(left_duty) * dt * gain * (1 - self.wheel_bias / 2 + slip_l)
+        d_right = self.model.wheel_speed(right_duty) * dt * gain * (1 + self.wheel_bias / 2 + slip_r)
+
+        d = (d_left + d_right) / 2.0
+        d_theta = (d_right - d_left) / self.model.wheel_base
+        if abs(d_theta) < 1e-9:
+            self.x += d * math.cos(self.theta)
+            self.y += d * math.sin(self.theta)
+        else:
+            chord = 2.0 * d / d_theta * math.sin(d_theta / 2.0)
+            self.x += chord * math.cos(self.theta + d_theta / 2.0)
+            self.y += chord * math.sin(self.theta + d_theta / 2.0)
+        self.theta = math.atan2(math.sin(self.theta + d_theta),
+                                math.cos(self.theta + d_theta))
+        self.distance += (abs(d_left) + abs(d_right)) / 2.0
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def get_pose(self):
+        """Pose verdadeira (x, y, θ)"""
+        return (self.x, self.y, self.theta)
+
+    def point_ahead(self, offset):
+        """Ponto a offset cm à frente do centro do robô"""
+        return (self.x + offset * math.cos(self.theta),
+                self.y + offset * math.sin(self.theta))
+
+    def fell_off(self):
+        """True se o centro do robô saiu do contorno do arranjo"""
+        return not self.panels.in_bounds(self.x, self.y)
+
+    def dirt_under_camera(self):
+        """Sujeira média real na área vista pela câmera"""
+        cells = self.truth._footprint(self.get_pose(), self.truth.camera_size,
+                                      self.truth.camera_offset)
+        if cells is None:
+            return 0.0
+        sx, sy, mask = cells
+        if not mask.any():
+            return 0.0
+        return float(self.truth.dirt[sx, sy][mask].mean())
+
+    def panel_coverage(self, layer='visited'):
+        """Fração do vidro coberta (sem contar margem e frestas)"""
+        covered = self.truth._layer_mask(layer) & self.panel_mask
+        return float(np.count_nonzero(covered)) / self.panel_cells
+
+    def dirt_removed(self):
+        """Fração da sujeira inicial já removida"""
+        if self.initial_dirt <= 0:
+            return 1.0
+        return 1.0 - float(self.truth.dirt.sum()) / self.initial_dirt
@@ -0,0 +1,333 @@
+"""
+telemetry.py
+============
+Gravador de voo: telemetria binária num arquivo-anel mapeado em memória
+
+Cada iteração da máquina de estados grava um registro de tamanho fixo
+(48 bytes) num anel dentro de um arquivo mmap. Gravar é copiar bytes
+para a memória - nenhuma chamada de sistema por iteração - e as páginas
+pertencem ao kernel: se o programa travar ou for morto, o arquivo
+continua com os últimos `capacity` registros para inspeção.
+
+Layout do arquivo:
+    [cabeçalho 4096 bytes][registro 0][registro 1]...[registro capacity-1]
+
+    Cabeçalho: magic 'TLM1', versão, tamanhos, capacidade, total de
+    registros gravados (atualizado a cada registro) e um JSON com os
+    nomes dos campos, estados e passos de manobra.
+
+Uso:
+    recorder = FlightRecorder('telemetry.tlm', capacity=36000)
+    robot = Robot(..., recorder=recorder)
+
+    python3 telemetry.py telemetry.tlm --last 50
+    python3 telemetry.py telemetry.tlm --csv > voo.csv
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+
+
+MAGIC = b'TLM1'
+VERSION = 2
+VERSIONS = (1, 2)      # Lidas por parse(); v1 sem dirt_prob (reservado)
+HEADER_SIZE = 4096
+
+# magic, versão, tamanho do cabeçalho, tamanho do registro, capacidade,
+# registros gravados, criação (epoch), tamanho do JSON
+HEADER = struct.Struct('<4sHHIIQdI')
+COUNT_OFFSET = 16
+META_OFFSET = 64
+
+# Registro (48 bytes, little-endian, sem alinhamento)
+RECORD = struct.Struct('<dIBBBbbbBB7f')
+FIELDS = (
+    ('t', 'f8'),                # Relógio do robô (s)
+    ('seq', 'u4'),              # Número do registro
+    ('state', 'u1'),            # Índice em meta['states']
+    ('step', 'u1'),             # Índice em meta['steps'], NO_STEP fora de manobra
+    ('flags', 'u1'),            # FLAG_*
+    ('vision', 'i1'),           # -1 sem verificação, 0 limpa, 1 suja
+    ('left_duty', 'i1'),        # Duty comandado (-100 a 100)
+    ('right_duty', 'i1'),
+    ('lost_count', 'u1'),       # Contador anti-interferência
+    ('brush_speed', 'u1'),      # Velocidade das vassouras (0-100)
+    ('raw_distance', 'f4'),     # Última leitura do ultrassônico (cm)
+    ('distance', 'f4'),         # Leitura filtrada usada pela máquina (cm)
+    ('x', 'f4'),                # Pose da odometria (cm, cm, rad)
+    ('y', 'f4'),
+    ('theta', 'f4'),
+    ('tick_time', 'f4'),        # Duração da iteração (s)
+    ('dirt_prob', 'f4'),        # Probabilidade de sujeira da visão, NO_PROB sem verificação
+)
+
+NO_STEP = 255
+NO_VISION = -1
+NO_PROB = -1.0
+
+FLAG_ON_PANEL = 1
+FLAG_BRUSHING = 2
+FLAG_DIRT = 4
+FLAG_MOTION_BUSY = 8
+FLAG_PLANNED = 16
+FLAG_SERVO_DOWN = 32
+
+FLAG_NAMES = (
+    (FLAG_ON_PANEL, 'placa'),
+    (FLAG_BRUSHING, 'vassouras'),
+    (FLAG_DIRT, 'sujeira'),
+    (FLAG_MOTION_BUSY, 'movimento'),
+    (FLAG_PLANNED, 'plano'),
+    (FLAG_SERVO_DOWN, 'servo'),
+)
+
+
+class FlightRecorder:
+    """
+    Anel de registros de telemetria num arquivo mmap.
+
+    O arquivo anterior com o mesmo nome é preservado como '<nome>.prev'
+    (o voo que travou não é sobrescrito pelo próximo).
+    """
+
+    def __init__(self, path, capacity=36000, states=(), steps=(), params=None):
+        """
+        Args:
+            path: arquivo do anel
+            capacity: número de registros (36000 = 1h a 10Hz, ~1.7MB)
+            states: Enum (ou lista) dos estados do robô
+            steps: Enum (ou lista) dos passos de manobra
+            params: parâmetros do Robot (dict JSON) guardados no cabeçalho
+                    para o replay (sim.replay) reconstruir o mesmo robô
+        """
+        meta = self._setup(capacity, states, steps, params)
+        self.path = path
+
+        if os.path.exists(path):
+            os.replace(path, path + '.prev')
+
+        size = HEADER_SIZE + capacity * RECORD.size
+        self._file = open(path, 'w+b')
+        self._file.truncate(size)
+        self._mm = mmap.mmap(self._file.fileno(), size)
+        self._write_header(meta)
+
+    def _setup(self, capacity, states, steps, params=None):
+        """Valida a capacidade e monta os índices e o JSON de metadados"""
+        if capacity < 1:
+            raise ValueError("capacity deve ser >= 1")
+
+        self.capacity = capacity
+        self.count = 0
+
+        self.states = {state: i for i, state in enumerate(states)}
+        self.steps = {step: i for i, step in enumerate(steps)}
+        meta = json.dumps({
+            'fields': [name for name, _ in FIELDS],
+            'states': [getattr(s, 'value', str(s)) for s in states],
+            'steps': [getattr(s, 'value', str(s)) for s in steps],
+            'flags': {name: bit for bit, name in FLAG_NAMES},
+            'params': params or {},
+        }).encode('utf-8')
+        if META_OFFSET + len(meta) > HEADER_SIZE:
+            raise ValueError("Metadados não cabem no cabeçalho")
+        return meta
+
+    def _write_header(self, meta):
+        HEADER.pack_into(self._mm, 0, MAGIC, VERSION, HEADER_SIZE, RECORD.size,
+                         self.capacity, 0, time.time(), len(meta))
+        self._mm[META_OFFSET:META_OFFSET + len(meta)] = meta
+
+    def record(self, t, state, step, flags, vision, left_duty, right_duty,
+               lost_count, brush_speed, raw_distance, distance, x, y, theta,
+               tick_time, dirt_prob=None):
+        """
+        Grava um registro (só cópia em memória).
+
+        Args:
+            state, step: membros dos Enums (step None = fora de manobra)
+            vision: None sem verificação nesta iteração, senão bool
+            dirt_prob: probabilidade de sujeira dessa verificação (None = sem)
+            demais: ver FIELDS
+        """
+        if self._mm is None:
+            return
+        offset = HEADER_SIZE + (self.count % self.capacity) * RECORD.size
+        RECORD.pack_into(
+            self._mm, offset,
+            t, self.count & 0xFFFFFFFF,
+            self.states.get(state, NO_STEP),
+            NO_STEP if step is None else self.steps.get(step, NO_STEP),
+            flags,
+            NO_VISION if vision is None else int(vision),
+            _clamp_duty(left_duty), _clamp_duty(right_duty),
+            min(255, lost_count), int(brush_speed),
+            _finite(raw_distance), _finite(distance), x, y, theta, tick_time,
+            NO_PROB if dirt_prob is None else dirt_prob
+        )
+        self.count += 1
+        # Contador depois do registro: quem lê nunca vê um registro pela metade
+        struct.pack_into('<Q', self._mm, COUNT_OFFSET, self.count)
+
+    def flush(self):
+        """Força a escrita em disco (msync) - para sobreviver a queda de energia"""
+        if self._mm is not None:
+            self._mm.flush()
+
+    def close(self):
+        """Grava em disco e fecha o arquivo"""
+        if self._mm is None:
+            return
+        self._mm.flush()
+        self._mm.close()
+        self._file.close()
+        self._mm = None
+
+
+class MemoryRecorder(FlightRecorder):
+    """
+    Mesmo formato do FlightRecorder num buffer em memória, sem arquivo
+    (ex: capturar os comandos de um replay para comparar com o voo).
+    """
+
+    def __init__(self, capacity=36000, states=(), steps=(), params=None):
+        meta = self._setup(capacity, states, steps, params)
+        self.path = None
+        self._file = None
+        self._mm = bytearray(HEADER_SIZE + capacity * RECORD.size)
+        self._write_header(meta)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass    # O buffer continua legível por load()
+
+    def load(self):
+        """
+        Returns:
+            tuple: (meta dict, registros numpy) - como telemetry.load()
+        """
+        return parse(bytes(self._mm))
+
+
+def _clamp_duty(duty):
+    return max(-100, min(100, int(round(duty))))
+
+
+def _finite(value):
+    # inf (ainda sem leitura) vira um valor fora de faixa reconhecível
+    return value if value < 1e30 else -1.0
+
+
+# ==================== LEITURA ====================
+
+def load(path):
+    """
+    Lê um arquivo de telemetria (inclusive de um voo que travou).
+
+    Returns:
+        tuple: (meta dict, registros numpy estruturado em ordem cronológica)
+
+    Raises:
+        ValueError: arquivo não é telemetria
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    return parse(data, path)
+
+
+def parse(data, source='<memória>'):
+    """
+    Interpreta o conteúdo de um arquivo de telemetria.
+
+    Args:
+        data: bytes do arquivo (ou do buffer de um MemoryRecorder)
+        source: nome para as mensagens de erro
+
+    Returns:
+        tuple: (meta dict, registros numpy estruturado em ordem cronológica)
+
+    Raises:
+        ValueError: conteúdo não é telemetria
+    """
+    import numpy as np
+
+    if len(data) < HEADER_SIZE:
+        raise ValueError(f"{source}: arquivo curto demais")
+    magic, version, header_size, record_size, capacity, count, created, meta_len = \
+        HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{source}: não é um arquivo de telemetria")
+    if version not in VERSIONS or record_size != RECORD.size:
+        raise ValueError(f"{source}: versão {version} / registro {record_size}B não suportados")
+
+    meta = json.loads(data[META_OFFSET:META_OFFSET + meta_len].decode('utf-8'))
+    meta.update({'capacity': capacity, 'count': count, 'created': created})
+
+    dtype = np.dtype(list(FIELDS))
+    ring = np.frombuffer(data, dtype=dtype, count=capacity, offset=header_size)
+
+    if count <= capacity:
+        records = ring[:count]
+    else:
+        start = count % capacity
+        records = np.concatenate((ring[start:], ring[:start]))
+
+    # Descarta registros fora de sequência (gravação interrompida)
+    expected = (np.arange(count - len(records), count) & 0xFFFFFFFF).astype('u4')
+    records = records[records['seq'] == expected].copy()
+    if version == 1:
+        records['dirt_prob'] = NO_PROB     # Bytes reservados na v1
+    return meta, records
+
+
+def describe(meta, record):
+    """Linha legível de um registro"""
+    state = meta['states'][record['state']] if record['state'] < len(meta['states']) else '?'
+    step = meta['steps'][record['step']] if record['step'] < len(meta['steps']) else '-'
+    flags = ",".join(name for bit, name in FLAG_NAMES if record['flags'] & bit)
+    vision = {-1: '', 0: ' visão=LIMPA', 1: ' visão=SUJA'}[int(record['vision'])]
+    if vision and record['dirt_prob'] >= 0:
+        vision += f" (p={record['dirt_prob']:.2f})"
+    return (f"{record['t']:9.2f}s #{record['seq']:<7d} {state:16s} {step:16s} "
+            f"duty {record['left_duty']:4d}/{record['right_duty']:4d} | "
+            f"dist {record['raw_distance']:6.1f}/{record['distance']:6.1f}cm | "
+            f"pose ({record['x']:6.1f}, {record['y']:6.1f}, {record['theta']:5.2f}) | "
+            f"tick {record['tick_time']*1000:6.1f}ms | {flags}{vision}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Leitor do gravador de voo")
+    parser.add_argument('path', help="arquivo .tlm")
+    parser.add_argument('--last', type=int, default=None,
+                        help="só os últimos N registros")
+    parser.add_argument('--csv', action='store_true', help="saída em CSV")
+    args = parser.parse_args()
+
+    meta, records = load(args.path)
+    if args.last is not None:
+        records = records[-args.last:]
+
+    if args.csv:
+        names = [name for name in records.dtype.names if not name.startswith('_')]
+        print(",".join(names))
+        for record in records:
+            print(",".join(str(record[name]) for name in names))
+        return
+
+    print(f"{args.path}: {meta['count']} registros gravados "
+          f"(anel de {meta['capacity']}), início "
+          f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(meta['created']))}",
+          file=sys.stderr)
+    for record in records:
+        print(describe(meta, record))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""
+telemetry_report.py
+===================
+Para onde vai o tempo da missão: análise offline da telemetria
+
+Carrega o arquivo do gravador de voo em arrays NumPy e calcula, sem
+laços por registro:
+
+- tempo por estado e por passo de manobra
+- manobras (total, por placa, por hora, duração média)
+- perdas de placa falsas (filtro anti-interferência voltou a zero sem
+  manobra) x confirmadas
+- tempo de vassouras ligadas x tempo com sujeira detectada
+- verificações de visão e a latência de cada uma
+- área visitada / escovada por hora (footprints do COVERAGE_CONFIG)
+- duração das iterações e do período do loop
+
+Uso:
+    python3 telemetry_report.py telemetry.tlm
+    python3 telemetry_report.py telemetry.tlm --panels 4 --plot missao.png
+    python3 telemetry_report.py telemetry.tlm --json
+"""
+
+import argparse
+import json
+import sys
+
+import numpy as np
+
+from config import COVERAGE_CONFIG
+from telemetry import (load, NO_STEP, NO_VISION, FLAG_ON_PANEL, FLAG_BRUSHING,
+                       FLAG_DIRT, FLAG_MOTION_BUSY)
+
+try:
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    MATPLOTLIB_AVAILABLE = True
+except ImportError:
+    MATPLOTLIB_AVAILABLE = False
+
+
+MOVING = 'moving_to_target'
+REPOSITIONING = 'repositioning'
+
+
+def tick_durations(records):
+    """
+    Tempo representado por cada registro (até o próximo).
+
+    O último registro recebe o período mediano.
+
+    Returns:
+        numpy array (s)
+    """
+    t = records['t']
+    if len(t) < 2:
+        return np.zeros(len(t))
+    gaps = np.diff(t)
+    return np.append(gaps, np.median(gaps))
+
+
+def _time_by(indices, names, dt, skip=None):
+    """Soma dt por índice (estado ou passo) -> {nome: s} na ordem do Enum"""
+    totals = np.bincount(indices, weights=dt, minlength=256)
+    return {name: float(totals[i]) for i, name in enumerate(names)
+            if i != skip}
+
+
+def _entries(mask):
+    """Índices onde a máscara passa de False para True"""
+    rising = mask[1:] & ~mask[:-1]
+    return np.flatnonzero(rising) + 1
+
+
+def swept_area(records, mask, size, offset=0.0, resolution=2.0):
+    """
+    Área (cm²) varrida por um retângulo preso ao robô nas poses da máscara.
+
+    Amostra o retângulo em pontos espaçados de `resolution` em todas as
+    poses de uma vez e conta as células distintas da grade.
+
+    Args:
+        records: registros da telemetria
+        mask: registros considerados (bool)
+        size: (comprimento, largura) do retângulo (cm)
+        offset: centro à frente do robô (cm)
+        resolution: lado da célula (cm)
+
+    Returns:
+        float: área em cm²
+    """
+    poses = records[mask]
+    if len(poses) == 0:
+        return 0.0
+
+    along = np.arange(-size[0] / 2, size[0] / 2 + 1e-9, resolution) + offset
+    across = np.arange(-size[1] / 2, size[1] / 2 + 1e-9, resolution)
+    local_l, local_w = (a.ravel() for a in np.meshgrid(along, across))
+
+    x = poses['x'].astype('f8')[:, None]
+    y = poses['y'].astype('f8')[:, None]
+    cos_t = np.cos(poses['theta'].astype('f8'))[:, None]
+    sin_t = np.sin(poses['theta'].astype('f8'))[:, None]
+    gx = np.floor((x + local_l * cos_t - local_w * sin_t) / resolution).astype(np.int64)
+    gy = np.floor((y + local_l * sin_t + local_w * cos_t) / resolution).astype(np.int64)
+
+    cells = np.unique((gx << 32) ^ (gy & 0xFFFFFFFF))
+    return float(len(cells)) * resolution * resolution
+
+
+def analyze(meta, records, panels=1, coverage_config=None):
+    """
+    Métricas da missão.
+
+    Args:
+        meta, records: resultado de telemetry.load()
+        panels: número de placas da missão (manobras por placa)
+        coverage_config: footprints (padrão: os gravados no cabeçalho,
+                         senão COVERAGE_CONFIG)
+
+    Returns:
+        dict: métricas (tempos em s, áreas em m²)
+
+    Raises:
+        ValueError: telemetria vazia
+    """
+    if len(records) == 0:
+        raise ValueError("Telemetria sem registros")
+
+    cov = dict(COVERAGE_CONFIG)
+    cov.update(meta.get('params', {}).get('coverage_config') or {})
+    cov.update(coverage_config or {})
+
+    states = meta['states']
+    state_index = {name: i for i, name in enumerate(states)}
+    state = records['state']
+    flags = records['flags']
+    dt = tick_durations(records)
+    total = float(records['t'][-1] - records['t'][0] + dt[-1])
+    hours = total / 3600.0
+
+    moving = state == state_index.get(MOVING, -1)
+    repositioning = state == state_index.get(REPOSITIONING, -1)
+    on_panel = (flags & FLAG_ON_PANEL) != 0
+    brushing = (flags & FLAG_BRUSHING) != 0
+    dirt = (flags & FLAG_DIRT) != 0
+
+    # Manobras: entradas em REPOSITIONING
+    maneuvers = len(_entries(repositioning)) + int(repositioning[0])
+    maneuver_time = float(dt[repositioning].sum())
+
+    # Perdas de placa: o filtro conta leituras fora da placa em MOVING;
+    # voltar a zero ainda em MOVING = interferência (perda falsa)
+    lost = records['lost_count'] > 0
+    ends = np.flatnonzero(~lost[1:] & lost[:-1]) + 1
+    episodes_in_moving = ends[moving[ends - 1]]
+    false_losses = int(np.count_nonzero(moving[episodes_in_moving]))
+    confirmed_losses = len(episodes_in_moving) - false_losses
+
+    # Visão: resultado no registro seguinte à verificação; a latência é
+    # o intervalo entre as iterações além do período normal
+    starts = records['t'] - records['tick_time'].astype('f8')
+    gaps = starts[1:] - records['t'][:-1]
+    checked = records['vision'][1:] != NO_VISION
+    normal_gap = float(np.median(gaps[~checked])) if np.any(~checked) else 0.0
+    latency = gaps[checked] - normal_gap
+    check_times = records['t'][1:][checked]
+
+    # Área varrida (footprint do robô sobre a placa, vassouras ligadas)
+    resolution = cov['resolution']
+    visited = swept_area(records, on_panel, cov['robot_size'], 0.0, resolution)
+    brushed = swept_area(records, on_panel & brushing, cov['brush_size'],
+                         cov['brush_offset'], resolution)
+
+    period = np.diff(records['t'])
+    tick_time = records['tick_time'].astype('f8')
+
+    return {
+        'records': len(records),
+        'duration': total,
+        'state_time': _time_by(state, states, dt),
+        'step_time': _time_by(records['step'], meta['steps'], dt, skip=NO_STEP),
+        'maneuvers': maneuvers,
+        'maneuvers_per_panel': maneuvers / max(1, panels),
+        'maneuvers_per_hour': maneuvers / hours if hours else 0.0,
+        'maneuver_mean_time': maneuver_time / maneuvers if maneuvers else 0.0,
+        'motion_busy_moving': float(dt[moving & ((flags & FLAG_MOTION_BUSY) != 0)].sum()),
+        'false_losses': false_losses,
+        'confirmed_losses': confirmed_losses,
+        'false_loss_rate': false_losses / len(episodes_in_moving) if len(episodes_in_moving) else 0.0,
+        'false_losses_per_hour': false_losses / hours if hours else 0.0,
+        'brush_time': float(dt[brushing].sum()),
+        'dirt_time': float(dt[dirt].sum()),
+        'brush_clean_time': float(dt[brushing & ~dirt].sum()),
+        'dirt_unbrushed_time': float(dt[dirt & ~brushing].sum()),
+        'vision_checks': int(np.count_nonzero(checked)),
+        'vision_dirty': int(np.count_nonzero(records['vision'] == 1)),
+        'vision_latency_mean': float(latency.mean()) if len(latency) else 0.0,
+        'vision_latency_p95': float(np.percentile(latency, 95)) if len(latency) else 0.0,
+        'vision_interval_mean': float(np.diff(check_times).mean()) if len(check_times) > 1 else 0.0,
+        'area_visited': visited / 1e4,
+        'area_brushed': brushed / 1e4,
+        'area_visited_per_hour': visited / 1e4 / hours if hours else 0.0,
+        'area_brushed_per_hour': brushed / 1e4 / hours if hours else 0.0,
+        'tick_time_p50': float(np.percentile(tick_time, 50)),
+        'tick_time_p99': float(np.percentile(tick_time, 99)),
+        'tick_time_max': float(tick_time.max()),
+        'period_p50': float(np.percentile(period, 50)) if len(period) else 0.0,
+        'period_p99': float(np.percentile(period, 99)) if len(period) else 0.0,
+        'period_max': float(period.max()) if len(period) else 0.0,
+    }
+
+
+def _shares(times, total):
+    """Linhas 'nome  tempo  %' ordenadas do maior para o menor"""
+    lines = []
+    for name, t in sorted(times.items(), key=lambda item: -item[1]):
+        if t > 0:
+            lines.append(f"    {name:20s} {t/60:7.1f} min {t / total * 100:5.1f}%")
+    return lines
+
+
+def format_report(m):
+    """
+    Relatório compacto das métricas de analyze().
+
+    Returns:
+        str: texto multi-linha
+    """
+    total = m['duration'] or 1.0
+    maneuver_total = sum(m['step_time'].values()) or 1.0
+    lines = [f"Missão: {m['duration']/60:.1f} min, {m['records']} iterações",
+             "  Tempo por estado:"]
+    lines += _shares(m['state_time'], total)
+    lines.append("  Tempo por passo de manobra:")
+    lines += _shares(m['step_time'], maneuver_total)
+    lines += [
+        f"  Manobras:     {m['maneuvers']} ({m['maneuvers_per_panel']:.1f}/placa, "
+        f"{m['maneuvers_per_hour']:.0f}/h), {m['maneuver_mean_time']:.1f}s cada | "
+        f"estabilização em MOVING {m['motion_busy_moving']/60:.1f} min",
+        f"  Perdas:       {m['false_losses']} falsas x {m['confirmed_losses']} confirmadas "
+        f"({m['false_loss_rate']*100:.0f}% falsas, {m['false_losses_per_hour']:.0f}/h)",
+        f"  Vassouras:    {m['brush_time']/60:.1f} min ligadas | sujeira {m['dirt_time']/60:.1f} min | "
+        f"ligadas sem sujeira {m['brush_clean_time']/60:.1f} min | "
+        f"sujeira sem vassouras {m['dirt_unbrushed_time']/60:.1f} min",
+        f"  Visão:        {m['vision_checks']} verificações ({m['vision_dirty']} sujas), "
+        f"a cada {m['vision_interval_mean']:.1f}s | latência média "
+        f"{m['vision_latency_mean']*1000:.0f}ms, p95 {m['vision_latency_p95']*1000:.0f}ms",
+        f"  Área:         {m['area_visited']:.2f} m² visitada ({m['area_visited_per_hour']:.2f} m²/h) | "
+        f"{m['area_brushed']:.2f} m² escovada ({m['area_brushed_per_hour']:.2f} m²/h)",
+        f"  Loop:         iteração p50 {m['tick_time_p50']*1000:.1f}ms / "
+        f"p99 {m['tick_time_p99']*1000:.1f}ms / máx {m['tick_time_max']*1000:.1f}ms | "
+        f"período p50 {m['period_p50']*1000:.0f}ms / p99 {m['period_p99']*1000:.0f}ms / "
+        f"máx {m['period_max']*1000:.0f}ms",
+    ]
+    return "\n".join(lines)
+
+
+def plot(meta, records, metrics, path):
+    """
+    Figura da missão: estados no tempo, duties, trajetória e tempo por estado.
+
+    Args:
+        path: arquivo de imagem (ex: .png)
+
+    Raises:
+        RuntimeError: matplotlib não instalado
+    """
+    if not MATPLOTLIB_AVAILABLE:
+        raise RuntimeError("matplotlib não disponível (pip install matplotlib)")
+
+    minutes = (records['t'] - records['t'][0]) / 60.0
+    brushing = (records['flags'] & FLAG_BRUSHING) != 0
+
+    fig, axes = plt.subplots(2, 2, figsize=(14, 9))
+    ax_state, ax_duty, ax_path, ax_bar = axes.ravel()
+
+    ax_state.step(minutes, records['state'], where='post', linewidth=0.8)
+    ax_state.set_yticks(range(len(meta['states'])), meta['states'])
+    steps = records['step'] != NO_STEP
+    ax_state.scatter(minutes[steps], records['state'][steps] + 0.15,
+                     s=2, c=records['step'][steps], cmap='tab10')
+    ax_state.set_xlabel("min")
+    ax_state.set_title("Estado (pontos: passo da manobra)")
+
+    ax_duty.plot(minutes, records['left_duty'], linewidth=0.6, label="esquerda")
+    ax_duty.plot(minutes, records['right_duty'], linewidth=0.6, label="direita")
+    checks = np.flatnonzero(records['vision'] != NO_VISION)
+    ax_duty.scatter(minutes[checks], np.full(len(checks), 105),
+                    c=np.where(records['vision'][checks] == 1, 'tab:red', 'tab:green'),
+                    s=8, marker='v', label="visão")
+    ax_duty.set_xlabel("min")
+    ax_duty.set_ylabel("duty %")
+    ax_duty.legend(loc='lower right', fontsize=8)
+    ax_duty.set_title("Comandos dos motores")
+
+    ax_path.plot(records['x'], records['y'], color='0.7', linewidth=0.5)
+    ax_path.scatter(records['x'][brushing], records['y'][brushing], s=1,
+                    color='tab:blue', label="vassouras")
+    ax_path.set_aspect('equal')
+    ax_path.set_xlabel("x (cm)")
+    ax_path.set_ylabel("y (cm)")
+    ax_path.set_title(f"Trajetória (odometria) - {metrics['area_visited']:.2f} m² visitada")
+
+    times = {**{f"estado {k}": v for k, v in metrics['state_time'].items()},
+             **{f"passo {k}": v for k, v in metrics['step_time'].items()}}
+    names = [name for name, t in times.items() if t > 0]
+    ax_bar.barh(names, [times[name] / 60 for name in names])
+    ax_bar.invert_yaxis()
+    ax_bar.set_xlabel("min")
+    ax_bar.set_title("Tempo por estado / passo")
+
+    fig.tight_layout()
+    fig.savefig(path, dpi=120)
+    plt.close(fig)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Análise de tempo da missão (telemetria)")
+    parser.add_argument('path', help="arquivo .tlm")
+    parser.add_argument('--panels', type=int, default=1,
+                        help="placas percorridas na missão")
+    parser.add_argument('--plot', metavar='ARQUIVO', help="salva a figura (requer matplotlib)")
+    parser.add_argument('--json', action='store_true', help="métricas em JSON")
+    args = parser.parse_args()
+
+    meta, records = load(args.path)
+    metrics = analyze(meta, records, panels=args.panels)
+
+    if args.json:
+        print(json.dumps(metrics, indent=2))
+    else:
+        print(format_report(metrics))
+
+    if args.plot:
+        try:
+            plot(meta, records, metrics, args.plot)
+        except RuntimeError as e:
+            print(f"Sem gráfico: {e}", file=sys.stderr)
+            return 1
+        print(f"Gráfico salvo em {args.plot}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+test_pwm.py - Comparação dos backends de PWM
+============================================
+
+Mede, para cada backend de PWM, com os 5 canais do robô ligados
+(2 motores, 2 vassouras, 1 servo):
+
+1. CPU ociosa do processo (% de um núcleo) - threads de PWM inclusas
+2. Jitter do pulso do servo (período e largura), medido pelo pigpiod
+
+Uso:
+    sudo pigpiod                 # necessário para medir jitter
+    python3 test_pwm.py          # compara software x auto
+    python3 test_pwm.py software hardware pigpio
+"""
+
+import sys
+import time
+import statistics
+
+from hardware.gpio import GPIO
+from hardware.pwm import create_pwm, PIGPIO_AVAILABLE
+from config import MOTOR_PINS, BRUSH_MOTOR_PINS, SERVO_PIN
+
+
+MEASURE_TIME = 10       # Segundos de medição por backend
+SERVO_DUTY = 7.5        # 90° (pulso de 1.5ms a 50Hz)
+
+
+def open_channels(backend):
+    """Cria os 5 canais PWM do robô com o backend pedido"""
+    GPIO.setmode(GPIO.BCM)
+    GPIO.setwarnings(False)
+
+    channels = [
+        create_pwm(MOTOR_PINS['left_motor']['ena'], 1000, backend),
+        create_pwm(MOTOR_PINS['right_motor']['enb'], 1000, backend),
+        create_pwm(BRUSH_MOTOR_PINS['brush_1']['enable'], 1000, backend),
+        create_pwm(BRUSH_MOTOR_PINS['brush_2']['enable'], 1000, backend),
+    ]
+    servo = create_pwm(SERVO_PIN, 50, backend)
+
+    for pwm in channels:
+        pwm.start(40)
+    servo.start(SERVO_DUTY)
+
+    return channels + [servo]
+
+
+def measure_cpu(seconds):
+    """CPU usada pelo processo (todas as threads) em % de um núcleo"""
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    time.sleep(seconds)
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    return cpu / wall * 100
+
+
+def measure_servo_jitter(seconds):
+    """
+    Captura bordas do pino do servo pelo pigpiod (timestamps em µs).
+
+    Returns:
+        dict com desvio padrão do período e da largura do pulso (µs),
+        ou None se pigpiod não estiver disponível
+    """
+    if not PIGPIO_AVAILABLE:
+        return None
+
+    import pigpio
+    pi = pigpio.pi()
+    if not pi.connected:
+        return None
+
+    rises = []
+    widths = []
+    last_rise = [None]
+
+    def on_edge(gpio, level, tick):
+        if level == 1:
+            rises.append(tick)
+            last_rise[0] = tick
+        elif level == 0 and last_rise[0] is not None:
+            widths.append(pigpio.tickDiff(last_rise[0], tick))
+
+    cb = pi.callback(SERVO_PIN, pigpio.EITHER_EDGE, on_edge)
+    time.sleep(seconds)
+    cb.cancel()
+    pi.stop()
+
+    periods = [pigpio.tickDiff(a, b) for a, b in zip(rises, rises[1:])]
+    if len(periods) < 2 or len(widths) < 2:
+        return None
+
+    return {
+        'period_mean': statistics.mean(periods),
+        'period_stdev': statistics.stdev(periods),
+        'width_mean': statistics.mean(widths),
+        'width_stdev': statistics.stdev(widths),
+        'width_max_dev': max(abs(w - statistics.mean(widths)) for w in widths)
+    }
+
+
+def test_backend(backend):
+    """Mede CPU e jitter de um backend"""
+    print("\n" + "="*50)
+    print(f"BACKEND: {backend}")
+    print("="*50)
+
+    channels = open_channels(backend)
+    names = sorted(set(pwm.name for pwm in channels))
+    print(f"Backends efetivos: {', '.join(names)}")
+
+    try:
+        time.sleep(1)  # Estabilizar
+        cpu = measure_cpu(MEASURE_TIME)
+        print(f"CPU ociosa: {cpu:.1f}% de um núcleo")
+
+        jitter = measure_servo_jitter(MEASURE_TIME)
+        if jitter is None:
+            print("Jitter do servo: não medido (pigpiod indisponível)")
+        else:
+            print(f"Período servo: {jitter['period_mean']:.0f}µs "
+                  f"(desvio {jitter['period_stdev']:.1f}µs)")
+            print(f"Pulso servo:   {jitter['width_mean']:.0f}µs "
+                  f"(desvio {jitter['width_stdev']:.1f}µs, "
+                  f"máx {jitter['width_max_dev']:.0f}µs)")
+    finally:
+        for pwm in channels:
+            pwm.stop()
+        GPIO.cleanup()
+
+    return cpu, jitter
+
+
+if __name__ == "__main__":
+    backends = sys.argv[1:] or ['software', 'auto']
+
+    resultados = {}
+    for backend in backends:
+        resultados[backend] = test_backend(backend)
+
+    print("\n" + "="*50)
+    print("RESUMO")
+    print("="*50)
+    for backend, (cpu, jitter) in resultados.items():
+        pulso = f"{jitter['width_stdev']:.1f}µs" if jitter else "n/d"
+        print(f"  {backend:10s} | CPU: {cpu:5.1f}% | Jitter pulso servo: {pulso}")